@@ -0,0 +1,344 @@
+import multiprocessing
+from abc import ABC, abstractmethod
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from contextlib import closing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from render_worker import init_worker, worker_visualizer
+from snapshot_store import SnapshotStore
+
+ANIMATION_FORMATS = ('gif', 'mp4')
+# Interpolated frames from one keyframe (year or snapshot) to the next
+DEFAULT_STEPS = 8
+DEFAULT_FPS = 20
+# Animated scatter plots label their points only while there are this few
+MAX_ANIMATED_LABELS = 15
+
+_animation = None
+_frame_state = None
+
+
+def snapshot_timeline(store: SnapshotStore, snapshot_ids: Optional[List[str]] = None) -> pd.DataFrame:
+    """Stack stored snapshots into one long frame with a 'Snapshot' time column (seconds since the epoch)"""
+    snapshot_ids = store.list_snapshots() if snapshot_ids is None else snapshot_ids
+    frames = []
+    for snapshot_id in snapshot_ids:
+        frame = store.load(snapshot_id)
+        frames.append(frame.assign(Country=frame['Country'].astype(str),
+                                   Snapshot=store.read_meta(snapshot_id)['created_at']))
+    if not frames:
+        raise ValueError("No stored snapshots to animate")
+    return pd.concat(frames, ignore_index=True)
+
+
+def time_label(value: float, time_column: str) -> str:
+    """Display text of a keyframe time: the year, or the snapshot's date"""
+    if time_column == 'Snapshot':
+        return time.strftime('%Y-%m-%d %H:%M', time.localtime(value))
+    return str(int(value))
+
+
+def keyframes(data: pd.DataFrame, metrics: Sequence[str], time_column: str = 'Year',
+              countries: Optional[Sequence[str]] = None) -> Tuple[np.ndarray, List[str], Dict[str, np.ndarray]]:
+    """(times, countries, {metric: values[time, country]}) from a long (Country, time, ...) frame"""
+    missing = [col for col in [time_column] + list(metrics) if col not in data.columns]
+    if missing:
+        raise ValueError(f"No {', '.join(missing)} data to animate")
+    frame = data[['Country', time_column] + list(metrics)].assign(Country=data['Country'].astype(str))
+    if countries:
+        frame = frame[frame['Country'].isin(countries)]
+    frame = frame.drop_duplicates(subset=[time_column, 'Country'])
+    if frame.empty:
+        raise ValueError("No rows to animate")
+    table = frame.pivot(index=time_column, columns='Country', values=list(metrics)).sort_index()
+    names = [str(name) for name in table[metrics[0]].columns]
+    grids = {metric: table[metric].reindex(columns=names).to_numpy(dtype=np.float64, na_value=np.nan)
+             for metric in metrics}
+    return table.index.to_numpy(dtype=np.float64), names, grids
+
+
+def interpolate(values: np.ndarray, steps: int) -> np.ndarray:
+    """Linearly interpolate steps frames per keyframe interval along the first axis, all at once"""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) < 2 or steps <= 1:
+        return values.copy()
+    t = np.arange((len(values) - 1) * steps + 1) / steps
+    start = np.minimum(t.astype(np.int64), len(values) - 2)
+    fraction = (t - start).reshape((-1,) + (1,) * (values.ndim - 1))
+    return values[start] * (1.0 - fraction) + values[start + 1] * fraction
+
+
+def _limits(values: np.ndarray, include_zero: bool = False) -> Tuple[float, float]:
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        return 0.0, 1.0
+    low, high = float(finite.min()), float(finite.max())
+    if include_zero:
+        low, high = min(low, 0.0), max(high, 0.0)
+    pad = 0.08 * ((high - low) or abs(high) or 1.0)
+    return low - (0.0 if include_zero and low == 0.0 else pad), high + pad
+
+
+class ChartAnimation(ABC):
+    """Precomputed frames of an animated chart
+
+    All frame data is interpolated up front into NumPy arrays, so drawing a
+    frame only moves existing artists. setup() creates the artists on a figure
+    (all of them animated, for blitting) and update() moves them to a frame
+    and returns the ones it changed. Instances hold arrays only until setup(),
+    so they pickle cheaply to export worker processes.
+    """
+
+    def __init__(self, times: np.ndarray, time_column: str, steps: int):
+        self.steps = max(int(steps), 1)
+        self.time_column = time_column
+        self.keyframe_labels = [time_label(t, time_column) for t in times]
+        self.n_frames = max((len(times) - 1) * self.steps + 1, 1) if len(times) else 0
+        self.artists: list = []
+
+    def frame_label(self, frame: int) -> str:
+        """Label of the keyframe a frame starts from"""
+        return self.keyframe_labels[min(frame // self.steps, len(self.keyframe_labels) - 1)]
+
+    def __getstate__(self):
+        # Artists (and everything else setup() creates) stay behind; workers make their own
+        state = {name: value for name, value in self.__dict__.items()
+                 if not name.startswith('_') and name not in ('ax', 'visualizer')}
+        state['artists'] = []
+        return state
+
+    @abstractmethod
+    def setup(self, fig, visualizer) -> list:
+        """Create the (animated) artists on a figure and return them"""
+
+    @abstractmethod
+    def update(self, frame: int) -> list:
+        """Move the artists to a frame and return the ones that changed"""
+
+
+class BarRace(ChartAnimation):
+    """Bar chart race: the top N countries by one metric, re-ranked smoothly from keyframe to keyframe"""
+
+    def __init__(self, data: pd.DataFrame, metric: str, top_n: int = 10, steps: int = DEFAULT_STEPS,
+                 time_column: str = 'Year', countries: Optional[Sequence[str]] = None):
+        times, self.countries, grids = keyframes(data, [metric], time_column, countries)
+        super().__init__(times, time_column, steps)
+        self.metric = metric
+        self.top_n = min(top_n, len(self.countries))
+        values = grids[metric]
+        self.values = interpolate(values, self.steps)
+
+        # Rank per keyframe (missing values last), then interpolate the ranks too so bars glide
+        ranks = np.argsort(np.argsort(-np.where(np.isnan(values), -np.inf, values), axis=1, kind='stable'),
+                           axis=1, kind='stable')
+        self.positions = interpolate(ranks, self.steps)
+        self.xlim = _limits(values, include_zero=True)
+
+    def setup(self, fig, visualizer) -> list:
+        self.visualizer = visualizer
+        self.ax = ax = fig.add_subplot(111)
+        colors = visualizer.colors('tab20', len(self.countries))
+        self._colors = colors
+        self._bars = list(ax.barh(np.arange(self.top_n), np.zeros(self.top_n), height=0.8,
+                                  alpha=0.8, edgecolor='black', animated=True))
+        self._names = [ax.text(0, 0, '', ha='right', va='center', fontsize=9, fontweight='bold', animated=True)
+                       for _ in range(self.top_n)]
+        self._values = [ax.text(0, 0, '', ha='left', va='center', fontsize=9, animated=True)
+                        for _ in range(self.top_n)]
+        self._time = ax.text(0.97, 0.06, '', transform=ax.transAxes, ha='right', fontsize=28,
+                             fontweight='bold', alpha=0.5, animated=True)
+
+        ax.set_xlim(*self.xlim)
+        ax.set_ylim(self.top_n - 0.4, -0.6)  # rank 0 at the top
+        ax.set_yticks([])
+        ax.set_title(f'Top {self.top_n} Countries by {self.metric}', fontsize=16, fontweight='bold', pad=20)
+        ax.set_xlabel(visualizer.metric_label(self.metric), fontsize=12, fontweight='bold')
+        ax.grid(axis='x', alpha=0.3, linestyle='--')
+        ax.set_axisbelow(True)
+        fig.tight_layout()
+        fig.subplots_adjust(left=max(fig.subplotpars.left, 0.2))  # room for the country names
+        self.artists = self._bars + self._names + self._values + [self._time]
+        return self.artists
+
+    def update(self, frame: int) -> list:
+        positions = self.positions[frame]
+        shown = np.argsort(positions, kind='stable')[:self.top_n]
+        widths = np.nan_to_num(self.values[frame, shown])
+        texts = self.visualizer.format_numbers(self.values[frame, shown], self.metric)
+        for bar, name, value, country, y, width, text in zip(self._bars, self._names, self._values,
+                                                              shown, positions[shown], widths, texts):
+            bar.set_y(y - 0.4)
+            bar.set_width(width)
+            bar.set_facecolor(self._colors[country])
+            name.set_position((0, y))
+            name.set_text(f'{self.countries[country]} ')
+            value.set_position((width, y))
+            value.set_text(f' {text}')
+        self._time.set_text(self.frame_label(frame))
+        return self.artists
+
+
+class ScatterAnimation(ChartAnimation):
+    """Countries moving through the plane of two metrics over time"""
+
+    def __init__(self, data: pd.DataFrame, x_metric: str, y_metric: str, steps: int = DEFAULT_STEPS,
+                 time_column: str = 'Year', countries: Optional[Sequence[str]] = None):
+        times, self.countries, grids = keyframes(data, [x_metric, y_metric], time_column, countries)
+        super().__init__(times, time_column, steps)
+        self.x_metric, self.y_metric = x_metric, y_metric
+        self.x = interpolate(grids[x_metric], self.steps)
+        self.y = interpolate(grids[y_metric], self.steps)
+        self.xlim = _limits(grids[x_metric])
+        self.ylim = _limits(grids[y_metric])
+
+    def setup(self, fig, visualizer) -> list:
+        self.visualizer = visualizer
+        self.ax = ax = fig.add_subplot(111)
+        count = len(self.countries)
+        self._scatter = ax.scatter(self.x[0], self.y[0], c=np.arange(count), cmap='viridis', alpha=0.7,
+                                   s=100 if count <= 50 else 40, edgecolor='black', animated=True)
+        self._labels = [ax.annotate(name, (0, 0), xytext=(5, 5), textcoords='offset points', fontsize=8,
+                                    animated=True)
+                        for name in (self.countries if count <= MAX_ANIMATED_LABELS else [])]
+        self._time = ax.text(0.97, 0.06, '', transform=ax.transAxes, ha='right', fontsize=28,
+                             fontweight='bold', alpha=0.5, animated=True)
+
+        ax.set_xlim(*self.xlim)
+        ax.set_ylim(*self.ylim)
+        ax.set_title(f'{self.y_metric} vs {self.x_metric}', fontsize=16, fontweight='bold', pad=20)
+        ax.set_xlabel(visualizer.metric_label(self.x_metric), fontsize=12, fontweight='bold')
+        ax.set_ylabel(visualizer.metric_label(self.y_metric), fontsize=12, fontweight='bold')
+        ax.grid(True, alpha=0.3, linestyle='--')
+        fig.tight_layout()
+        self.artists = [self._scatter] + self._labels + [self._time]
+        return self.artists
+
+    def update(self, frame: int) -> list:
+        x, y = self.x[frame], self.y[frame]
+        self._scatter.set_offsets(np.column_stack([x, y]))
+        for label, xi, yi in zip(self._labels, x, y):
+            label.xy = (xi, yi)
+            label.set_visible(bool(np.isfinite(xi) and np.isfinite(yi)))
+        self._time.set_text(self.frame_label(frame))
+        return self.artists
+
+
+def play(animation: ChartAnimation, fig, visualizer, fps: int = DEFAULT_FPS, repeat: bool = False,
+         event_source=None):
+    """Start interactive playback on a figure; keep the returned FuncAnimation referenced while it plays
+
+    event_source replaces the timer FuncAnimation would create (it then sets the frame rate).
+    """
+    from matplotlib.animation import FuncAnimation
+    artists = animation.setup(fig, visualizer)
+    return FuncAnimation(fig, animation.update, frames=animation.n_frames, init_func=lambda: artists,
+                         interval=1000.0 / fps, blit=True, repeat=repeat, event_source=event_source)
+
+
+def _init_frame_worker(animation: ChartAnimation, size: Tuple[int, int], dpi: int, palette: bool):
+    """Per-process setup: Agg and chart style, then the artists and the static background, once"""
+    global _animation, _frame_state
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    init_worker()
+    width, height = size
+    fig = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    animation.setup(fig, worker_visualizer())
+    canvas.draw()  # animated artists are left out, so this is the background of every frame
+    _animation = animation
+    _frame_state = (fig, canvas, canvas.copy_from_bbox(fig.bbox), palette)
+
+
+def _render_frames(task: Tuple[int, int, str]) -> int:
+    """Render a range of frames to numbered PNG files by blitting onto the cached background"""
+    from PIL import Image
+
+    start, stop, frame_dir = task
+    fig, canvas, background, palette = _frame_state
+    for frame in range(start, stop):
+        canvas.restore_region(background)
+        for artist in _animation.update(frame):
+            fig.draw_artist(artist)
+        image = Image.fromarray(np.asarray(canvas.buffer_rgba())[..., :3])
+        if palette:
+            # GIF frames are quantised here, in parallel, rather than by the writer
+            image = image.quantize(colors=256, method=Image.Quantize.MEDIANCUT)
+        image.save(os.path.join(frame_dir, f"frame_{frame:05d}.png"), compress_level=1)
+    return stop - start
+
+
+def _open_frames(frame_paths: Sequence[str]):
+    """Open the frames one at a time, closing each once the encoder has moved on to the next"""
+    from PIL import Image
+    for frame_path in frame_paths:
+        with Image.open(frame_path) as frame:
+            yield frame
+
+
+def export_animation(animation: ChartAnimation, path: str, fps: int = DEFAULT_FPS,
+                     size: Tuple[int, int] = (1000, 600), dpi: int = 100, max_workers: Optional[int] = None,
+                     progress_callback: Optional[Callable[[int, Optional[int]], None]] = None,
+                     cancel_event=None) -> int:
+    """Render every frame in worker processes and encode a GIF (Pillow) or MP4 (ffmpeg); returns the frame count
+
+    The file is written under a temporary name and only moved into place once
+    complete, so a failed or cancelled export never leaves a truncated file.
+    """
+    fmt = os.path.splitext(path)[1].lstrip('.').lower()
+    if fmt not in ANIMATION_FORMATS:
+        raise ValueError(f"Unsupported animation format '{fmt}', expected one of {', '.join(ANIMATION_FORMATS)}")
+    ffmpeg = shutil.which('ffmpeg')
+    if fmt == 'mp4' and ffmpeg is None:
+        raise RuntimeError("Exporting MP4 requires ffmpeg on the PATH")
+    if animation.n_frames == 0:
+        raise ValueError("The animation has no frames")
+
+    max_workers = max_workers or os.cpu_count() or 1
+    # Several chunks per worker balance the load; each still reuses the worker's background
+    chunk = max(1, -(-animation.n_frames // (max_workers * 4)))
+    tmp_path = f"{path}.{os.getpid()}.part"
+    with tempfile.TemporaryDirectory(prefix='animation-') as frame_dir:
+        tasks = [(start, min(start + chunk, animation.n_frames), frame_dir)
+                 for start in range(0, animation.n_frames, chunk)]
+        done = 0
+        # Spawned, not forked: exports are started from the GUI's worker thread
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_frame_worker,
+                                 initargs=(animation, tuple(size), dpi, fmt == 'gif')) as executor:
+            futures = [executor.submit(_render_frames, task) for task in tasks]
+            for future in as_completed(futures):
+                if cancel_event is not None and cancel_event.is_set():
+                    # Drops every queued chunk; leaving the block waits only for those already running
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise InterruptedError("Export cancelled")
+                done += future.result()
+                if progress_callback:
+                    progress_callback(done, animation.n_frames)
+
+        frame_paths = [os.path.join(frame_dir, f"frame_{frame:05d}.png") for frame in range(animation.n_frames)]
+        try:
+            if fmt == 'gif':
+                from PIL import Image
+                with Image.open(frame_paths[0]) as first, closing(_open_frames(frame_paths[1:])) as rest:
+                    first.save(tmp_path, format='GIF', save_all=True, append_images=rest,
+                               duration=int(round(1000.0 / fps)), loop=0, optimize=False)
+            else:
+                subprocess.run([ffmpeg, '-y', '-loglevel', 'error', '-framerate', str(fps),
+                                '-i', os.path.join(frame_dir, 'frame_%05d.png'),
+                                '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-c:v', 'libx264',
+                                '-pix_fmt', 'yuv420p', '-f', 'mp4', tmp_path],
+                               check=True, capture_output=True)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    return animation.n_frames
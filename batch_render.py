@@ -0,0 +1,169 @@
+"""Headless batch rendering of charts to PNG/SVG/PDF files across a process pool
+
+    python batch_render.py --out report_charts --formats png svg --top 10 --scatter-all
+
+Every worker sets up the Agg backend and chart style once and memory-maps the
+snapshot once, then renders its share of the chart specs. A manifest.json
+next to the charts lists every file with its spec, plus any failures.
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import pandas as pd
+from chart_spec import ChartSpec, METRICS
+from render_worker import init_worker, worker_visualizer
+from snapshot_store import SnapshotStore
+
+FORMATS = ('png', 'svg', 'pdf')
+DEFAULT_METRICS = METRICS
+
+_data = None
+
+
+def top_n_specs(metrics: Iterable[str], n: int = 10) -> List[ChartSpec]:
+    """One top-N chart per metric"""
+    return [ChartSpec('top', (metric,), top_n=n) for metric in metrics]
+
+
+def comparison_specs(metrics: Iterable[str], countries: Sequence[str]) -> List[ChartSpec]:
+    """One bar chart per metric for a fixed set of countries"""
+    return [ChartSpec('single', (metric,), tuple(countries)) for metric in metrics]
+
+
+def scatter_pair_specs(metrics: Sequence[str], countries: Sequence[str] = ()) -> List[ChartSpec]:
+    """One scatter plot per pair of metrics"""
+    return [ChartSpec('scatter', pair, tuple(countries)) for pair in itertools.combinations(metrics, 2)]
+
+
+def chart_filename(index: int, spec: ChartSpec, fmt: str) -> str:
+    """Stable, filesystem-safe file name for the index-th chart of a batch"""
+    name = '-'.join([spec.kind] + list(spec.metrics) + ([str(spec.top_n)] if spec.top_n else []))
+    return f"{index:04d}-{re.sub(r'[^0-9A-Za-z_-]+', '_', name)}.{fmt}"
+
+
+def _init_batch_worker(store_root: Optional[str], snapshot_id: Optional[str], data: Optional[pd.DataFrame]):
+    """Per-process setup: Agg and chart style, then the data (memory-mapped when it is a snapshot)"""
+    global _data
+    init_worker()
+    _data = SnapshotStore(store_root).load(snapshot_id) if data is None else data
+
+
+def _render_one(task: Tuple[int, ChartSpec, str, Tuple[str, ...], Tuple[int, int], int]) -> Dict:
+    """Render one spec to every requested format; returns its manifest entry"""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from visualizer import chart_rows
+
+    index, spec, out_dir, formats, (width, height), dpi = task
+    entry = {'index': index, 'spec': spec._asdict(), 'files': {}}
+    start = time.perf_counter()
+    try:
+        fig = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+        FigureCanvasAgg(fig)
+        worker_visualizer().draw_chart(fig, spec, chart_rows(spec, _data))
+        for fmt in formats:
+            filename = chart_filename(index, spec, fmt)
+            fig.savefig(os.path.join(out_dir, filename), format=fmt, dpi=dpi)
+            entry['files'][fmt] = filename
+    except Exception as e:
+        entry['error'] = f"{type(e).__name__}: {e}"
+    entry['seconds'] = round(time.perf_counter() - start, 3)
+    return entry
+
+
+def render_batch(specs: Sequence[ChartSpec], data: pd.DataFrame, out_dir: str,
+                 formats: Sequence[str] = ('png',), size: Tuple[int, int] = (1200, 800), dpi: int = 100,
+                 max_workers: Optional[int] = None, store_root: Optional[str] = None,
+                 progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict:
+    """Render many charts to files in parallel and write manifest.json; returns the manifest
+
+    When data is a stored snapshot (it carries its snapshot id) and store_root is
+    given, workers memory-map the snapshot instead of receiving a pickled copy.
+    """
+    formats = tuple(fmt.lower() for fmt in formats)
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Unsupported chart format(s): {', '.join(sorted(unknown))}")
+    os.makedirs(out_dir, exist_ok=True)
+
+    snapshot_id = data.attrs.get('snapshot_id')
+    if store_root is not None and snapshot_id is not None:
+        initargs = (store_root, snapshot_id, None)
+    else:
+        initargs = (None, None, data)
+    max_workers = max_workers or os.cpu_count() or 1
+    tasks = [(i, spec, out_dir, formats, tuple(size), dpi) for i, spec in enumerate(specs)]
+
+    start = time.time()
+    entries = []
+    # spawn, as in render_worker: a forked worker would inherit the caller's Tk state and threads
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_init_batch_worker, initargs=initargs) as executor:
+        # Chunks amortise the per-task IPC; small enough to keep every worker busy
+        chunksize = max(1, len(tasks) // (max_workers * 4))
+        for entry in executor.map(_render_one, tasks, chunksize=chunksize):
+            entries.append(entry)
+            if progress_callback:
+                progress_callback(len(entries), len(tasks))
+
+    manifest = {
+        'created_at': start,
+        'seconds': round(time.time() - start, 3),
+        'snapshot_id': snapshot_id,
+        'formats': list(formats),
+        'size': list(size),
+        'dpi': dpi,
+        'charts': entries,
+        'failures': [entry['index'] for entry in entries if 'error' in entry],
+    }
+    tmp_path = os.path.join(out_dir, f".manifest.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, os.path.join(out_dir, 'manifest.json'))
+    return manifest
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render report charts from a stored snapshot")
+    parser.add_argument('--out', required=True, help="output directory")
+    parser.add_argument('--formats', nargs='+', default=['png'], choices=FORMATS)
+    parser.add_argument('--snapshot', help="snapshot id (default: latest)")
+    parser.add_argument('--snapshot-dir', help="snapshot store directory (default: the app's cache)")
+    parser.add_argument('--metrics', nargs='+', default=DEFAULT_METRICS)
+    parser.add_argument('--top', type=int, default=10, help="top-N chart per metric, 0 to skip")
+    parser.add_argument('--countries', nargs='+', default=[], help="comparison charts for these countries")
+    parser.add_argument('--scatter-all', action='store_true', help="scatter plot for every metric pair")
+    parser.add_argument('--size', nargs=2, type=int, default=[1200, 800], metavar=('WIDTH', 'HEIGHT'))
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    store = SnapshotStore(args.snapshot_dir)
+    snapshot_id = args.snapshot or store.latest_id()
+    if not store.exists(snapshot_id):
+        print("No stored snapshot found; run the scraper first")
+        return 1
+    data = store.load(snapshot_id)
+
+    specs = top_n_specs(args.metrics, args.top) if args.top else []
+    if args.countries:
+        specs += comparison_specs(args.metrics, args.countries)
+    if args.scatter_all:
+        specs += scatter_pair_specs(args.metrics, args.countries)
+
+    manifest = render_batch(specs, data, args.out, args.formats, tuple(args.size), args.dpi,
+                            max_workers=args.workers, store_root=store.root,
+                            progress_callback=lambda done, total: print(f"\rRendered {done}/{total}", end=''))
+    print(f"\n{len(specs)} charts in {manifest['seconds']:.1f}s, {len(manifest['failures'])} failed")
+    return 1 if manifest['failures'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
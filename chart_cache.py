@@ -0,0 +1,84 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+DEFAULT_BUDGET_MB = 64
+
+
+def figure_nbytes(fig) -> int:
+    """Estimate the memory held by a figure from the size of its RGBA render buffer"""
+    width, height = fig.get_size_inches() * fig.dpi
+    return int(width) * int(height) * 4
+
+
+class ChartCache:
+    """LRU cache of rendered charts (RGBA images or figures) under a memory budget
+
+    Keys should include everything the chart depends on, typically the chart
+    spec, the snapshot id and the render size. Evicted values are passed to
+    the release callback, e.g. to close figures.
+    """
+
+    def __init__(self, budget_mb: float = DEFAULT_BUDGET_MB,
+                 release: Optional[Callable[[Any], None]] = None):
+        self.budget = int(budget_mb * 1024 * 1024)
+        self.release = release
+        self.nbytes = 0
+        self._entries: 'OrderedDict[Hashable, Tuple[Any, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached chart and mark it most recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, nbytes: int):
+        """Cache a chart, evicting the least recently used ones beyond the budget"""
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                old_value, old_nbytes = self._entries.pop(key)
+                self.nbytes -= old_nbytes
+                if old_value is not value:
+                    evicted.append(old_value)
+            self._entries[key] = (value, nbytes)
+            self.nbytes += nbytes
+            # Always keep the newest entry, even if it alone is over budget
+            while self.nbytes > self.budget and len(self._entries) > 1:
+                _, (old_value, old_nbytes) = self._entries.popitem(last=False)
+                self.nbytes -= old_nbytes
+                evicted.append(old_value)
+        for old_value in evicted:
+            self._release(old_value)
+
+    def discard(self, key: Hashable, release: bool = True):
+        """Remove one chart, e.g. after its figure window was closed"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.nbytes -= entry[1]
+        if entry is not None and release:
+            self._release(entry[0])
+
+    def clear(self):
+        """Drop every cached chart"""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+            self.nbytes = 0
+        for value, _ in entries:
+            self._release(value)
+
+    def _release(self, value: Any):
+        if self.release is not None:
+            self.release(value)
@@ -0,0 +1,318 @@
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.colors import LogNorm
+from density import DensityGrid
+from scatter_labels import ScatterLabeler
+
+
+class BarPanel(NamedTuple):
+    title: str
+    xlabel: str
+    ylabel: str
+    categories: List[str]
+    values: np.ndarray
+    labels: List[str]
+
+
+def _bar_limits(values: np.ndarray) -> Tuple[float, float]:
+    """Y-limits with headroom for the value labels above (or below) the bars"""
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        return 0.0, 1.0
+    low, high = min(0.0, float(finite.min())), max(0.0, float(finite.max()))
+    span = (high - low) or 1.0
+    return low - (0.1 * span if low < 0 else 0.0), high + 0.1 * span
+
+
+class _PlayerTimer:
+    """Event source for a FuncAnimation that stays stopped once closed
+
+    FuncAnimation restarts its event source after every resize, so the canvas
+    owns the source: closing it stops the animation for good and releases the
+    animation's callbacks, without touching FuncAnimation internals.
+    """
+
+    def __init__(self, timer):
+        self._timer = timer
+        self.closed = False
+
+    @property
+    def interval(self):
+        return self._timer.interval
+
+    @interval.setter
+    def interval(self, interval):
+        self._timer.interval = interval
+
+    def add_callback(self, func, *args, **kwargs):
+        return self._timer.add_callback(func, *args, **kwargs)
+
+    def remove_callback(self, func, *args, **kwargs):
+        self._timer.remove_callback(func, *args, **kwargs)
+
+    def start(self):
+        if not self.closed:
+            self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def close(self):
+        self.closed = True
+        self._timer.stop()
+        self._timer.callbacks.clear()
+
+
+class ChartCanvas:
+    """A persistent Tk canvas whose charts are updated in place
+
+    The figure, canvas widget, axes and artists are created once per chart layout.
+    Showing another metric or country set reuses them, and when only the data
+    artists change they are redrawn by blitting over a cached background instead
+    of re-rendering the whole figure.
+    """
+
+    def __init__(self, master, figsize=(8, 5), dpi=100):
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+        self.widget = self.canvas.get_tk_widget()
+        self._layout = None
+        self._suptitle = None
+        self._axes = []
+        self._categories = []  # tick labels currently set on each of self._axes
+        self._bars = []
+        self._labels = []
+        self._scatter = None
+        self._image = None
+        self._labeler: Optional[ScatterLabeler] = None
+        self._player = None
+        self._player_timer: Optional[_PlayerTimer] = None
+        self._animated = []
+        self._background = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.mpl_connect('motion_notify_event', self._on_move)
+        self.canvas.mpl_connect('resize_event', self._on_resize)
+
+    def _on_draw(self, event):
+        """Cache the static background after every full draw, then paint the data artists on top"""
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
+    def _on_move(self, event):
+        """Hover tooltips for the scatter plot, painted by blitting"""
+        if self._labeler is not None and self._labeler.on_move(event):
+            self._blit()
+
+    def _on_resize(self, event):
+        if self._labeler is not None:
+            self._labeler.relabel()
+
+    def _draw_animated(self):
+        # Label artists are read from the labeler each time: relabel() may have added some
+        labels = self._labeler.artists if self._labeler is not None else []
+        for artist in self._animated + labels:
+            self.figure.draw_artist(artist)
+
+    def _blit(self):
+        if self._background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.canvas.blit(self.figure.bbox)
+
+    def _reset(self, layout):
+        if self._player is not None:
+            self._stop_player()
+        self.figure.clear()
+        self._layout = layout
+        self._suptitle = None
+        self._axes, self._categories, self._bars, self._labels, self._animated = [], [], [], [], []
+        self._scatter, self._image, self._labeler = None, None, None
+        self._background = None
+
+    def clear(self):
+        """Drop the current chart; the figure and canvas are kept for the next one"""
+        self._reset(None)
+
+    def show_bars(self, panels: Sequence[BarPanel], suptitle: Optional[str] = None,
+                  cmap: str = 'Set3', ncols: int = 1, label_size: int = 10):
+        """Show one bar chart per panel, updating the existing bars when the layout matches"""
+        layout = ('bars', ncols, tuple(len(panel.categories) for panel in panels))
+        if layout != self._layout:
+            self._build_bars(panels, layout, cmap, ncols, label_size)
+            self._finish_layout(suptitle)
+            self.canvas.draw_idle()
+            return
+
+        relayout = suptitle != self._suptitle
+        rescaled = False
+        for i, (ax, bars, labels, panel) in enumerate(zip(self._axes, self._bars, self._labels, panels)):
+            relayout |= self._set_static(i, panel)
+            rescaled |= self._update_bars(ax, bars, labels, panel)
+
+        if relayout:
+            self._finish_layout(suptitle)
+        if relayout or rescaled:
+            self.canvas.draw_idle()
+        else:
+            self._blit()
+
+    def _build_bars(self, panels, layout, cmap, ncols, label_size):
+        self._reset(layout)
+        nrows = -(-len(panels) // ncols)
+        colormap = matplotlib.colormaps[cmap]
+        for i, panel in enumerate(panels):
+            ax = self.figure.add_subplot(nrows, ncols, i + 1)
+            positions = np.arange(len(panel.categories))
+            colors = colormap(np.arange(len(panel.categories)) % colormap.N)
+            bars = ax.bar(positions, np.nan_to_num(panel.values), color=colors, alpha=0.8,
+                          edgecolor='black', linewidth=1, animated=True)
+            labels = [ax.text(0, 0, '', ha='center', va='bottom', fontsize=label_size,
+                              fontweight='bold', animated=True)
+                      for _ in panel.categories]
+            ax.set_xticks(positions)
+            ax.grid(axis='y', alpha=0.3, linestyle='--')
+            ax.set_axisbelow(True)
+            self._axes.append(ax)
+            self._categories.append(None)
+            self._set_static(i, panel)
+            self._update_bars(ax, list(bars), labels, panel)
+            self._bars.append(list(bars))
+            self._labels.append(labels)
+            self._animated.extend(bars)
+            self._animated.extend(labels)
+
+    def _set_static(self, i: int, panel: BarPanel) -> bool:
+        """Update the titles and tick labels of the i-th axes; returns True if anything changed"""
+        ax = self._axes[i]
+        changed = False
+        if ax.get_title() != panel.title:
+            ax.set_title(panel.title, fontsize=14, fontweight='bold')
+            changed = True
+        if ax.get_xlabel() != panel.xlabel or ax.get_ylabel() != panel.ylabel:
+            ax.set_xlabel(panel.xlabel, fontsize=10, fontweight='bold')
+            ax.set_ylabel(panel.ylabel, fontsize=10, fontweight='bold')
+            changed = True
+        if self._categories[i] != list(panel.categories):
+            ax.set_xticklabels(panel.categories, rotation=45, ha='right')
+            self._categories[i] = list(panel.categories)
+            changed = True
+        return changed
+
+    @staticmethod
+    def _update_bars(ax, bars, labels, panel: BarPanel) -> bool:
+        """Move bars and labels to the new values; returns True if the axis limits changed"""
+        heights = np.nan_to_num(np.asarray(panel.values, dtype=float))
+        for bar, label, height, text in zip(bars, labels, heights, panel.labels):
+            bar.set_height(height)
+            label.set_position((bar.get_x() + bar.get_width() / 2., height))
+            label.set_va('bottom' if height >= 0 else 'top')
+            label.set_text(text)
+        limits = _bar_limits(heights)
+        if tuple(ax.get_ylim()) != limits:
+            ax.set_ylim(*limits)
+            return True
+        return False
+
+    def show_scatter(self, x: np.ndarray, y: np.ndarray, names: Sequence[str],
+                     title: str, xlabel: str, ylabel: str, hover_texts: Optional[Sequence[str]] = None):
+        """Show a scatter plot with decluttered labels and hover tooltips, reusing its artists"""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if self._layout != ('scatter',):
+            self._reset(('scatter',))
+            ax = self.figure.add_subplot(111)
+            ax.grid(True, alpha=0.3, linestyle='--')
+            self._scatter = ax.scatter([], [], c=[], cmap='viridis', alpha=0.7, s=100,
+                                       edgecolor='black', animated=True)
+            self._labeler = ScatterLabeler(ax, x, y, names, hover_texts, animated=True)
+            self._axes = [ax]
+        else:
+            self._labeler.set_data(x, y, names, hover_texts)
+
+        ax = self._axes[0]
+        static_changed = ax.get_title() != title
+        ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
+        ax.set_xlabel(xlabel, fontsize=12, fontweight='bold')
+        ax.set_ylabel(ylabel, fontsize=12, fontweight='bold')
+
+        self._scatter.set_offsets(np.column_stack([x, y]))
+        self._scatter.set_array(np.arange(len(x), dtype=float))
+        self._scatter.set_clim(0, max(len(x) - 1, 1))
+        self._scatter.set_sizes([100 if len(x) <= 50 else 40])
+
+        if static_changed:
+            self._finish_layout(None)
+        rescaled = self._set_scatter_limits(ax, x, y)
+        # Labels are chosen in display coordinates, so only once limits and layout are final
+        self._labeler.relabel()
+        self._animated = [self._scatter]
+        if rescaled or static_changed:
+            self.canvas.draw_idle()
+        else:
+            self._blit()
+
+    def _stop_player(self):
+        """Stop the animation for good; its resize and draw handlers die with the last reference"""
+        self._player.pause()
+        self._player_timer.close()
+        # The canvas holds its handlers weakly, so this releases them before figure.clear()
+        self._player, self._player_timer = None, None
+
+    def play(self, animation, visualizer, fps: int):
+        """Play a precomputed animation; its own blitting takes over until the next chart"""
+        from animation import play
+        self._reset(('animation',))
+        self._player_timer = _PlayerTimer(self.canvas.new_timer(interval=1000.0 / fps))
+        self._player = play(animation, self.figure, visualizer, fps, event_source=self._player_timer)
+        self.canvas.draw_idle()
+
+    def show_density(self, grid: DensityGrid, title: str, xlabel: str, ylabel: str):
+        """Show binned point counts as a raster, reusing the image and colour bar"""
+        counts = np.ma.masked_equal(grid.counts.T, 0)
+        vmax = max(int(grid.counts.max()), 1)
+        if self._layout != ('density',):
+            self._reset(('density',))
+            ax = self.figure.add_subplot(111)
+            ax.grid(True, alpha=0.3, linestyle='--')
+            self._image = ax.imshow(counts, origin='lower', extent=grid.extent, aspect='auto',
+                                    interpolation='nearest', cmap='viridis', norm=LogNorm(vmin=1, vmax=vmax))
+            self.figure.colorbar(self._image, ax=ax, label='Points per bin')
+            self._axes = [ax]
+        else:
+            self._image.set_data(counts)
+            self._image.set_extent(grid.extent)
+            self._image.norm.vmax = vmax
+
+        ax = self._axes[0]
+        ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
+        ax.set_xlabel(xlabel, fontsize=12, fontweight='bold')
+        ax.set_ylabel(ylabel, fontsize=12, fontweight='bold')
+        self._finish_layout(None)
+        self.canvas.draw_idle()
+
+    @staticmethod
+    def _set_scatter_limits(ax, x: np.ndarray, y: np.ndarray) -> bool:
+        mask = np.isfinite(x) & np.isfinite(y)
+        if not mask.any():
+            return False
+        limits = []
+        for values in (x[mask], y[mask]):
+            low, high = float(values.min()), float(values.max())
+            pad = 0.08 * ((high - low) or abs(high) or 1.0)
+            limits.append((low - pad, high + pad))
+        if (tuple(ax.get_xlim()), tuple(ax.get_ylim())) == tuple(limits):
+            return False
+        ax.set_xlim(*limits[0])
+        ax.set_ylim(*limits[1])
+        return True
+
+    def _finish_layout(self, suptitle: Optional[str]):
+        if suptitle:
+            self.figure.suptitle(suptitle, fontsize=16, fontweight='bold')
+        self._suptitle = suptitle
+        self.figure.tight_layout()
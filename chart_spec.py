@@ -0,0 +1,21 @@
+import math
+from typing import NamedTuple, Tuple
+
+# The ten numeric metrics of the population table
+METRICS = ['Population', 'Yearly_Change', 'Net_Change', 'Density', 'Land_Area', 'Net_Migration',
+           'Fertility_Rate', 'Median_Age', 'Urban_Population_Percent', 'World_Share']
+
+
+class ChartSpec(NamedTuple):
+    """Hashable description of a chart: its kind, the metrics it shows and for which countries"""
+    kind: str  # 'single', 'multi', 'scatter' or 'top'
+    metrics: Tuple[str, ...]
+    countries: Tuple[str, ...] = ()
+    top_n: int = 0  # for 'top' charts, which rank the whole table instead of listing countries
+    source: str = 'data'  # 'data' (the current snapshot) or 'history' (the country-by-year rows)
+
+
+def grid_shape(panels: int) -> Tuple[int, int]:
+    """(rows, columns) of a near-square small-multiples grid, e.g. 2x2 for 4 panels, 3x4 for 10"""
+    ncols = max(1, math.ceil(math.sqrt(panels)))
+    return max(1, -(-panels // ncols)), ncols
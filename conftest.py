@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+from scraper import PopulationScraper, parse_datatable
+
+# A few rows of the Worldometers table, as served (thousands separators, '%',
+# the Unicode minus and 'N.A.' for missing values)
+COUNTRY_ROWS = [
+    ('India', '1,463,865,525', '0.89 %', '12,929,734', '492', '2,973,190', '−495,753', '1.9', '28.8', '37 %', '17.78 %'),
+    ('China', '1,416,096,094', '−0.23 %', '−3,225,184', '151', '9,388,211', '−268,126', '1.0', '40.1', '67 %', '17.20 %'),
+    ('United States', '347,275,807', '0.54 %', '1,849,236', '38', '9,147,420', '1,230,663', '1.6', '38.5', '82 %', '4.22 %'),
+    ('Indonesia', '285,721,236', '0.79 %', '2,233,305', '158', '1,811,570', '−39,509', '2.1', '30.4', '59 %', '3.47 %'),
+    ('Pakistan', '255,219,554', '1.57 %', '3,948,161', '331', '770,880', '−1,235,336', '3.5', '20.6', '34 %', '3.10 %'),
+    ('Türkiye', '87,685,426', '0.27 %', '235,758', '114', '769,630', '−274,362', '1.6', '33.1', '75 %', '1.07 %'),
+    ('South Korea', '51,667,029', '−0.06 %', '−32,452', '531', '97,230', '8,478', '0.7', '45.5', '82 %', '0.63 %'),
+    ('Iceland', '398,266', '0.92 %', '3,620', '4', '100,250', '1,651', '1.6', '36.7', '94 %', '0.00 %'),
+    ('Holy See', '501', '0.00 %', '0', '1,253', '0', '0', 'N.A.', 'N.A.', 'N.A.', '0.00 %'),
+]
+COUNTRY_HEADERS = ['#', 'Country (or dependency)', 'Population (2025)', 'Yearly Change', 'Net Change',
+                   'Density (P/Km²)', 'Land Area (Km²)', 'Migrants (net)', 'Fert. Rate', 'Median Age',
+                   'Urban Pop %', 'World Share']
+
+
+def country_table_html(rows=COUNTRY_ROWS) -> str:
+    header = ''.join(f'<th>{name}</th>' for name in COUNTRY_HEADERS)
+    body = ''.join(
+        '<tr>' + ''.join(f'<td>{cell}</td>' for cell in (str(i),) + row) + '</tr>'
+        for i, row in enumerate(rows, start=1))
+    return (f'<html><body><table id="example2" class="table datatable">'
+            f'<thead><tr>{header}</tr></thead><tbody>{body}</tbody></table></body></html>')
+
+
+@pytest.fixture
+def scraper(tmp_path) -> PopulationScraper:
+    """An offline scraper holding the cleaned fixture table"""
+    scraper = PopulationScraper(use_cache=False, snapshot_dir=str(tmp_path / 'snapshots'))
+    scraper.data = scraper._clean_data(parse_datatable(country_table_html()))
+    return scraper
+
+
+@pytest.fixture
+def countries(scraper) -> pd.DataFrame:
+    return scraper.data
+
+
+@pytest.fixture
+def history() -> pd.DataFrame:
+    """A small long-format (Country, Year) history"""
+    return pd.DataFrame({
+        'Country': ['India'] * 3 + ['China'] * 3,
+        'Year': [2000, 2010, 2020] * 2,
+        'Population': [1.06e9, 1.24e9, 1.43e9, 1.29e9, 1.35e9, 1.42e9],
+        'Median_Age': [22.7, 24.9, 27.3, 30.0, 35.0, 38.4],
+    })
@@ -0,0 +1,119 @@
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+# Common alternative names, mapped to the candidate spellings used by Worldometers
+COUNTRY_ALIASES: Dict[str, Tuple[str, ...]] = {
+    'usa': ('United States',),
+    'us': ('United States',),
+    'u s a': ('United States',),
+    'united states of america': ('United States',),
+    'america': ('United States',),
+    'uk': ('United Kingdom',),
+    'u k': ('United Kingdom',),
+    'great britain': ('United Kingdom',),
+    'britain': ('United Kingdom',),
+    'drc': ('DR Congo',),
+    'dr congo': ('DR Congo',),
+    'democratic republic of the congo': ('DR Congo',),
+    'congo kinshasa': ('DR Congo',),
+    'congo brazzaville': ('Congo',),
+    'republic of the congo': ('Congo',),
+    'uae': ('United Arab Emirates',),
+    'korea': ('South Korea',),
+    'republic of korea': ('South Korea',),
+    'dprk': ('North Korea',),
+    'prc': ('China',),
+    'russian federation': ('Russia',),
+    'ivory coast': ("Côte d'Ivoire",),
+    'czechia': ('Czech Republic (Czechia)', 'Czechia', 'Czech Republic'),
+    'czech republic': ('Czech Republic (Czechia)', 'Czech Republic', 'Czechia'),
+    'burma': ('Myanmar',),
+    'holland': ('Netherlands',),
+    'the netherlands': ('Netherlands',),
+    'vatican': ('Holy See',),
+    'vatican city': ('Holy See',),
+    'east timor': ('Timor-Leste',),
+    'swaziland': ('Eswatini',),
+    'macedonia': ('North Macedonia',),
+    'turkiye': ('Türkiye', 'Turkey'),
+    'turkey': ('Turkey', 'Türkiye'),
+    'cape verde': ('Cabo Verde',),
+    'palestine': ('State of Palestine', 'Palestine'),
+    'lao pdr': ('Laos',),
+    'syrian arab republic': ('Syria',),
+    'viet nam': ('Vietnam',),
+    'iran islamic republic of': ('Iran',),
+}
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+
+def normalize_name(name: str) -> str:
+    """Normalise a country name for matching: strip accents, case and punctuation"""
+    decomposed = unicodedata.normalize('NFKD', str(name))
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    stripped = stripped.casefold().replace('&', ' and ')
+    return _NON_ALNUM.sub(' ', stripped).strip()
+
+
+class CountryIndex:
+    """Hash index from normalised country names and aliases to row positions"""
+
+    def __init__(self, names: Sequence[str], aliases: Optional[Dict[str, Tuple[str, ...]]] = None):
+        self.names = [str(name) for name in names]
+        self.keys = [normalize_name(name) for name in self.names]
+
+        positions: Dict[str, int] = {}
+        for pos, key in enumerate(self.keys):
+            positions.setdefault(key, pos)
+
+        self.aliases: Dict[str, int] = {}
+        for alias, candidates in (COUNTRY_ALIASES if aliases is None else aliases).items():
+            alias_key = normalize_name(alias)
+            if alias_key in positions:
+                continue
+            for candidate in candidates:
+                pos = positions.get(normalize_name(candidate))
+                if pos is not None:
+                    self.aliases[alias_key] = pos
+                    break
+
+        self._positions = dict(positions)
+        self._positions.update(self.aliases)
+        self._key_index = pd.Index(list(self._positions.keys()))
+        self._key_positions = np.fromiter(self._positions.values(), dtype=np.intp, count=len(self._positions))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def lookup(self, name: str) -> Optional[int]:
+        """Get the row position of an exact (normalised) name or alias"""
+        return self._positions.get(normalize_name(name))
+
+    def lookup_many(self, names: Iterable[str]) -> np.ndarray:
+        """Get row positions for many names at once, -1 where a name is unknown"""
+        keys = [normalize_name(name) for name in names]
+        if not len(self._key_positions):
+            return np.full(len(keys), -1, dtype=np.intp)
+        found = self._key_index.get_indexer(keys)
+        return np.where(found >= 0, self._key_positions[found], -1)
+
+    def search(self, name: str) -> Optional[int]:
+        """Exact lookup, falling back to the first name containing the query"""
+        pos = self.lookup(name)
+        if pos is not None:
+            return pos
+        key = normalize_name(name)
+        if not key:
+            return None
+        for pos, candidate in enumerate(self.keys):
+            if key in candidate:
+                return pos
+        return None
+
+    def entries(self) -> List[Tuple[str, int]]:
+        """Get every (normalised key, row position) pair, aliases included"""
+        return list(self._positions.items())
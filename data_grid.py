@@ -0,0 +1,119 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Dict, List, Optional
+from grid_model import GridModel
+
+
+class DataGrid(ttk.Frame):
+    """A Treeview that only materialises the rows currently in view
+
+    The tree holds one item per visible line. Scrolling rewrites the values of
+    those items from the model instead of inserting every row of the table.
+    """
+
+    def __init__(self, master, model: GridModel, on_activate: Optional[Callable[[int], None]] = None,
+                 column_widths: Optional[Dict[str, int]] = None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.model = model
+        self.on_activate = on_activate
+        self.top = 0
+        self.page = 0
+        self.sort_column = None
+        self.sort_descending = False
+        self.positions = model.identity
+        self._items: List[str] = []
+
+        self.tree = ttk.Treeview(self, columns=model.columns, show='headings', selectmode='browse')
+        self.vsb = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.hsb = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.tree.xview)
+        self.tree.configure(xscrollcommand=self.hsb.set)
+
+        for column in model.columns:
+            self.tree.heading(column, text=column, command=lambda c=column: self.sort_by(c))
+            width = (column_widths or {}).get(column, 160 if not model.is_numeric(column) else 110)
+            self.tree.column(column, width=width, minwidth=60, stretch=False,
+                             anchor=tk.E if model.is_numeric(column) else tk.W)
+
+        self.tree.grid(row=0, column=0, sticky=tk.NSEW)
+        self.vsb.grid(row=0, column=1, sticky=tk.NS)
+        self.hsb.grid(row=1, column=0, sticky=tk.EW)
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<MouseWheel>', lambda e: self.scroll(-1 if e.delta > 0 else 1, 'units', 3))
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-1, 'units', 3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll(1, 'units', 3))
+        self.tree.bind('<Prior>', lambda e: self.scroll(-1, 'pages'))
+        self.tree.bind('<Next>', lambda e: self.scroll(1, 'pages'))
+        self.tree.bind('<Home>', lambda e: self.scroll_to(0))
+        self.tree.bind('<End>', lambda e: self.scroll_to(len(self.model)))
+        self.tree.bind('<Double-1>', self._on_double_click)
+        self.tree.bind('<Return>', self._on_double_click)
+
+    def _row_height(self) -> int:
+        style = ttk.Style(self)
+        return int(style.lookup('Treeview', 'rowheight') or 20)
+
+    def _on_resize(self, event):
+        # Leave room for the heading row
+        page = max(1, (event.height - 25) // self._row_height())
+        if page != self.page:
+            self.page = page
+            self.scroll_to(self.top)
+
+    def _on_scrollbar(self, action, *args):
+        if action == tk.MOVETO:
+            self.scroll_to(int(float(args[0]) * len(self.model)))
+        else:
+            self.scroll(int(args[0]), args[1])
+
+    def scroll(self, amount: int, what: str = 'units', step: int = 1):
+        """Scroll by lines or by pages"""
+        lines = amount * (max(self.page - 1, 1) if what == 'pages' else step)
+        self.scroll_to(self.top + lines)
+
+    def scroll_to(self, top: int):
+        """Show the window of rows starting at a (sorted) row offset"""
+        total = len(self.model)
+        self.top = max(0, min(top, total - self.page))
+        self._render()
+
+    def sort_by(self, column: str):
+        """Sort by a column, toggling the direction when it is already the sort column"""
+        if column == self.sort_column:
+            self.sort_descending = not self.sort_descending
+        else:
+            if self.sort_column is not None:
+                self.tree.heading(self.sort_column, text=self.sort_column)
+            self.sort_column = column
+            # Metrics are most interesting largest first, names alphabetically
+            self.sort_descending = self.model.is_numeric(column)
+        self.tree.heading(column, text=f"{column} {'▼' if self.sort_descending else '▲'}")
+        self.positions = self.model.order(column, self.sort_descending)
+        self.scroll_to(0)
+
+    def _render(self):
+        window = self.positions[self.top:self.top + self.page]
+        # Keep exactly one tree item per visible line
+        while len(self._items) < len(window):
+            self._items.append(self.tree.insert('', tk.END, values=()))
+        while len(self._items) > len(window):
+            self.tree.delete(self._items.pop())
+
+        for item, row in zip(self._items, self.model.rows(window)):
+            self.tree.item(item, values=row)
+        self.tree.selection_remove(self.tree.selection())
+
+        total = len(self.model)
+        if total:
+            self.vsb.set(self.top / total, (self.top + len(window)) / total)
+        else:
+            self.vsb.set(0.0, 1.0)
+
+    def _on_double_click(self, event):
+        if self.on_activate is None:
+            return
+        item = self.tree.focus()
+        if item in self._items:
+            self.on_activate(int(self.positions[self.top + self._items.index(item)]))
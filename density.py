@@ -0,0 +1,52 @@
+from typing import NamedTuple, Tuple
+import numpy as np
+import pandas as pd
+
+# Scatter plots of more rows than this are drawn as a density raster instead of points
+DENSITY_THRESHOLD = 5000
+DENSITY_BINS = 150
+
+
+class DensityGrid(NamedTuple):
+    """Point counts of a scatter plot binned on a regular grid"""
+    counts: np.ndarray  # (x bins, y bins)
+    x_edges: np.ndarray
+    y_edges: np.ndarray
+    points: int  # points with both coordinates present
+
+    @property
+    def extent(self) -> Tuple[float, float, float, float]:
+        """(left, right, bottom, top), as imshow expects"""
+        return (float(self.x_edges[0]), float(self.x_edges[-1]), float(self.y_edges[0]), float(self.y_edges[-1]))
+
+    @property
+    def nbytes(self) -> int:
+        return self.counts.nbytes + self.x_edges.nbytes + self.y_edges.nbytes
+
+
+def _value_range(values: np.ndarray) -> Tuple[float, float]:
+    if values.size == 0:
+        return 0.0, 1.0
+    low, high = float(values.min()), float(values.max())
+    if low == high:
+        pad = abs(low) * 0.05 or 0.5
+        return low - pad, high + pad
+    return low, high
+
+
+def bin_points(x: np.ndarray, y: np.ndarray, bins: int = DENSITY_BINS) -> DensityGrid:
+    """Bin the points with both coordinates present over their full extent"""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    present = np.isfinite(x) & np.isfinite(y)
+    x, y = x[present], y[present]
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins, range=[_value_range(x), _value_range(y)])
+    return DensityGrid(counts.astype(np.int32), x_edges, y_edges, int(x.size))
+
+
+def rows_key(data: pd.DataFrame) -> tuple:
+    """Which rows of a snapshot a frame holds; slices keep the snapshot id, so it alone is not enough"""
+    index = data.index
+    if isinstance(index, pd.RangeIndex):
+        return ('range', index.start, index.stop, index.step)
+    return ('rows', len(index), hash(pd.util.hash_pandas_object(index, index=False).to_numpy().tobytes()))
@@ -0,0 +1,181 @@
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+
+
+def create_chrome_driver() -> webdriver.Chrome:
+    """Create a headless Chrome WebDriver configured for scraping"""
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument('--disable-software-rasterizer')
+    chrome_options.add_argument('--disable-webgl')
+    chrome_options.add_argument('--disable-webgl2')
+
+    return webdriver.Chrome(options=chrome_options)
+
+
+class _PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created = time.time()
+
+
+class DriverPool:
+    """A pool of warm WebDrivers that are health-checked before each lease"""
+
+    def __init__(self, size: int = 1, max_pages: int = 50, max_memory_mb: int = 512,
+                 driver_factory: Callable[[], webdriver.Chrome] = create_chrome_driver):
+        self.size = size
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.driver_factory = driver_factory
+        self._idle: List[_PooledDriver] = []
+        self._total = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def warm(self, count: Optional[int] = None):
+        """Start drivers ahead of time so the first lease does not pay for Chrome startup"""
+        count = self.size if count is None else min(count, self.size)
+        while True:
+            with self._cond:
+                if self._closed or self._total >= count:
+                    return
+                self._total += 1
+            entry = self._create()
+            self._release(entry)
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        """Lease a live driver for the duration of a with-block"""
+        entry = self._acquire(timeout)
+        try:
+            yield entry.driver
+        except WebDriverException:
+            # A timeout leaves a usable browser, a crashed session does not
+            if self._is_alive(entry):
+                self._release(entry)
+            else:
+                self._discard(entry)
+            raise
+        except BaseException:
+            self._release(entry)
+            raise
+        else:
+            entry.pages += 1
+            self._release(entry)
+
+    def shutdown(self):
+        """Quit all idle drivers and refuse new leases"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            self._quit(entry)
+
+    def _acquire(self, timeout: Optional[float]) -> _PooledDriver:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Driver pool has been shut down")
+                    if self._idle:
+                        entry = self._idle.pop()
+                        break
+                    if self._total < self.size:
+                        self._total += 1
+                        entry = None
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("Timed out waiting for a WebDriver")
+                    self._cond.wait(remaining)
+
+            if entry is None:
+                return self._create()
+            if self._is_alive(entry):
+                return entry
+            self._discard(entry)
+
+    def _create(self) -> _PooledDriver:
+        try:
+            return _PooledDriver(self.driver_factory())
+        except BaseException:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, entry: _PooledDriver):
+        if self._needs_recycle(entry):
+            self._discard(entry)
+            return
+        with self._cond:
+            if not self._closed:
+                self._idle.append(entry)
+                self._cond.notify()
+                return
+            self._total -= 1
+        self._quit(entry)
+
+    def _discard(self, entry: _PooledDriver):
+        with self._cond:
+            self._total -= 1
+            self._cond.notify()
+        self._quit(entry)
+
+    def _needs_recycle(self, entry: _PooledDriver) -> bool:
+        if entry.pages >= self.max_pages:
+            return True
+        return self._memory_mb(entry) > self.max_memory_mb
+
+    @staticmethod
+    def _is_alive(entry: _PooledDriver) -> bool:
+        try:
+            return entry.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def _memory_mb(entry: _PooledDriver) -> float:
+        """Get the JS heap size of the current page (Chrome only, 0 if unavailable)"""
+        try:
+            used = entry.driver.execute_script(
+                "return window.performance && performance.memory ? performance.memory.usedJSHeapSize : 0")
+            return (used or 0) / (1024 * 1024)
+        except Exception:
+            return 0.0
+
+    @staticmethod
+    def _quit(entry: _PooledDriver):
+        try:
+            entry.driver.quit()
+        except Exception:
+            pass
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_pool() -> DriverPool:
+    """Get the process-wide driver pool, shut down automatically at exit"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = DriverPool()
+            atexit.register(_default_pool.shutdown)
+        return _default_pool
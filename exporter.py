@@ -0,0 +1,302 @@
+import gzip
+import importlib.util
+import io
+import os
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from snapshot_store import SnapshotStore
+
+DEFAULT_CHUNK_ROWS = 50_000
+# Rows per worksheet, including the header row
+XLSX_MAX_ROWS = 1_048_576
+
+
+class ExportFormat(NamedTuple):
+    label: str
+    extension: str
+    module: Union[None, str, Tuple[str, ...]]  # optional package the writer needs (any one of a tuple)
+
+
+EXPORT_FORMATS: Dict[str, ExportFormat] = {
+    'csv': ExportFormat('CSV', '.csv', None),
+    'csv.gz': ExportFormat('CSV (gzip)', '.csv.gz', None),
+    'csv.zst': ExportFormat('CSV (zstd)', '.csv.zst', 'zstandard'),
+    'parquet': ExportFormat('Parquet', '.parquet', 'pyarrow'),
+    'feather': ExportFormat('Feather', '.feather', 'pyarrow'),
+    # openpyxl (what DataFrame.to_excel uses) when xlsxwriter is not installed
+    'xlsx': ExportFormat('Excel', '.xlsx', ('xlsxwriter', 'openpyxl')),
+}
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def _has_writer(fmt: ExportFormat) -> bool:
+    if fmt.module is None:
+        return True
+    modules = (fmt.module,) if isinstance(fmt.module, str) else fmt.module
+    return any(_installed(module) for module in modules)
+
+
+def available_formats() -> List[str]:
+    """Get the export formats whose optional dependencies are installed"""
+    return [name for name, fmt in EXPORT_FORMATS.items() if _has_writer(fmt)]
+
+
+def format_for_path(path: str) -> str:
+    """Work out the export format from a file name"""
+    lower = path.lower()
+    # Longest extension first so '.csv.gz' is not taken for '.gz' or '.csv'
+    for name, fmt in sorted(EXPORT_FORMATS.items(), key=lambda item: -len(item[1].extension)):
+        if lower.endswith(fmt.extension):
+            return name
+    raise ValueError(f"Unsupported export file type: {os.path.basename(path)}")
+
+
+def _plain_column(series: pd.Series, dtype=None) -> pd.Series:
+    """Widen a column to a dtype every writer handles the same way in every chunk"""
+    if dtype is None:
+        if pd.api.types.is_integer_dtype(series.dtype):
+            dtype = np.int64
+        elif pd.api.types.is_numeric_dtype(series.dtype):
+            dtype = np.float64
+        else:
+            dtype = object
+    if dtype is object:
+        return series.astype(object).where(series.notna(), None)
+    return series.astype(dtype)
+
+
+def frame_chunks(df: pd.DataFrame, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Split a DataFrame into row chunks with plain (non-categorical, 64-bit) columns"""
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        yield pd.DataFrame({col: _plain_column(chunk[col]) for col in chunk.columns})
+
+
+def snapshot_rows(store: SnapshotStore, snapshot_ids: Iterable[str]) -> int:
+    """Total row count of some snapshots, read from their metadata only"""
+    return sum(store.read_meta(snapshot_id)['rows'] for snapshot_id in snapshot_ids)
+
+
+def snapshot_chunks(store: SnapshotStore, snapshot_ids: Optional[List[str]] = None,
+                    chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Stream several stored snapshots as row chunks with a leading 'Snapshot' column
+
+    Snapshots are memory-mapped one at a time, so only the current chunk is
+    ever materialised. Columns get one dtype across all snapshots (a column
+    stored as integers in one snapshot and floats in another becomes float).
+    """
+    snapshot_ids = store.list_snapshots() if snapshot_ids is None else snapshot_ids
+    metas = [store.read_meta(snapshot_id) for snapshot_id in snapshot_ids]
+
+    kinds: Dict[str, set] = {}
+    for meta in metas:
+        for column in meta['columns']:
+            if column['kind'] == 'category':
+                kind = 'text'
+            else:
+                kind = 'int' if np.dtype(column['dtype']).kind in 'iub' else 'float'
+            kinds.setdefault(column['name'], set()).add(kind)
+    dtypes: Dict[str, object] = {}
+    for name, found in kinds.items():
+        everywhere = all(name in {c['name'] for c in meta['columns']} for meta in metas)
+        if 'text' in found:
+            dtypes[name] = object
+        elif found == {'int'} and everywhere:
+            dtypes[name] = np.int64
+        else:
+            dtypes[name] = np.float64  # NaN where a snapshot lacks the column
+
+    for snapshot_id in snapshot_ids:
+        df = store.load(snapshot_id)
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows].reindex(columns=list(dtypes))
+            columns = {'Snapshot': np.full(len(chunk), snapshot_id, dtype=object)}
+            columns.update({col: _plain_column(chunk[col], dtype).to_numpy() for col, dtype in dtypes.items()})
+            yield pd.DataFrame(columns)
+
+
+class _CsvWriter:
+    def __init__(self, path: str, compression: Optional[str]):
+        self._raw = None
+        if compression == 'gzip':
+            self._file = gzip.open(path, 'wt', encoding='utf-8', newline='', compresslevel=6)
+        elif compression == 'zstd':
+            import zstandard
+            self._raw = open(path, 'wb')
+            stream = zstandard.ZstdCompressor(level=6).stream_writer(self._raw)
+            self._file = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+        else:
+            self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._header = True
+
+    def write(self, chunk: pd.DataFrame):
+        chunk.to_csv(self._file, index=False, header=self._header)
+        self._header = False
+
+    def close(self):
+        self._file.close()
+        if self._raw is not None and not self._raw.closed:
+            self._raw.close()
+
+
+class _ArrowWriter:
+    """Parquet (one row group per chunk) or Feather/Arrow IPC (one record batch per chunk)"""
+
+    def __init__(self, path: str, fmt: str):
+        self.path = path
+        self.fmt = fmt
+        self._writer = None
+        self._schema = None
+
+    def write(self, chunk: pd.DataFrame):
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(chunk, schema=self._schema, preserve_index=False)
+        if self._writer is None:
+            self._schema = table.schema
+            if self.fmt == 'parquet':
+                import pyarrow.parquet as pq
+                self._writer = pq.ParquetWriter(self.path, self._schema, compression='zstd')
+            else:
+                # Feather v2 is the Arrow IPC file format
+                self._writer = pa.ipc.new_file(
+                    self.path, self._schema, options=pa.ipc.IpcWriteOptions(compression='zstd'))
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class _XlsxWriter:
+    """Constant-memory XLSX: each row is flushed to disk as soon as it is written"""
+
+    def __init__(self, path: str):
+        import xlsxwriter
+        self._workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+        self._sheet = None
+        self._row = 0
+        self._columns = None
+
+    def _new_sheet(self):
+        self._sheet = self._workbook.add_worksheet()
+        self._sheet.write_row(0, 0, self._columns)
+        self._row = 1
+
+    def write(self, chunk: pd.DataFrame):
+        if self._columns is None:
+            self._columns = [str(col) for col in chunk.columns]
+            self._new_sheet()
+        # Blank cells for missing values
+        values = chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None)
+        for row in values:
+            if self._row == XLSX_MAX_ROWS:
+                self._new_sheet()
+            self._sheet.write_row(self._row, 0, row)
+            self._row += 1
+
+    def close(self):
+        if self._sheet is None:
+            self._workbook.add_worksheet()
+        self._workbook.close()
+
+
+class _OpenpyxlWriter:
+    """Write-only (streaming) openpyxl workbook, for when xlsxwriter is not installed"""
+
+    def __init__(self, path: str):
+        import openpyxl
+        self.path = path
+        self._workbook = openpyxl.Workbook(write_only=True)
+        self._sheet = None
+        self._row = 0
+        self._columns = None
+
+    def _new_sheet(self):
+        self._sheet = self._workbook.create_sheet()
+        self._sheet.append(self._columns)
+        self._row = 1
+
+    def write(self, chunk: pd.DataFrame):
+        if self._columns is None:
+            self._columns = [str(col) for col in chunk.columns]
+            self._new_sheet()
+        values = chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None)
+        for row in values:
+            if self._row == XLSX_MAX_ROWS:
+                self._new_sheet()
+            self._sheet.append(row)
+            self._row += 1
+
+    def close(self):
+        if self._sheet is None:
+            self._workbook.create_sheet()
+        self._workbook.save(self.path)
+
+
+def _open_writer(path: str, fmt: str):
+    if fmt in ('csv', 'csv.gz', 'csv.zst'):
+        return _CsvWriter(path, {'csv': None, 'csv.gz': 'gzip', 'csv.zst': 'zstd'}[fmt])
+    if fmt in ('parquet', 'feather'):
+        return _ArrowWriter(path, fmt)
+    if fmt == 'xlsx':
+        return _XlsxWriter(path) if _installed('xlsxwriter') else _OpenpyxlWriter(path)
+    raise ValueError(f"Unknown export format '{fmt}'")
+
+
+def export_chunks(chunks: Iterable[pd.DataFrame], path: str, fmt: Optional[str] = None,
+                  total_rows: Optional[int] = None,
+                  progress_callback: Optional[Callable[[int, Optional[int]], None]] = None,
+                  cancel_event=None) -> int:
+    """Write row chunks to a file one at a time and return the number of rows written
+
+    The file is written under a temporary name and only moved into place once
+    complete, so a failed or cancelled export never leaves a truncated file.
+    """
+    fmt = fmt or format_for_path(path)
+    export_format = EXPORT_FORMATS[fmt]
+    if not _has_writer(export_format):
+        modules = [export_format.module] if isinstance(export_format.module, str) else export_format.module
+        raise ImportError(f"Exporting {export_format.label} requires the "
+                          f"{' or '.join(repr(module) for module in modules)} package")
+
+    tmp_path = f"{path}.part"
+    writer = _open_writer(tmp_path, fmt)
+    written = 0
+    try:
+        for chunk in chunks:
+            if cancel_event is not None and cancel_event.is_set():
+                raise InterruptedError("Export cancelled")
+            writer.write(chunk)
+            written += len(chunk)
+            if progress_callback:
+                progress_callback(written, total_rows)
+        writer.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            writer.close()
+        except Exception:
+            pass
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return written
+
+
+def export_frame(df: pd.DataFrame, path: str, fmt: Optional[str] = None,
+                 chunk_rows: int = DEFAULT_CHUNK_ROWS, **kwargs) -> int:
+    """Export a DataFrame in chunks; keyword arguments go to export_chunks"""
+    return export_chunks(frame_chunks(df, chunk_rows), path, fmt, total_rows=len(df), **kwargs)
+
+
+def export_snapshots(store: SnapshotStore, path: str, snapshot_ids: Optional[List[str]] = None,
+                     fmt: Optional[str] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS, **kwargs) -> int:
+    """Export several stored snapshots, streamed from disk, into one file"""
+    snapshot_ids = store.list_snapshots() if snapshot_ids is None else snapshot_ids
+    return export_chunks(snapshot_chunks(store, snapshot_ids, chunk_rows), path, fmt,
+                         total_rows=snapshot_rows(store, snapshot_ids), **kwargs)
@@ -0,0 +1,79 @@
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Optional
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'POPULATION_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'population_explorer')
+)
+DEFAULT_TTL = 6 * 60 * 60  # seconds, the source data changes at most daily
+
+
+def content_hash(text: str) -> str:
+    """Hash fetched content so unchanged tables can be detected"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class FetchCache:
+    """On-disk fetch metadata (TTL, HTTP validators, table hash) for cached snapshots"""
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl: float = DEFAULT_TTL):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.ttl = ttl
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, url: str, suffix: str) -> str:
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{key}{suffix}")
+
+    def get_entry(self, url: str) -> Optional[Dict]:
+        """Get the cache metadata for a URL, or None if nothing is cached"""
+        try:
+            with open(self._path(url, '.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """Check whether an entry is still within its TTL"""
+        return time.time() - entry.get('fetched_at', 0) < self.ttl
+
+    @staticmethod
+    def validators(entry: Optional[Dict]) -> Dict[str, str]:
+        """Get conditional request headers for revalidating an entry"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url: str, snapshot_id: str, table_hash: str,
+              etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Record the snapshot holding a URL's cleaned table along with its revalidation metadata"""
+        self._write_entry(url, {
+            'url': url,
+            'snapshot_id': snapshot_id,
+            'etag': etag,
+            'last_modified': last_modified,
+            'content_hash': table_hash,
+            'fetched_at': time.time(),
+        })
+
+    def touch(self, url: str, entry: Dict, etag: Optional[str] = None,
+              last_modified: Optional[str] = None):
+        """Mark a revalidated entry as fresh again without writing a new snapshot"""
+        entry = dict(entry)
+        entry['etag'] = etag or entry.get('etag')
+        entry['last_modified'] = last_modified or entry.get('last_modified')
+        entry['fetched_at'] = time.time()
+        self._write_entry(url, entry)
+
+    def _write_entry(self, url: str, entry: Dict):
+        entry_path = self._path(url, '.json')
+        with open(entry_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(entry_path + '.tmp', entry_path)
@@ -0,0 +1,149 @@
+import ast
+import operator
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, Mapping
+import numpy as np
+import pandas as pd
+
+_COMPARISONS = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+
+# Evaluates a node given the column arrays and a mask cache keyed by canonical sub-expression
+_Evaluator = Callable[[Mapping[str, np.ndarray], Dict[str, np.ndarray]], np.ndarray]
+
+
+class FilterExpression:
+    """A compound predicate over numeric columns, compiled once into NumPy operations
+
+    Supports comparisons (including chained ones such as ``10 < Density < 500``)
+    between columns and numbers, combined with ``and``, ``or``, ``not`` and
+    parentheses. Missing values never match. Every sub-expression has a
+    canonical form, so masks can be cached and shared between filters that
+    have conditions in common.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        try:
+            tree = ast.parse(' '.join(source.split()), mode='eval').body
+        except SyntaxError as e:
+            raise ValueError(f"Invalid filter '{source}': {e.msg}") from None
+        columns = set()
+        self._evaluate = self._compile(tree, columns)
+        self.canonical = ast.unparse(tree)
+        self.columns: FrozenSet[str] = frozenset(columns)
+
+    def _compile(self, node: ast.AST, columns: set) -> _Evaluator:
+        key = ast.unparse(node)
+
+        if isinstance(node, ast.BoolOp):
+            parts = [self._compile(value, columns) for value in node.values]
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+
+            def evaluate(data, cache):
+                if key not in cache:
+                    mask = parts[0](data, cache)
+                    for part in parts[1:]:
+                        mask = combine(mask, part(data, cache))
+                    cache[key] = mask
+                return cache[key]
+            return evaluate
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            inner_columns = set()
+            inner = self._compile(node.operand, inner_columns)
+            columns.update(inner_columns)
+            names = sorted(inner_columns)
+
+            def evaluate(data, cache):
+                if key not in cache:
+                    # Rows missing a value the inner expression reads matched nothing there,
+                    # and must not start matching through the negation
+                    mask = ~inner(data, cache)
+                    for name in names:
+                        mask = mask & ~np.isnan(data[name])
+                    cache[key] = mask
+                return cache[key]
+            return evaluate
+
+        if isinstance(node, ast.Compare):
+            operands = [self._operand(value, columns) for value in [node.left] + node.comparators]
+            ops = []
+            for op in node.ops:
+                if type(op) not in _COMPARISONS:
+                    raise ValueError(f"Unsupported comparison in '{key}'")
+                ops.append(_COMPARISONS[type(op)])
+
+            def evaluate(data, cache):
+                if key not in cache:
+                    values = [operand(data) for operand in operands]
+                    mask = None
+                    for op, left, right in zip(ops, values, values[1:]):
+                        # Missing values never match, not even under !=
+                        step = op(left, right) & ~(np.isnan(left) | np.isnan(right))
+                        mask = step if mask is None else mask & step
+                    cache[key] = mask
+                return cache[key]
+            return evaluate
+
+        raise ValueError(f"Unsupported filter expression '{key}', expected comparisons "
+                         "joined with and / or / not")
+
+    @staticmethod
+    def _operand(node: ast.AST, columns: set) -> Callable[[Mapping[str, np.ndarray]], np.ndarray]:
+        if isinstance(node, ast.Name):
+            name = node.id
+            columns.add(name)
+            return lambda data: data[name]
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            value = np.float64(node.value)
+            return lambda data: value
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Constant):
+            value = -np.float64(node.operand.value)
+            return lambda data: value
+        raise ValueError(f"Expected a column name or a number, got '{ast.unparse(node)}'")
+
+    def evaluate(self, data: Mapping[str, np.ndarray], cache: Dict[str, np.ndarray]) -> np.ndarray:
+        """Get the boolean row mask, reusing and filling the cache of sub-expression masks"""
+        missing = self.columns.difference(data)
+        if missing:
+            raise ValueError(f"Unknown or non-numeric column(s) in filter: {', '.join(sorted(missing))}")
+        mask = self._evaluate(data, cache)
+        if np.ndim(mask) == 0:
+            # Only constants, e.g. '1 < 2'
+            length = len(next(iter(data.values()))) if data else 0
+            mask = np.full(length, bool(mask))
+        return mask
+
+
+@lru_cache(maxsize=256)
+def compile_filter(source: str) -> FilterExpression:
+    """Parse a filter expression, reusing the compiled form for repeated text"""
+    return FilterExpression(source)
+
+
+class FilterEngine:
+    """Evaluates filters against one snapshot, caching every mask it computes"""
+
+    def __init__(self, data):
+        self.columns: Dict[str, np.ndarray] = {
+            str(col): data[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            for col in data.columns if pd.api.types.is_numeric_dtype(data[col].dtype)
+        }
+        self._masks: Dict[str, np.ndarray] = {}
+
+    def mask(self, source: str) -> np.ndarray:
+        """Get the (read-only, cached) boolean mask of rows matching a filter"""
+        mask = compile_filter(source).evaluate(self.columns, self._masks)
+        mask.flags.writeable = False
+        return mask
+
+    def positions(self, source: str) -> np.ndarray:
+        """Get the row positions matching a filter"""
+        return np.flatnonzero(self.mask(source))
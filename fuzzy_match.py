@@ -0,0 +1,74 @@
+from collections import defaultdict
+from typing import Dict, List, Sequence, Set, Tuple
+import numpy as np
+from country_index import normalize_name
+
+
+def trigrams(key: str) -> Set[str]:
+    """Get the padded character trigrams of a normalised name"""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance between two strings"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+class TrigramIndex:
+    """Inverted trigram index for ranked "did you mean" suggestions
+
+    Candidates are scored by trigram overlap in one vectorised pass, then only
+    the best few are re-ranked by edit distance.
+    """
+
+    def __init__(self, entries: Sequence[Tuple[str, int]]):
+        """Build the index from (normalised key, target) pairs, e.g. names and aliases to rows"""
+        self.keys = [key for key, _ in entries]
+        self.targets = np.array([target for _, target in entries], dtype=np.intp)
+
+        postings: Dict[str, List[int]] = defaultdict(list)
+        sizes = np.zeros(len(self.keys), dtype=np.int32)
+        for key_id, key in enumerate(self.keys):
+            grams = trigrams(key)
+            sizes[key_id] = len(grams)
+            for gram in grams:
+                postings[gram].append(key_id)
+        self._postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self._sizes = sizes
+
+    def query(self, text: str, k: int = 5, min_score: float = 0.3) -> List[Tuple[int, float]]:
+        """Get up to k (target, score) suggestions for a possibly misspelled name, best first"""
+        key = normalize_name(text)
+        grams = trigrams(key)
+        hits = [self._postings[gram] for gram in grams if gram in self._postings]
+        if not key or not hits:
+            return []
+
+        shared = np.bincount(np.concatenate(hits), minlength=len(self.keys))
+        dice = 2.0 * shared / (self._sizes + len(grams))
+
+        # Over-fetch so that several aliases of one country do not crowd out the rest
+        shortlist = min(len(dice), max(4 * k, 20))
+        candidates = np.argpartition(-dice, shortlist - 1)[:shortlist]
+        candidates = candidates[shared[candidates] > 0]
+
+        best: Dict[int, float] = {}
+        for key_id in candidates:
+            candidate = self.keys[key_id]
+            similarity = 1.0 - edit_distance(key, candidate) / max(len(key), len(candidate))
+            score = 0.5 * dice[key_id] + 0.5 * similarity
+            target = int(self.targets[key_id])
+            if score >= min_score and score > best.get(target, -1.0):
+                best[target] = score
+
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+        return [(target, float(score)) for target, score in ranked[:k]]
@@ -0,0 +1,82 @@
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+# Display formats used by format_column, keyed by column name
+INTEGER_COLUMNS = {'Rank', 'Population', 'Net_Change', 'Land_Area', 'Net_Migration',
+                   'Urban_Population', 'World_Population', 'Global_Rank'}
+PERCENT_COLUMNS = {'Yearly_Change', 'Urban_Population_Percent', 'World_Share'}
+ONE_DECIMAL_COLUMNS = {'Fertility_Rate', 'Median_Age'}
+
+
+def format_column(series: pd.Series) -> np.ndarray:
+    """Format a whole column for display in one pass, 'N/A' where the value is missing"""
+    name = series.name
+    if not pd.api.types.is_numeric_dtype(series.dtype):
+        text = series.astype(object).to_numpy()
+        return np.where(pd.isna(text), 'N/A', text.astype(str)).astype(object)
+
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    if name in ('Year', 'Density'):
+        pattern = '{:.0f}'
+    elif name in INTEGER_COLUMNS or pd.api.types.is_integer_dtype(series.dtype):
+        pattern = '{:,.0f}'
+    elif name in PERCENT_COLUMNS:
+        pattern = '{:.2f}%'
+    elif name in ONE_DECIMAL_COLUMNS:
+        pattern = '{:.1f}'
+    else:
+        pattern = '{:,.2f}'
+    formatted = np.full(len(values), 'N/A', dtype=object)
+    valid = ~np.isnan(values)
+    formatted[valid] = [pattern.format(value) for value in values[valid].tolist()]
+    return formatted
+
+
+class GridModel:
+    """Display strings and sort permutations for every column of one table
+
+    Columns are formatted on first use and sort orders are computed once per
+    (column, direction), so scrolling and re-sorting only slice arrays.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self.data = data
+        self.columns: List[str] = [str(col) for col in data.columns]
+        self._display: Dict[str, np.ndarray] = {}
+        self._orders: Dict[Tuple[str, bool], np.ndarray] = {}
+        self.identity = np.arange(len(data), dtype=np.intp)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def is_numeric(self, column: str) -> bool:
+        return pd.api.types.is_numeric_dtype(self.data[column].dtype)
+
+    def display(self, column: str) -> np.ndarray:
+        """Get the preformatted display strings of a column"""
+        if column not in self._display:
+            self._display[column] = format_column(self.data[column])
+        return self._display[column]
+
+    def order(self, column: str, descending: bool = False) -> np.ndarray:
+        """Get the row positions sorted by a column; missing values always sort last"""
+        key = (column, descending)
+        if key not in self._orders:
+            series = self.data[column]
+            if self.is_numeric(column):
+                values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+                # Stable argsort keeps ties in table order; NaN sorts last either way
+                self._orders[key] = np.argsort(-values if descending else values, kind='stable')
+            else:
+                codes, _ = pd.factorize(series, sort=True)
+                codes = codes.astype(np.int64)
+                missing = codes < 0
+                codes = -codes if descending else codes
+                codes[missing] = np.iinfo(np.int64).max
+                self._orders[key] = np.argsort(codes, kind='stable')
+        return self._orders[key]
+
+    def rows(self, positions: np.ndarray) -> List[Tuple[str, ...]]:
+        """Get the display rows for some row positions"""
+        return list(zip(*(self.display(column)[positions] for column in self.columns)))
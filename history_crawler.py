@@ -0,0 +1,213 @@
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+import pandas as pd
+from lxml import html as lxml_html
+from scraper import convert_numeric_block, new_session, table_to_frame
+
+if TYPE_CHECKING:
+    import requests
+
+BASE_URL = "https://www.worldometers.info"
+COUNTRY_LIST_URL = BASE_URL + "/world-population/population-by-country/"
+
+# Country pages label columns differently from the main table: there 'Yearly Change'
+# is the absolute change and the percentage lives under 'Yearly % Change'
+HISTORY_COLUMN_PATTERNS = [
+    (re.compile(r'^year\b'), 'Year'),
+    (re.compile(r'^population\b'), 'Population'),
+    (re.compile(r'^yearly %'), 'Yearly_Change'),
+    (re.compile(r'^yearly change\b'), 'Net_Change'),
+    (re.compile(r'^migrants\b'), 'Net_Migration'),
+    (re.compile(r'^med(\.|ian)? age\b'), 'Median_Age'),
+    (re.compile(r'^fert(\.|ility)? rate\b'), 'Fertility_Rate'),
+    (re.compile(r'^density\b'), 'Density'),
+    (re.compile(r'^urban pop(\.|ulation)? %'), 'Urban_Population_Percent'),
+    (re.compile(r'^urban population\b'), 'Urban_Population'),
+    (re.compile(r"^country'?s share"), 'World_Share'),
+    (re.compile(r'^world population\b'), 'World_Population'),
+    (re.compile(r'global rank\b'), 'Global_Rank'),
+]
+
+
+def normalize_history_column(name: str) -> str:
+    """Map a raw country-page header onto its canonical column name"""
+    key = ' '.join(str(name).split()).lower()
+    for pattern, column in HISTORY_COLUMN_PATTERNS:
+        if pattern.search(key):
+            return column
+    return name
+
+
+def country_slug(country: str) -> str:
+    """Guess the URL slug Worldometers uses for a country page"""
+    slug = re.sub(r'[^0-9a-z]+', '-', country.lower().replace("'", '')).strip('-')
+    return f"{BASE_URL}/world-population/{slug}-population/"
+
+
+def parse_country_links(page_html: str) -> Dict[str, str]:
+    """Get country name -> absolute country page URL from the population-by-country page"""
+    doc = lxml_html.fromstring(page_html)
+    links = {}
+    for anchor in doc.xpath('//table[contains(@class, "datatable")]//td/a[@href]'):
+        name = ' '.join(anchor.text_content().split())
+        if name:
+            links[name] = urljoin(BASE_URL, anchor.get('href'))
+    return links
+
+
+def parse_history_tables(page_html: str) -> pd.DataFrame:
+    """Parse and merge the yearly tables (historical and forecast) on a country page"""
+    doc = lxml_html.fromstring(page_html)
+    frames = []
+    for table in doc.xpath('//table'):
+        headers = [' '.join(th.text_content().split()).lower() for th in table.xpath('.//tr[th][1]/th')]
+        if not headers or headers[0] != 'year':
+            continue
+        frame = table_to_frame(table, min_cells=2)
+        frames.append(frame.rename(columns=normalize_history_column))
+    if not frames:
+        raise ValueError("No yearly population table found on the page")
+
+    df = pd.concat(frames, ignore_index=True)
+    df = df.loc[:, ~df.columns.duplicated()]
+    value_columns = [col for col in df.columns if col != 'Year']
+    converted = convert_numeric_block(df, value_columns)
+    converted.update(convert_numeric_block(df, ['Year']))
+    df = pd.DataFrame(converted, index=df.index)[['Year'] + value_columns]
+    df = df.dropna(subset=['Year']).drop_duplicates(subset='Year', keep='first')
+    return df.sort_values('Year').reset_index(drop=True)
+
+
+class HostLimiter:
+    """Per-host politeness: caps concurrent requests and spaces out request starts"""
+
+    def __init__(self, max_per_host: int = 4, min_interval: float = 0.2):
+        self.max_per_host = max_per_host
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @contextmanager
+    def slot(self, url: str):
+        host = urlparse(url).netloc
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.Semaphore(self.max_per_host))
+        with semaphore:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + self.min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+
+class HistoryCrawler:
+    """Fetch every country's yearly population table concurrently
+
+    The result is one long-format frame with a row per (Country, Year).
+    requests.Session is not thread-safe, so every worker thread gets its own.
+    """
+
+    def __init__(self, max_workers: int = 16, max_per_host: int = 4, min_interval: float = 0.2,
+                 timeout: int = 15, max_retries: int = 2, retry_delay: float = 2.0):
+        self.max_workers = max_workers
+        self.limiter = HostLimiter(max_per_host, min_interval)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._local = threading.local()
+
+    def _session(self) -> 'requests.Session':
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            # One thread only ever has one request in flight
+            session = self._local.session = new_session(pool_maxsize=1)
+        return session
+
+    def _get(self, url: str) -> str:
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self.limiter.slot(url):
+                    response = self._session().get(url, timeout=self.timeout)
+                if response.status_code == 429 or response.status_code >= 500:
+                    raise IOError(f"HTTP {response.status_code} for {url}")
+                response.raise_for_status()
+                return response.text
+            except Exception as e:
+                last_error = e
+                if attempt < self.max_retries:
+                    time.sleep(self.retry_delay * (attempt + 1))
+        raise last_error
+
+    def discover_country_urls(self, countries: Optional[List[str]] = None) -> Dict[str, str]:
+        """Get the country page URL for each country, from the links in the main table"""
+        links = parse_country_links(self._get(COUNTRY_LIST_URL))
+        if countries is None:
+            return links
+        return {country: links.get(country) or country_slug(country) for country in countries}
+
+    def fetch_country(self, country: str, url: str) -> pd.DataFrame:
+        """Fetch and parse one country's yearly table"""
+        df = parse_history_tables(self._get(url))
+        df.insert(0, 'Country', country)
+        return df
+
+    def crawl(self, country_urls: Optional[Dict[str, str]] = None,
+              progress_callback: Optional[Callable[[int, int, str], None]] = None) -> pd.DataFrame:
+        """Crawl all country pages and merge them into one long-format DataFrame"""
+        if country_urls is None:
+            country_urls = self.discover_country_urls()
+
+        frames = []
+        failures = []
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.fetch_country, country, url): country
+                       for country, url in country_urls.items()}
+            for future in as_completed(futures):
+                country = futures[future]
+                done += 1
+                try:
+                    frames.append(future.result())
+                except Exception as e:
+                    failures.append(country)
+                    print(f"Failed to fetch history for {country}: {str(e)}")
+                if progress_callback:
+                    progress_callback(done, len(futures), country)
+
+        if failures:
+            print(f"\nHistory missing for {len(failures)} of {len(country_urls)} countries")
+        if not frames:
+            raise ValueError("No country history could be fetched")
+
+        history = pd.concat(frames, ignore_index=True)
+        history['Year'] = history['Year'].astype('int64')
+        return history.sort_values(['Country', 'Year'], kind='stable').reset_index(drop=True)
+
+
+def main():
+    """Crawl every country's history into the local history snapshot store"""
+    import argparse
+    from scraper import PopulationScraper
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--workers', type=int, default=16, help="concurrent page fetches (default: 16)")
+    args = parser.parse_args()
+
+    def report(done, total, country):
+        print(f"\r[{done}/{total}] {country:<40}", end='', flush=True)
+
+    history = PopulationScraper().crawl_history(max_workers=args.workers, progress_callback=report)
+    print(f"\nStored {len(history):,} rows for {history['Country'].nunique()} countries")
+
+
+if __name__ == "__main__":
+    main()
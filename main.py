@@ -1,10 +1,36 @@
+import os
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import numpy as np
+# Only Tk and the snapshot loader are imported up front; matplotlib (through
+# chart_canvas and visualizer), Pillow and the scraper's network stack load on first use
+from chart_cache import ChartCache
+from data_grid import DataGrid
+from grid_model import GridModel
+from exporter import EXPORT_FORMATS, available_formats, export_frame, export_snapshots
+from render_worker import RenderWorker
 from scraper import PopulationScraper
-from visualizer import PopulationVisualizer
+from session import load_session, save_session
+from chart_spec import ChartSpec, METRICS, grid_shape
+from density import DENSITY_THRESHOLD
+from animation import (ANIMATION_FORMATS, DEFAULT_FPS, BarRace, ScatterAnimation, export_animation,
+                       snapshot_timeline)
+
+# Comparison sets larger than this are rendered in the background worker process
+OFFLOAD_THRESHOLD = 25
+# Memory budget for rendered chart images kept for instant redisplay
+CHART_CACHE_MB = 64
+# What the export dialog offers; stored snapshots are streamed from disk
+EXPORT_SOURCES = ['Current data', 'Comparison list', 'All stored snapshots', 'Country history']
+FILTER_METRICS = METRICS
+# What the scatter dialog can plot; the history is drawn as a density raster once it is large
+SCATTER_SOURCES = ['Comparison list', 'All countries', 'Country history']
+ANIMATION_KINDS = ['Bar chart race', 'Animated scatter']
+ANIMATION_SOURCES = ['Country history', 'Stored snapshots']
+# Pause in typing before the search completions are refreshed
+COMPLETION_DELAY_MS = 120
 
 class PopulationExplorerApp:
     def __init__(self, root):
@@ -13,9 +39,37 @@ class PopulationExplorerApp:
         self.root.geometry("1000x700")
         
         self.scraper = PopulationScraper()
-        self.visualizer = PopulationVisualizer()
-        self.data = None
+        self._visualizer = None
+        self._chart_canvas = None
         self.selected_countries = []
+        self.data_controls = []
+        
+        # Background loading state
+        self.load_queue = queue.Queue()
+        self.load_thread = None
+        self.load_cancel = None
+        
+        # Background chart rendering state
+        self.render_worker = RenderWorker()
+        self.render_key = None
+        self.chart_images = ChartCache(CHART_CACHE_MB)
+        self.chart_photo = None
+        self.last_chart_spec = None
+        
+        # Background export state
+        self.export_queue = queue.Queue()
+        self.export_thread = None
+        self.export_cancel = None
+        self.export_unit = 'rows'
+        
+        # Background history crawl state
+        self.crawl_queue = queue.Queue()
+        self.crawl_thread = None
+        
+        # Search-as-you-type state
+        self.complete_job = None
+        self.completion_popup = None
+        self.completion_list = None
         
         # Configure styles
         self.style = ttk.Style()
@@ -25,10 +79,34 @@ class PopulationExplorerApp:
         self.style.configure('Header.TLabel', font=('Arial', 12, 'bold'))
         
         self.create_widgets()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Restore the last session from the local snapshot, then refresh in the background
+        self.session = load_session()
+        self.load_cached_data(self.session.get('snapshot_id'))
+        self.restore_session()
         self.load_data()
     
     def create_widgets(self):
         """Create all GUI widgets"""
+        # Status bar
+        self.status_bar = ttk.Frame(self.root, padding=(10, 2))
+        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        self.status_label = ttk.Label(self.status_bar, text="Loading data...")
+        self.status_label.pack(side=tk.LEFT)
+        
+        self.cancel_load_btn = ttk.Button(self.status_bar, text="Cancel", command=self.cancel_load)
+        self.cancel_load_btn.pack(side=tk.RIGHT)
+        self.load_progress = ttk.Progressbar(self.status_bar, mode='indeterminate', length=150)
+        self.load_progress.pack(side=tk.RIGHT, padx=5)
+        
+        # Shown only while an export runs
+        self.cancel_export_btn = ttk.Button(self.status_bar, text="Cancel Export", command=self.cancel_export)
+        self.export_progress = ttk.Progressbar(self.status_bar, mode='determinate', length=150, maximum=100)
+        # Shown only while the country history is crawled
+        self.crawl_progress = ttk.Progressbar(self.status_bar, mode='determinate', length=150, maximum=100)
+        
         # Main container
         self.main_frame = ttk.Frame(self.root)
         self.main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -39,10 +117,6 @@ class PopulationExplorerApp:
         
         ttk.Label(self.header_frame, text="🌍 Population Data Explorer", style='Header.TLabel').pack(side=tk.LEFT)
         
-        # Status label
-        self.status_label = ttk.Label(self.header_frame, text="Loading data...")
-        self.status_label.pack(side=tk.RIGHT)
-        
         # Left panel - controls
         self.control_frame = ttk.Frame(self.main_frame)
         self.control_frame.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 10))
@@ -55,9 +129,16 @@ class PopulationExplorerApp:
         self.search_entry = ttk.Entry(search_frame)
         self.search_entry.grid(row=0, column=1, sticky=tk.EW, padx=5)
         self.search_entry.bind('<Return>', lambda e: self.search_country())
+        self.search_entry.bind('<KeyRelease>', self.on_search_key)
+        self.search_entry.bind('<Down>', lambda e: self.focus_completions())
+        self.search_entry.bind('<Escape>', lambda e: self.hide_completions())
+        self.search_entry.bind('<FocusOut>', lambda e: self.root.after(150, self._hide_unfocused_completions))
         
-        ttk.Button(search_frame, text="Search", command=self.search_country).grid(row=0, column=2)
-        ttk.Button(search_frame, text="Add to Compare", command=self.add_from_search).grid(row=1, column=0, columnspan=3, pady=(5,0), sticky=tk.EW)
+        search_btn = ttk.Button(search_frame, text="Search", command=self.search_country)
+        search_btn.grid(row=0, column=2)
+        add_btn = ttk.Button(search_frame, text="Add to Compare", command=self.add_from_search)
+        add_btn.grid(row=1, column=0, columnspan=3, pady=(5,0), sticky=tk.EW)
+        self.data_controls += [self.search_entry, search_btn, add_btn]
         
         # Compare section
         compare_frame = ttk.LabelFrame(self.control_frame, text="Compare Countries", padding=10)
@@ -69,7 +150,9 @@ class PopulationExplorerApp:
         button_frame = ttk.Frame(compare_frame)
         button_frame.pack(fill=tk.X, pady=(5,0))
         
-        ttk.Button(button_frame, text="Visualize", command=self.visualize_comparison).pack(side=tk.LEFT, expand=True)
+        visualize_btn = ttk.Button(button_frame, text="Visualize", command=self.visualize_comparison)
+        visualize_btn.pack(side=tk.LEFT, expand=True)
+        self.data_controls.append(visualize_btn)
         ttk.Button(button_frame, text="Remove", command=self.remove_from_comparison).pack(side=tk.LEFT, expand=True, padx=5)
         ttk.Button(button_frame, text="Clear All", command=self.clear_comparison_list).pack(side=tk.LEFT, expand=True)
         
@@ -89,14 +172,56 @@ class PopulationExplorerApp:
         self.top_count_var = tk.StringVar(value="10")
         ttk.Entry(top_frame, textvariable=self.top_count_var, width=5).grid(row=1, column=1, sticky=tk.W, padx=5)
         
-        ttk.Button(top_frame, text="Show Top", command=self.show_top_countries).grid(row=2, column=0, columnspan=2, pady=(5,0), sticky=tk.EW)
+        show_top_btn = ttk.Button(top_frame, text="Show Top", command=self.show_top_countries)
+        show_top_btn.grid(row=2, column=0, columnspan=2, pady=(5,0), sticky=tk.EW)
+        self.data_controls.append(show_top_btn)
+        
+        # Filter section
+        filter_frame = ttk.LabelFrame(self.control_frame, text="Filter Countries", padding=10)
+        filter_frame.pack(fill=tk.X, pady=5)
+        
+        self.filter_metric_var = tk.StringVar(value=FILTER_METRICS[0])
+        ttk.Combobox(filter_frame, textvariable=self.filter_metric_var, values=FILTER_METRICS,
+                     state='readonly', width=14).grid(row=0, column=0, sticky=tk.EW)
+        self.filter_op_var = tk.StringVar(value='>')
+        ttk.Combobox(filter_frame, textvariable=self.filter_op_var, values=['>', '>=', '<', '<=', '==', '!='],
+                     state='readonly', width=3).grid(row=0, column=1, padx=2)
+        self.filter_value_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.filter_value_var, width=8).grid(row=0, column=2, sticky=tk.EW)
+        ttk.Button(filter_frame, text="Add Condition", command=self.add_filter_condition).grid(
+            row=1, column=0, columnspan=3, pady=(5, 0), sticky=tk.EW)
+        
+        self.filter_var = tk.StringVar()
+        filter_entry = ttk.Entry(filter_frame, textvariable=self.filter_var)
+        filter_entry.grid(row=2, column=0, columnspan=3, pady=(5, 0), sticky=tk.EW)
+        filter_entry.bind('<Return>', lambda e: self.apply_filter())
+        filter_btn = ttk.Button(filter_frame, text="Apply Filter", command=self.apply_filter)
+        filter_btn.grid(row=3, column=0, columnspan=3, pady=(5, 0), sticky=tk.EW)
+        filter_frame.columnconfigure(0, weight=1)
+        self.data_controls += [filter_entry, filter_btn]
+        
+        # Browse section
+        browse_frame = ttk.LabelFrame(self.control_frame, text="Browse Data", padding=10)
+        browse_frame.pack(fill=tk.X, pady=5)
+        
+        table_btn = ttk.Button(browse_frame, text="All Countries", command=self.show_data_grid)
+        table_btn.pack(side=tk.LEFT, expand=True)
+        history_btn = ttk.Button(browse_frame, text="History", command=lambda: self.show_data_grid(history=True))
+        history_btn.pack(side=tk.LEFT, expand=True, padx=(5, 0))
+        self.crawl_btn = ttk.Button(browse_frame, text="Crawl History", command=self.crawl_history)
+        self.crawl_btn.pack(side=tk.LEFT, expand=True, padx=(5, 0))
+        self.data_controls.append(table_btn)
         
         # Export section
         export_frame = ttk.Frame(self.control_frame)
         export_frame.pack(fill=tk.X, pady=(10,0))
         
-        ttk.Button(export_frame, text="Export Data", command=self.export_data).pack(side=tk.LEFT, expand=True)
-        ttk.Button(export_frame, text="Exit", command=self.root.quit).pack(side=tk.LEFT, expand=True, padx=5)
+        export_btn = ttk.Button(export_frame, text="Export Data", command=self.export_data)
+        export_btn.pack(side=tk.LEFT, expand=True)
+        self.data_controls.append(export_btn)
+        self.refresh_btn = ttk.Button(export_frame, text="Refresh", command=lambda: self.load_data(force_refresh=True))
+        self.refresh_btn.pack(side=tk.LEFT, expand=True, padx=5)
+        ttk.Button(export_frame, text="Exit", command=self.on_close).pack(side=tk.LEFT, expand=True)
         
         # Right panel - display area
         self.display_frame = ttk.Frame(self.main_frame)
@@ -107,25 +232,325 @@ class PopulationExplorerApp:
                                 font=('Arial', 10), padx=10, pady=10)
         self.info_text.pack(fill=tk.BOTH, expand=True)
         
-        # Matplotlib canvas (initially hidden)
-        self.figure = None
-        self.canvas = None
+        # Matplotlib canvas is created on first use (then kept, hidden when not in use)
+        self.chart_image_label = ttk.Label(self.display_frame, anchor=tk.CENTER)
+        self.close_plot_btn = ttk.Button(self.display_frame, text="Close Plot", command=self.clear_plot)
+        self.plot_widget = None
     
-    def load_data(self):
-        """Load data from scraper"""
-        try:
-            self.data = self.scraper.scrape_data()
-            if self.data is not None and not self.data.empty:
-                self.status_label.config(text=f"Loaded {len(self.data)} countries")
+    def restore_session(self):
+        """Bring back the comparison list, filter, top-N settings and last chart of the previous session"""
+        state = self.session
+        if not state:
+            return
+        if state.get('geometry'):
+            self.root.geometry(state['geometry'])
+        self.selected_countries = list(state.get('selected_countries', []))
+        self.update_comparison_list()
+        self.filter_var.set(state.get('filter', ''))
+        if state.get('top_metric') in self.top_metric_combo['values']:
+            self.top_metric_var.set(state['top_metric'])
+        self.top_count_var.set(str(state.get('top_count', 10)))
+        
+        chart = state.get('chart')
+        if chart and self.data is not None:
+            try:
+                spec = ChartSpec(**dict(chart, metrics=tuple(chart['metrics']), countries=tuple(chart['countries'])))
+            except (TypeError, KeyError, ValueError):
+                # Saved by an older or newer version with another chart schema; drop just the chart
+                print("Ignoring saved chart with an unknown layout")
+                return
+            if spec.source == 'history':
+                history = self.scraper.history if self.scraper.history is not None else self.scraper.load_history()
+                if history is None:
+                    return
+                in_chart = history['Country'].astype(str).isin(spec.countries).to_numpy()
+                # The whole history keeps its cached density grids
+                df_comparison = history if in_chart.all() else history[in_chart]
             else:
-                self.status_label.config(text="Using fallback data")
-                messagebox.showwarning("Warning", "Failed to load live data. Using fallback dataset.")
+                df_comparison = self.scraper.get_countries(list(spec.countries))
+            if len(df_comparison) and set(spec.metrics).issubset(df_comparison.columns):
+                # Let the window paint first; drawing the chart loads matplotlib
+                self.root.after(100, lambda: self.show_chart(spec, df_comparison))
+    
+    def session_state(self):
+        """Get the state worth keeping between sessions"""
+        spec = self.last_chart_spec if self.plot_widget is not None else None
+        return {
+            'snapshot_id': self.scraper.snapshot_id,
+            'selected_countries': self.selected_countries,
+            'filter': self.filter_var.get().strip(),
+            'top_metric': self.top_metric_var.get(),
+            'top_count': self.top_count_var.get(),
+            'chart': spec._asdict() if spec is not None else None,
+            'geometry': self.root.geometry(),
+        }
+    
+    def on_close(self):
+        """Save the session and quit"""
+        try:
+            save_session(self.session_state())
+        except OSError as e:
+            print(f"Could not save session: {str(e)}")
+        self.root.quit()
+    
+    @property
+    def visualizer(self):
+        """The chart helper, created on first use because it loads matplotlib"""
+        if self._visualizer is None:
+            from visualizer import PopulationVisualizer
+            self._visualizer = PopulationVisualizer()
+        return self._visualizer
+    
+    @property
+    def chart_canvas(self):
+        """The persistent chart canvas, created on first use because it loads matplotlib"""
+        if self._chart_canvas is None:
+            from chart_canvas import ChartCanvas
+            self._chart_canvas = ChartCanvas(self.display_frame)
+        return self._chart_canvas
+    
+    @property
+    def data(self):
+        """The scraper's current table; the app keeps no copy of its own"""
+        return self.scraper.data
+    
+    def set_data_controls_enabled(self, enabled):
+        """Lock or unlock the controls that need data"""
+        for widget in self.data_controls:
+            widget.state(['!disabled'] if enabled else ['disabled'])
+    
+    def load_cached_data(self, snapshot_id=None):
+        """Show a stored snapshot (the latest by default) immediately, before any network activity"""
+        try:
+            df = self.scraper.load_snapshot(snapshot_id) if snapshot_id else None
+            if df is None:
+                self.scraper.load_snapshot()
         except Exception as e:
+            print(f"Could not open cached snapshot: {str(e)}")
+        
+        if self.data is not None and not self.data.empty:
+            self.status_label.config(text=f"Loaded {len(self.data)} countries (cached)")
+            self.set_data_controls_enabled(True)
+        else:
+            self.set_data_controls_enabled(False)
+    
+    def load_data(self, force_refresh=False):
+        """Load fresh data from the scraper in a background thread"""
+        if self.load_thread is not None and self.load_thread.is_alive():
+            # Even a cancelled load is still inside the scraper; two scrapes must not overlap
+            if self.load_cancel.is_set():
+                self.status_label.config(text="Waiting for the cancelled refresh to stop...")
+            return
+        
+        self.load_cancel = cancel_event = threading.Event()
+        self.scraper.progress_callback = lambda message: self.load_queue.put((cancel_event, 'progress', message))
+        self.load_thread = threading.Thread(target=self._load_worker, args=(force_refresh, self.load_cancel),
+                                            daemon=True)
+        
+        self.status_label.config(text="Refreshing data...")
+        self.load_progress.start(10)
+        self.cancel_load_btn.state(['!disabled'])
+        self.refresh_btn.state(['disabled'])
+        
+        self.load_thread.start()
+        self.root.after(100, self._poll_load_queue)
+    
+    def _load_worker(self, force_refresh, cancel_event):
+        """Run the scrape off the Tk main thread and post the outcome to the queue"""
+        try:
+            df = self.scraper.fetch_data(force_refresh=force_refresh, cancel_event=cancel_event)
+            self.load_queue.put((cancel_event, 'done', df))
+        except Exception as e:
+            self.load_queue.put((cancel_event, 'error', e))
+    
+    def _poll_load_queue(self):
+        """Handle messages from the loader thread on the Tk main thread"""
+        try:
+            while True:
+                cancel_event, kind, payload = self.load_queue.get_nowait()
+                if cancel_event is not self.load_cancel or cancel_event.is_set():
+                    continue  # from a cancelled or superseded load
+                if kind == 'progress':
+                    self.status_label.config(text=payload)
+                elif kind == 'done':
+                    # Adopted only here: cancel_load runs on this thread too, so the load
+                    # cannot be cancelled between the check above and this point
+                    if payload is not None and not payload.empty:
+                        self.scraper.adopt(payload)
+                    self._finish_load()
+                    self.on_data_loaded(payload)
+                elif kind == 'error':
+                    self._finish_load()
+                    self.on_load_error(payload)
+        except queue.Empty:
+            pass
+        
+        if self.load_thread is not None and self.load_thread.is_alive():
+            self.root.after(100, self._poll_load_queue)
+        elif not self.load_queue.empty():
+            self.root.after(0, self._poll_load_queue)
+        elif self.load_cancel is not None and self.load_cancel.is_set():
+            # The cancelled worker has exited, so a new refresh may start
+            self.refresh_btn.state(['!disabled'])
+    
+    def _finish_load(self):
+        self.load_progress.stop()
+        self.cancel_load_btn.state(['disabled'])
+        self.refresh_btn.state(['!disabled'])
+    
+    def cancel_load(self):
+        """Stop waiting for the current refresh and keep whatever data is shown"""
+        if self.load_cancel is not None:
+            self.load_cancel.set()
+        self.load_progress.stop()
+        self.cancel_load_btn.state(['disabled'])
+        # Refresh stays disabled until the worker leaves the scraper (see _poll_load_queue)
+        if self.data is not None:
+            self.status_label.config(text=f"Refresh cancelled, showing {len(self.data)} cached countries")
+        else:
+            self.status_label.config(text="Loading cancelled")
+    
+    def on_data_loaded(self, df):
+        """Swap in freshly loaded data"""
+        if df is not None and not df.empty:
+            self.status_label.config(text=f"Loaded {len(self.data)} countries")
+            self.set_data_controls_enabled(True)
+        elif self.data is None:
+            self.status_label.config(text="Using fallback data")
+            messagebox.showwarning("Warning", "Failed to load live data. Using fallback dataset.")
+    
+    def on_load_error(self, error):
+        """Report a failed refresh, falling back to cached data when there is some"""
+        if self.data is not None:
+            self.status_label.config(text=f"Refresh failed, showing {len(self.data)} cached countries")
+        else:
             self.status_label.config(text="Error loading data")
-            messagebox.showerror("Error", f"Failed to load data: {str(e)}")
+            messagebox.showerror("Error", f"Failed to load data: {str(error)}")
+    
+    def crawl_history(self):
+        """Fetch every country's yearly history in a background thread"""
+        if self.crawl_thread is not None and self.crawl_thread.is_alive():
+            return
+        if not messagebox.askyesno("Crawl History",
+                                   "Download the yearly history page of every country? This takes a few minutes."):
+            return
+        
+        progress = lambda done, total, country: self.crawl_queue.put(('progress', (done, total, country)))
+        self.crawl_thread = threading.Thread(target=self._crawl_worker, args=(progress,), daemon=True)
+        self.crawl_btn.state(['disabled'])
+        self.status_label.config(text="Crawling country history...")
+        self.crawl_progress.config(value=0)
+        self.crawl_progress.pack(side=tk.RIGHT, padx=5)
+        self.crawl_thread.start()
+        self.root.after(100, self._poll_crawl_queue)
+    
+    def _crawl_worker(self, progress):
+        try:
+            history = self.scraper.crawl_history(progress_callback=progress)
+            self.crawl_queue.put(('done', history))
+        except Exception as e:
+            self.crawl_queue.put(('error', e))
+    
+    def _poll_crawl_queue(self):
+        """Update the crawl progress bar and report the outcome on the Tk main thread"""
+        try:
+            while True:
+                kind, payload = self.crawl_queue.get_nowait()
+                if kind == 'progress':
+                    done, total, country = payload
+                    self.crawl_progress.config(value=100.0 * done / total)
+                    self.status_label.config(text=f"Crawled {done} of {total} countries ({country})")
+                    continue
+                self.crawl_progress.pack_forget()
+                self.crawl_btn.state(['!disabled'])
+                if kind == 'done':
+                    self.status_label.config(text=f"Crawled {len(payload):,} history rows for "
+                                                  f"{payload['Country'].nunique()} countries")
+                else:
+                    self.status_label.config(text="History crawl failed")
+                    messagebox.showerror("Error", f"Failed to crawl country history: {str(payload)}")
+        except queue.Empty:
+            pass
+        
+        if self.crawl_thread.is_alive() or not self.crawl_queue.empty():
+            self.root.after(100, self._poll_crawl_queue)
+    
+    def on_search_key(self, event):
+        """Refresh the completions shortly after the user stops typing"""
+        if event.keysym in ('Return', 'KP_Enter', 'Escape', 'Down', 'Up', 'Tab', 'Left', 'Right'):
+            return
+        if self.complete_job is not None:
+            self.root.after_cancel(self.complete_job)
+        self.complete_job = self.root.after(COMPLETION_DELAY_MS, self.update_completions)
+    
+    def update_completions(self):
+        """Show the ranked completions for the text in the search box"""
+        self.complete_job = None
+        if self.data is None:
+            return
+        completions = self.scraper.complete_countries(self.search_entry.get(), k=8)
+        if not completions:
+            self.hide_completions()
+            return
+        
+        if self.completion_popup is None:
+            self.completion_popup = tk.Toplevel(self.root)
+            self.completion_popup.overrideredirect(True)
+            self.completion_list = tk.Listbox(self.completion_popup, activestyle=tk.DOTBOX, exportselection=False)
+            self.completion_list.pack(fill=tk.BOTH, expand=True)
+            self.completion_list.bind('<ButtonRelease-1>', lambda e: self.choose_completion())
+            self.completion_list.bind('<Return>', lambda e: self.choose_completion())
+            self.completion_list.bind('<Escape>', lambda e: self.hide_completions(refocus=True))
+            self.completion_list.bind('<FocusOut>', lambda e: self.root.after(150, self._hide_unfocused_completions))
+        
+        self.completion_list.delete(0, tk.END)
+        self.completion_list.insert(tk.END, *completions)
+        self.completion_list.config(height=len(completions))
+        x = self.search_entry.winfo_rootx()
+        y = self.search_entry.winfo_rooty() + self.search_entry.winfo_height()
+        self.completion_popup.geometry(f"{max(self.search_entry.winfo_width(), 200)}x{len(completions) * 18 + 4}+{x}+{y}")
+        self.completion_popup.deiconify()
+        self.completion_popup.lift()
+    
+    def focus_completions(self):
+        """Move keyboard focus from the search box into the dropdown"""
+        if self.completion_popup is None or not self.completion_popup.winfo_viewable():
+            return
+        self.completion_list.focus_set()
+        self.completion_list.selection_clear(0, tk.END)
+        self.completion_list.selection_set(0)
+        self.completion_list.activate(0)
+    
+    def choose_completion(self):
+        """Put the chosen completion in the search box and show that country"""
+        selection = self.completion_list.curselection()
+        if not selection:
+            return
+        self.search_entry.delete(0, tk.END)
+        self.search_entry.insert(0, self.completion_list.get(selection[0]))
+        self.hide_completions(refocus=True)
+        self.search_country()
+    
+    def hide_completions(self, refocus=False):
+        if self.complete_job is not None:
+            self.root.after_cancel(self.complete_job)
+            self.complete_job = None
+        if self.completion_popup is not None:
+            self.completion_popup.withdraw()
+        if refocus:
+            self.search_entry.focus_set()
+    
+    def _hide_unfocused_completions(self):
+        try:
+            focus = self.root.focus_get()
+        except KeyError:  # focus is in a Tk-internal widget such as a combobox dropdown
+            focus = None
+        if focus is not self.search_entry and focus is not self.completion_list:
+            self.hide_completions()
     
     def search_country(self):
         """Search for a country and display its information"""
+        self.hide_completions()
         country_name = self.search_entry.get().strip()
         if not country_name:
             messagebox.showwarning("Warning", "Please enter a country name")
@@ -141,10 +566,10 @@ class PopulationExplorerApp:
             self.info_text.insert(tk.END, f"Country '{country_name}' not found.\n\n")
             
             # Show suggestions
-            suggestions = self.data[self.data['Country'].str.contains(country_name, case=False, na=False)]
-            if not suggestions.empty:
+            suggestions = self.scraper.suggest_countries(country_name, k=5)
+            if suggestions:
                 self.info_text.insert(tk.END, "Did you mean:\n")
-                for country in suggestions['Country'].head(5):
+                for country in suggestions:
                     self.info_text.insert(tk.END, f"• {country}\n")
             
             self.info_text.config(state=tk.DISABLED)
@@ -202,6 +627,14 @@ class PopulationExplorerApp:
         else:
             messagebox.showinfo("Info", f"'{country_name}' is already in comparison list")
     
+    def add_many_to_comparison(self, country_names):
+        """Add several countries to the comparison list at once"""
+        known = set(self.selected_countries)
+        added = [name for name in country_names if name not in known]
+        self.selected_countries.extend(added)
+        self.update_comparison_list()
+        messagebox.showinfo("Info", f"Added {len(added)} countries to comparison list")
+    
     def remove_from_comparison(self):
         """Remove selected countries from comparison list"""
         selected = self.compare_listbox.curselection()
@@ -244,21 +677,79 @@ class PopulationExplorerApp:
         top_window.title(f"Top {n} Countries by {metric}")
         top_window.geometry("600x400")
         
-        # Create treeview
-        tree = ttk.Treeview(top_window, columns=('Rank', 'Country', metric), show='headings')
-        tree.heading('Rank', text='Rank')
-        tree.heading('Country', text='Country')
-        tree.heading(metric, text=metric)
-        
-        # Add data
-        for _, row in top_countries.iterrows():
-            tree.insert('', tk.END, values=(int(row['Rank']), row['Country'], self.format_metric_value(row[metric], metric)))
-        
-        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        columns = list(dict.fromkeys(['Rank', 'Country', metric]))
+        grid = DataGrid(top_window, GridModel(top_countries[columns]),
+                        on_activate=lambda pos: self.display_country_info(top_countries.iloc[pos]))
+        grid.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Add visualization button
         ttk.Button(top_window, text="Visualize", 
-                  command=lambda: self.visualizer.create_top_countries_chart(top_countries, n, metric)).pack(pady=5)
+                  command=lambda: self.visualizer.create_top_countries_chart(
+                      self.scraper.data, n, metric, self.scraper.get_rankings())).pack(pady=5)
+    
+    def add_filter_condition(self):
+        """Append the condition from the builder row to the filter expression"""
+        value = self.filter_value_var.get().strip().replace(',', '')
+        try:
+            float(value)
+        except ValueError:
+            messagebox.showwarning("Warning", "Please enter a numeric value")
+            return
+        condition = f"{self.filter_metric_var.get()} {self.filter_op_var.get()} {value}"
+        current = self.filter_var.get().strip()
+        self.filter_var.set(f"{current} and {condition}" if current else condition)
+        self.filter_value_var.set('')
+    
+    def apply_filter(self):
+        """Show the countries matching the filter expression"""
+        expression = self.filter_var.get().strip()
+        if not expression:
+            messagebox.showwarning("Warning", "Please enter a filter, e.g. Density > 500 and Median_Age < 30")
+            return
+        try:
+            matches = self.scraper.filter_countries(expression)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        if matches.empty:
+            messagebox.showinfo("Info", "No countries match this filter")
+            return
+        
+        result_window = tk.Toplevel(self.root)
+        result_window.title(f"{len(matches)} countries where {expression}")
+        result_window.geometry("900x450")
+        
+        grid = DataGrid(result_window, GridModel(matches),
+                        on_activate=lambda pos: self.display_country_info(matches.iloc[pos]))
+        grid.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        button_frame = ttk.Frame(result_window)
+        button_frame.pack(pady=5)
+        countries = matches['Country'].astype(str).tolist()
+        ttk.Button(button_frame, text="Add All to Compare",
+                   command=lambda: self.add_many_to_comparison(countries)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Visualize Matches",
+                   command=lambda: self.show_visualization_options(matches)).pack(side=tk.LEFT, padx=5)
+    
+    def show_data_grid(self, history=False):
+        """Show every row and metric of the data (or the country history) in a sortable grid"""
+        try:
+            model = self.scraper.get_grid_model(history=history)
+        except ValueError as e:
+            messagebox.showinfo("Info", str(e))
+            return
+        
+        grid_window = tk.Toplevel(self.root)
+        grid_window.title(f"Country History ({len(model):,} rows)" if history else f"All Countries ({len(model)})")
+        grid_window.geometry("900x500")
+        
+        on_activate = None if history else lambda pos: self.display_country_info(model.data.iloc[pos])
+        grid = DataGrid(grid_window, model, on_activate=on_activate)
+        grid.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        grid.tree.focus_set()
+        
+        ttk.Label(grid_window, text="Click a column heading to sort"
+                  + ("" if history else ", double-click a row for details")).pack(pady=(0, 5))
     
     def visualize_comparison(self):
         """Create visualizations for the comparison list"""
@@ -267,18 +758,12 @@ class PopulationExplorerApp:
             return
         
         # Get data for selected countries
-        comparison_data = []
-        for country in self.selected_countries:
-            country_info = self.scraper.search_country(country)
-            if country_info is not None:
-                comparison_data.append(country_info)
+        df_comparison = self.scraper.get_countries(self.selected_countries)
         
-        if not comparison_data:
+        if df_comparison.empty:
             messagebox.showwarning("Warning", "No valid countries found for comparison")
             return
         
-        df_comparison = pd.DataFrame(comparison_data)
-        
         # Show visualization options in a dialog
         self.show_visualization_options(df_comparison)
     
@@ -286,7 +771,7 @@ class PopulationExplorerApp:
         """Show dialog with visualization options"""
         dialog = tk.Toplevel(self.root)
         dialog.title("Visualization Options")
-        dialog.geometry("300x200")
+        dialog.geometry("300x240")
         
         ttk.Label(dialog, text="Select Visualization Type:").pack(pady=10)
         
@@ -298,6 +783,9 @@ class PopulationExplorerApp:
         
         ttk.Button(dialog, text="Scatter Plot", 
                   command=lambda: self.show_scatter_plot_options(dialog, df_comparison)).pack(fill=tk.X, padx=20, pady=5)
+        
+        ttk.Button(dialog, text="Animate Over Time", 
+                  command=lambda: self.show_animation_options(dialog, df_comparison)).pack(fill=tk.X, padx=20, pady=5)
     
     def show_single_metric_options(self, parent, df_comparison):
         """Show options for single metric visualization"""
@@ -316,80 +804,22 @@ class PopulationExplorerApp:
             ttk.Button(dialog, text=metric, 
                       command=lambda m=metric: self.create_single_metric_chart(dialog, df_comparison, m)).pack(fill=tk.X, padx=20, pady=2)
     
+    def _bar_panel(self, df_comparison, metric, title):
+        """Build the bar panel for one metric of the comparison set"""
+        from chart_canvas import BarPanel
+        values = df_comparison[metric].to_numpy(dtype=float, na_value=np.nan)
+        return BarPanel(title=title, xlabel='Countries', ylabel=self.visualizer.metric_label(metric),
+                        categories=df_comparison['Country'].astype(str).tolist(), values=values,
+                        labels=self.visualizer.format_numbers(values, metric).tolist())
+    
     def create_single_metric_chart(self, dialog, df_comparison, metric):
         """Create single metric chart and display in main window"""
         dialog.destroy()
-        self.clear_plot()
-        
-        # Create figure
-        self.figure = plt.Figure(figsize=(8, 5), dpi=100)
-        ax = self.figure.add_subplot(111)
-        
-        # Create visualization
-        countries = df_comparison['Country'].tolist()
-        values = df_comparison[metric].tolist()
-        
-        colors = plt.cm.Set3(range(len(countries)))
-        bars = ax.bar(countries, values, color=colors, alpha=0.8, edgecolor='black', linewidth=1)
-        
-        # Customize the chart
-        ax.set_title(f'{metric} Comparison', fontsize=16, fontweight='bold', pad=20)
-        ax.set_xlabel('Countries', fontsize=12, fontweight='bold')
-        ax.set_ylabel(self.visualizer._get_ylabel(metric), fontsize=12, fontweight='bold')
-        
-        # Rotate x-axis labels
-        plt.xticks(rotation=45, ha='right')
-        
-        # Add value labels on bars
-        for bar, value in zip(bars, values):
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                    self.visualizer._format_number(value, metric),
-                    ha='center', va='bottom', fontsize=10, fontweight='bold')
-        
-        ax.grid(axis='y', alpha=0.3, linestyle='--')
-        ax.set_axisbelow(True)
-        
-        # Display in tkinter window
-        self.display_plot()
+        self.show_chart(ChartSpec('single', (metric,), tuple(df_comparison['Country'])), df_comparison)
     
     def create_multi_metric_chart(self, df_comparison):
         """Create multi-metric chart and display in main window"""
-        self.clear_plot()
-        
-        metrics = ['Population', 'Density', 'Fertility_Rate', 'Median_Age']
-        
-        # Create figure with subplots
-        self.figure = plt.Figure(figsize=(10, 8), dpi=100)
-        
-        for i, metric in enumerate(metrics[:4]):  # Limit to 4 metrics
-            ax = self.figure.add_subplot(2, 2, i+1)
-            
-            countries = df_comparison['Country'].tolist()
-            values = df_comparison[metric].tolist()
-            
-            colors = plt.cm.Set2(range(len(countries)))
-            bars = ax.bar(countries, values, color=colors, alpha=0.8, edgecolor='black')
-            
-            ax.set_title(f'{metric}', fontsize=14, fontweight='bold')
-            ax.set_xlabel('Countries', fontsize=10)
-            ax.set_ylabel(self.visualizer._get_ylabel(metric), fontsize=10)
-            
-            ax.tick_params(axis='x', rotation=45, labelsize=9)
-            
-            for bar, value in zip(bars, values):
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                       self.visualizer._format_number(value, metric),
-                       ha='center', va='bottom', fontsize=8)
-            
-            ax.grid(axis='y', alpha=0.3, linestyle='--')
-        
-        self.figure.suptitle('Multi-Metric Country Comparison', fontsize=16, fontweight='bold')
-        self.figure.tight_layout()
-        
-        # Display in tkinter window
-        self.display_plot()
+        self.show_chart(ChartSpec('multi', tuple(METRICS), tuple(df_comparison['Country'])), df_comparison)
     
     def show_scatter_plot_options(self, parent, df_comparison):
         """Show options for scatter plot visualization"""
@@ -397,7 +827,7 @@ class PopulationExplorerApp:
         
         dialog = tk.Toplevel(self.root)
         dialog.title("Scatter Plot Options")
-        dialog.geometry("400x300")
+        dialog.geometry("400x380")
         
         metrics = ['Population', 'Yearly_Change', 'Density', 'Land_Area', 
                   'Fertility_Rate', 'Median_Age', 'Urban_Population_Percent']
@@ -414,141 +844,355 @@ class PopulationExplorerApp:
         y_combo.current(1)
         y_combo.pack(padx=20, pady=5)
         
+        source_var = tk.StringVar(value=SCATTER_SOURCES[0])
+        ttk.Label(dialog, text="Points:").pack(pady=(10, 0))
+        for source in SCATTER_SOURCES:
+            ttk.Radiobutton(dialog, text=source, value=source, variable=source_var).pack(anchor=tk.W, padx=30)
+        
         ttk.Button(dialog, text="Create Scatter Plot", 
-                  command=lambda: self.create_scatter_plot(dialog, df_comparison, x_var.get(), y_var.get())).pack(pady=20)
+                  command=lambda: self.create_scatter_plot(dialog, df_comparison, x_var.get(), y_var.get(),
+                                                           source_var.get())).pack(pady=20)
     
-    def create_scatter_plot(self, dialog, df_comparison, x_metric, y_metric):
+    def create_scatter_plot(self, dialog, df_comparison, x_metric, y_metric, source=SCATTER_SOURCES[0]):
         """Create scatter plot and display in main window"""
         dialog.destroy()
-        self.clear_plot()
-        
-        # Create figure
-        self.figure = plt.Figure(figsize=(8, 6), dpi=100)
-        ax = self.figure.add_subplot(111)
-        
-        x_values = df_comparison[x_metric]
-        y_values = df_comparison[y_metric]
-        
-        scatter = ax.scatter(x_values, y_values, c=range(len(df_comparison)), 
-                           cmap='viridis', alpha=0.7, s=100, edgecolor='black')
+        if source == 'All countries':
+            df_comparison = self.data
+        elif source == 'Country history':
+            if self.scraper.history is None and self.scraper.load_history() is None:
+                messagebox.showwarning("Warning", "No country history has been crawled yet")
+                return
+            df_comparison = self.scraper.history
+        missing = [metric for metric in (x_metric, y_metric) if metric not in df_comparison.columns]
+        if missing:
+            messagebox.showwarning("Warning", f"No {', '.join(missing)} data for {source.lower()}")
+            return
+        # History has a row per country and year; the spec names each country once
+        countries = tuple(dict.fromkeys(df_comparison['Country'].astype(str)))
+        spec_source = 'history' if source == 'Country history' else 'data'
+        self.show_chart(ChartSpec('scatter', (x_metric, y_metric), countries, source=spec_source), df_comparison)
+    
+    def show_animation_options(self, parent, df_comparison):
+        """Show options for a bar chart race or an animated scatter plot"""
+        parent.destroy()  # Close the previous dialog
         
-        # Add country labels
-        for i, row in df_comparison.iterrows():
-            ax.annotate(row['Country'], (row[x_metric], row[y_metric]), 
-                       xytext=(5, 5), textcoords='offset points', fontsize=8)
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Animation Options")
+        dialog.geometry("400x420")
+        
+        kind_var = tk.StringVar(value=ANIMATION_KINDS[0])
+        for kind in ANIMATION_KINDS:
+            ttk.Radiobutton(dialog, text=kind, value=kind, variable=kind_var).pack(anchor=tk.W, padx=30)
+        
+        ttk.Label(dialog, text="Metric (X-axis for scatter):").pack(pady=(10, 0))
+        x_var = tk.StringVar(value=METRICS[0])
+        ttk.Combobox(dialog, textvariable=x_var, values=METRICS, state='readonly').pack(padx=20, pady=5)
+        
+        ttk.Label(dialog, text="Y-axis (scatter only):").pack(pady=(10, 0))
+        y_var = tk.StringVar(value='Median_Age')
+        ttk.Combobox(dialog, textvariable=y_var, values=METRICS, state='readonly').pack(padx=20, pady=5)
+        
+        ttk.Label(dialog, text="Over:").pack(pady=(10, 0))
+        source_var = tk.StringVar(value=ANIMATION_SOURCES[0])
+        for source in ANIMATION_SOURCES:
+            ttk.Radiobutton(dialog, text=source, value=source, variable=source_var).pack(anchor=tk.W, padx=30)
+        
+        countries = tuple(dict.fromkeys(df_comparison['Country'].astype(str)))
+        build = lambda: self.build_animation(kind_var.get(), source_var.get(), x_var.get(), y_var.get(), countries)
+        buttons = ttk.Frame(dialog)
+        buttons.pack(pady=15)
+        ttk.Button(buttons, text="Play", command=lambda: self.play_animation(dialog, build())).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="Export GIF/MP4...",
+                   command=lambda: self.start_animation_export(dialog, build())).pack(side=tk.LEFT, padx=5)
+    
+    def build_animation(self, kind, source, x_metric, y_metric, countries):
+        """Precompute the frames of an animation; None (after a warning) if there is nothing to animate"""
+        try:
+            if source == 'Stored snapshots':
+                data, time_column = snapshot_timeline(self.scraper.snapshots), 'Snapshot'
+            else:
+                if self.scraper.history is None and self.scraper.load_history() is None:
+                    messagebox.showwarning("Warning", "No country history has been crawled yet")
+                    return None
+                data, time_column = self.scraper.history, 'Year'
+            if kind == 'Bar chart race':
+                return BarRace(data, x_metric, time_column=time_column)
+            # The scatter follows the comparison list; every country would be an unreadable cloud
+            return ScatterAnimation(data, x_metric, y_metric, time_column=time_column, countries=countries)
+        except ValueError as e:
+            messagebox.showwarning("Warning", str(e))
+            return None
+    
+    def play_animation(self, dialog, animation):
+        """Play an animation in the main window"""
+        if animation is None:
+            return
+        dialog.destroy()
+        self.cancel_render()
+        self.last_chart_spec = None
+        self.chart_canvas.play(animation, self.visualizer, DEFAULT_FPS)
+        self.display_plot(self.chart_canvas.widget)
+    
+    def start_animation_export(self, dialog, animation):
+        """Pick the output file and render the animation's frames in worker processes"""
+        if animation is None:
+            return
+        if self.export_thread is not None and self.export_thread.is_alive():
+            messagebox.showinfo("Info", "An export is already running")
+            return
+        file_path = filedialog.asksaveasfilename(
+            defaultextension='.gif',
+            filetypes=[(f"{fmt.upper()} Files", f"*.{fmt}") for fmt in ANIMATION_FORMATS],
+            title="Save Animation As"
+        )
+        if not file_path:
+            return  # User cancelled
+        dialog.destroy()
         
-        ax.set_title(f'{y_metric} vs {x_metric}', fontsize=16, fontweight='bold', pad=20)
-        ax.set_xlabel(self.visualizer._get_ylabel(x_metric), fontsize=12, fontweight='bold')
-        ax.set_ylabel(self.visualizer._get_ylabel(y_metric), fontsize=12, fontweight='bold')
+        self.export_cancel = cancel_event = threading.Event()
+        progress = lambda done, total: self.export_queue.put(('progress', (done, total)))
+        job = lambda: export_animation(animation, file_path, progress_callback=progress, cancel_event=cancel_event)
+        self.start_export_job(job, file_path, unit='frames')
+    
+    def show_chart(self, spec, df_comparison):
+        """Draw small charts in place; hand large ones to the render worker"""
+        # Whatever was rendering before is stale now
+        self.cancel_render()
+        self.last_chart_spec = spec
+        
+        # Scatter plots stay in place at any size: labels are decluttered and points picked on hover
+        if spec.kind == 'scatter' or len(df_comparison) <= OFFLOAD_THRESHOLD:
+            self.draw_chart_in_place(spec, df_comparison)
+            self.display_plot(self.chart_canvas.widget)
+            return
         
-        ax.grid(True, alpha=0.3, linestyle='--')
+        self.display_frame.update_idletasks()
+        width = max(self.display_frame.winfo_width(), 400)
+        height = max(self.display_frame.winfo_height() - 50, 300)  # Leave room for the close button
+        key = (spec, df_comparison.attrs.get('snapshot_id'), width, height)
+        rgba = self.chart_images.get(key)
+        if rgba is not None:
+            self.show_chart_image(rgba)
+            return
         
-        # Display in tkinter window
-        self.display_plot()
+        columns = ['Country'] + [metric for metric in spec.metrics if metric != 'Country']
+        self.render_key = key
+        self.render_worker.submit(spec, df_comparison[columns], width, height)
+        self.status_label.config(text=f"Rendering chart for {len(df_comparison)} countries...")
+        self.root.after(50, self._poll_render)
     
-    def display_plot(self):
-        """Display the current matplotlib figure in the GUI"""
-        if self.figure is None:
+    def draw_chart_in_place(self, spec, df_comparison):
+        """Update the persistent chart canvas for a small comparison set"""
+        if spec.kind == 'single':
+            metric = spec.metrics[0]
+            self.chart_canvas.show_bars([self._bar_panel(df_comparison, metric, f'{metric} Comparison')],
+                                        cmap='Set3')
+        elif spec.kind == 'multi':
+            panels = [self._bar_panel(df_comparison, metric, metric) for metric in spec.metrics]
+            self.chart_canvas.show_bars(panels, suptitle='Multi-Metric Country Comparison',
+                                        cmap='Set2', ncols=grid_shape(len(panels))[1], label_size=8)
+        else:
+            x_metric, y_metric = spec.metrics
+            if len(df_comparison) > DENSITY_THRESHOLD:
+                grid = self.visualizer.density_grid(df_comparison, x_metric, y_metric)
+                self.chart_canvas.show_density(grid, title=f'{y_metric} vs {x_metric} ({grid.points:,} points)',
+                                               xlabel=self.visualizer.metric_label(x_metric),
+                                               ylabel=self.visualizer.metric_label(y_metric))
+                return
+            x_values = df_comparison[x_metric].to_numpy(dtype=float, na_value=np.nan)
+            y_values = df_comparison[y_metric].to_numpy(dtype=float, na_value=np.nan)
+            countries = df_comparison['Country'].astype(str).tolist()
+            self.chart_canvas.show_scatter(
+                x_values, y_values, countries,
+                title=f'{y_metric} vs {x_metric}',
+                xlabel=self.visualizer.metric_label(x_metric),
+                ylabel=self.visualizer.metric_label(y_metric),
+                hover_texts=self.visualizer._hover_texts(countries, x_values, x_metric, y_values, y_metric))
+    
+    def cancel_render(self):
+        """Drop a pending background render"""
+        if self.render_worker.busy:
+            self.render_worker.cancel()
+            self.status_label.config(text=f"Loaded {len(self.data)} countries")
+    
+    def _poll_render(self):
+        """Pick up the finished background render on the Tk main thread"""
+        if not self.render_worker.busy:
+            return  # cancelled or superseded; a newer poll loop is running if needed
+        try:
+            result = self.render_worker.poll()
+        except Exception as e:
+            self.status_label.config(text="Chart rendering failed")
+            messagebox.showerror("Error", f"Failed to render chart: {str(e)}")
+            return
+        if result is None:
+            self.root.after(50, self._poll_render)
             return
         
-        # Clear previous canvas if it exists
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
+        _, rgba = result
+        if self.render_key[1] is not None:
+            self.chart_images.put(self.render_key, rgba, rgba.nbytes)
+        self.show_chart_image(rgba)
+        self.status_label.config(text=f"Loaded {len(self.data)} countries")
+    
+    def show_chart_image(self, rgba):
+        """Show a rendered RGBA chart in the display area"""
+        from PIL import Image, ImageTk
+        height, width = rgba.shape[:2]
+        image = Image.frombuffer('RGBA', (width, height), rgba, 'raw', 'RGBA', 0, 1)
+        self.chart_photo = ImageTk.PhotoImage(image)  # keep a reference or Tk drops the image
+        self.chart_image_label.config(image=self.chart_photo)
+        self.display_plot(self.chart_image_label)
+    
+    def display_plot(self, widget):
+        """Show a chart widget (live canvas or rendered image) in place of the info text"""
+        if self.plot_widget is widget:
+            return
         
-        # Hide the info text
+        # Hide the info text or the other chart widget
         self.info_text.pack_forget()
+        if self.plot_widget is not None:
+            self.plot_widget.pack_forget()
+            self.close_plot_btn.pack_forget()
         
-        # Create new canvas
-        self.canvas = FigureCanvasTkAgg(self.figure, master=self.display_frame)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        # Add close button
-        if hasattr(self, 'close_plot_btn'):
-            self.close_plot_btn.destroy()
-        
-        self.close_plot_btn = ttk.Button(self.display_frame, text="Close Plot", command=self.clear_plot)
+        widget.pack(fill=tk.BOTH, expand=True)
         self.close_plot_btn.pack(pady=5)
+        self.plot_widget = widget
     
     def clear_plot(self):
-        """Clear the current plot and show info text"""
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
-            self.canvas = None
-        
-        if self.figure:
-            plt.close(self.figure)
-            self.figure = None
-        
-        if hasattr(self, 'close_plot_btn'):
-            self.close_plot_btn.destroy()
+        """Hide the chart and show info text; the canvas is kept for the next chart"""
+        self.cancel_render()
+        if self.plot_widget is not None:
+            self.plot_widget.pack_forget()
+            self.close_plot_btn.pack_forget()
+            self.plot_widget = None
         
         # Show the info text again
         self.info_text.pack(fill=tk.BOTH, expand=True)
     
     def export_data(self):
-        """Export data to CSV or Excel"""
+        """Ask what to export and in which format, then export in the background"""
         if self.data is None:
             messagebox.showwarning("Warning", "No data available to export")
             return
+        if self.export_thread is not None and self.export_thread.is_alive():
+            messagebox.showinfo("Info", "An export is already running")
+            return
         
-        # Ask what to export
-        export_choice = messagebox.askquestion("Export", "Export all data or just comparison list?", 
-                                             icon='question', default='yes', 
-                                             detail="Click 'Yes' for all data, 'No' for comparison list")
-        
-        if export_choice == 'yes':
-            data_to_export = self.data
-        else:
-            if not self.selected_countries:
-                messagebox.showwarning("Warning", "Comparison list is empty")
-                return
-            data_to_export = self.data[self.data['Country'].isin(self.selected_countries)]
-        
-        # Ask for format
-        format_choice = messagebox.askquestion("Format", "Export as CSV or Excel?", 
-                                             icon='question', default='yes', 
-                                             detail="Click 'Yes' for CSV, 'No' for Excel")
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Export Data")
+        dialog.geometry("320x260")
+        
+        ttk.Label(dialog, text="Export:").pack(pady=(10, 0))
+        source_var = tk.StringVar(value=EXPORT_SOURCES[0])
+        for source in EXPORT_SOURCES:
+            ttk.Radiobutton(dialog, text=source, value=source, variable=source_var).pack(anchor=tk.W, padx=30)
+        
+        ttk.Label(dialog, text="Format:").pack(pady=(10, 0))
+        formats = available_formats()
+        labels = [EXPORT_FORMATS[fmt].label for fmt in formats]
+        format_combo = ttk.Combobox(dialog, values=labels, state='readonly')
+        format_combo.current(0)
+        format_combo.pack(padx=20, pady=5)
+        
+        ttk.Button(dialog, text="Export...",
+                   command=lambda: self.start_export(dialog, source_var.get(),
+                                                     formats[format_combo.current()])).pack(pady=10)
+    
+    def start_export(self, dialog, source, fmt):
+        """Pick the output file and start the export worker"""
+        if source == 'Comparison list' and not self.selected_countries:
+            messagebox.showwarning("Warning", "Comparison list is empty")
+            return
+        if source == 'Country history' and self.scraper.history is None and self.scraper.load_history() is None:
+            messagebox.showwarning("Warning", "No country history has been crawled yet")
+            return
         
-        # Get save path
-        file_ext = ".csv" if format_choice == 'yes' else ".xlsx"
+        extension = EXPORT_FORMATS[fmt].extension
         file_path = filedialog.asksaveasfilename(
-            defaultextension=file_ext,
-            filetypes=[("CSV Files", "*.csv"), ("Excel Files", "*.xlsx")] if format_choice == 'yes' 
-            else [("Excel Files", "*.xlsx"), ("CSV Files", "*.csv")],
+            defaultextension=extension,
+            filetypes=[(f"{EXPORT_FORMATS[fmt].label} Files", f"*{extension}")],
             title="Save As"
         )
-        
         if not file_path:
             return  # User cancelled
+        dialog.destroy()
+        if not file_path.lower().endswith(extension):
+            file_path += extension
+        
+        self.export_cancel = cancel_event = threading.Event()
+        progress = lambda done, total: self.export_queue.put(('progress', (done, total)))
+        if source == 'All stored snapshots':
+            store = self.scraper.snapshots
+            job = lambda: export_snapshots(store, file_path, fmt=fmt, progress_callback=progress,
+                                           cancel_event=cancel_event)
+        else:
+            if source == 'Current data':
+                data_to_export = self.data
+            elif source == 'Comparison list':
+                data_to_export = self.scraper.get_countries(self.selected_countries)
+            else:
+                data_to_export = self.scraper.history
+            job = lambda: export_frame(data_to_export, file_path, fmt=fmt, progress_callback=progress,
+                                       cancel_event=cancel_event)
         
+        self.start_export_job(job, file_path)
+    
+    def start_export_job(self, job, file_path, unit='rows'):
+        """Run an export job on a background thread, with progress in the status bar"""
+        self.export_unit = unit
+        self.export_thread = threading.Thread(target=self._export_worker, args=(job, file_path), daemon=True)
+        self.status_label.config(text=f"Exporting to {os.path.basename(file_path)}...")
+        self.export_progress.config(value=0)
+        self.export_progress.pack(side=tk.RIGHT, padx=5)
+        self.cancel_export_btn.pack(side=tk.RIGHT)
+        self.export_thread.start()
+        self.root.after(100, self._poll_export_queue)
+    
+    def _export_worker(self, job, file_path):
         try:
-            if format_choice == 'yes':
-                data_to_export.to_csv(file_path, index=False)
-            else:
-                data_to_export.to_excel(file_path, index=False)
-            
-            messagebox.showinfo("Success", f"Data successfully exported to {file_path}")
+            rows = job()
+            self.export_queue.put(('done', (rows, file_path)))
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to export data: {str(e)}")
-    
-    def format_metric_value(self, value, metric):
-        """Format a metric value for display"""
-        if pd.isna(value):
-            return 'N/A'
-        
-        if metric in ['Population', 'Net_Change', 'Land_Area', 'Net_Migration']:
-            return f"{int(value):,}"
-        elif metric in ['Yearly_Change', 'Urban_Population_Percent', 'World_Share']:
-            return f"{value:.2f}%"
-        elif metric in ['Fertility_Rate', 'Median_Age']:
-            return f"{value:.1f}"
-        elif metric == 'Density':
-            return f"{int(value)}"
-        else:
-            return str(value)
+            self.export_queue.put(('error', e))
+    
+    def _poll_export_queue(self):
+        """Update the export progress bar and report the outcome on the Tk main thread"""
+        try:
+            while True:
+                kind, payload = self.export_queue.get_nowait()
+                if kind == 'progress':
+                    done, total = payload
+                    if total:
+                        self.export_progress.config(value=100.0 * done / total)
+                    self.status_label.config(text=f"Exported {done:,} of {total:,} {self.export_unit}" if total
+                                             else f"Exported {done:,} {self.export_unit}")
+                else:
+                    self.export_progress.pack_forget()
+                    self.cancel_export_btn.pack_forget()
+                    if kind == 'done':
+                        count, file_path = payload
+                        self.status_label.config(text=f"Exported {count:,} {self.export_unit}")
+                        what = "Data" if self.export_unit == 'rows' else "Animation"
+                        messagebox.showinfo("Success", f"{what} successfully exported to {file_path}")
+                    elif isinstance(payload, InterruptedError):
+                        self.status_label.config(text="Export cancelled")
+                    else:
+                        self.status_label.config(text="Export failed")
+                        messagebox.showerror("Error", f"Failed to export data: {str(payload)}")
+        except queue.Empty:
+            pass
+        
+        if self.export_thread.is_alive() or not self.export_queue.empty():
+            self.root.after(100, self._poll_export_queue)
+    
+    def cancel_export(self):
+        """Stop the running export; the partial file is removed"""
+        if self.export_cancel is not None:
+            self.export_cancel.set()
 
 if __name__ == "__main__":
     root = tk.Tk()
     app = PopulationExplorerApp(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+    app.render_worker.shutdown()
\ No newline at end of file
@@ -0,0 +1,53 @@
+from bisect import bisect_left
+from typing import List, Sequence, Tuple
+import numpy as np
+from country_index import normalize_name
+
+
+class PrefixIndex:
+    """Sorted-key prefix index for search-as-you-type completion
+
+    Every word suffix of every key is stored in one sorted list ("south korea"
+    is reachable from both "sou" and "kor"), so a completion is two binary
+    searches plus a sort of the matching slice. Matches at the start of a name
+    rank before matches inside it, then lower row positions (bigger countries
+    in the population table) come first.
+    """
+
+    def __init__(self, entries: Sequence[Tuple[str, int]]):
+        """Build the index from (normalised key, target) pairs, e.g. names and aliases to rows"""
+        items = []
+        for key, target in entries:
+            words = key.split()
+            for start in range(len(words)):
+                items.append((' '.join(words[start:]), start > 0, target))
+        items.sort(key=lambda item: item[0])
+        self.keys = [key for key, _, _ in items]
+        self._inner = np.array([inner for _, inner, _ in items], dtype=bool)
+        self._targets = np.array([target for _, _, target in items], dtype=np.intp)
+
+    def complete(self, text: str, k: int = 8) -> List[int]:
+        """Get up to k distinct targets whose key (or a later word of it) starts with the text"""
+        prefix = normalize_name(text)
+        if not prefix:
+            return []
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + '￿', lo)
+        if lo == hi:
+            return []
+
+        targets = self._targets[lo:hi]
+        # Smaller is better: name starts before inner words, then row position
+        score = targets + self._inner[lo:hi] * (int(self._targets.max()) + 1)
+        if len(score) > 4 * k:
+            # Several keys can map to one target, so keep a margin before de-duplicating
+            keep = np.argpartition(score, 4 * k)[:4 * k]
+            targets, score = targets[keep], score[keep]
+
+        completions = []
+        for target in targets[np.argsort(score, kind='stable')]:
+            if target not in completions:
+                completions.append(int(target))
+                if len(completions) == k:
+                    break
+        return completions
@@ -0,0 +1,73 @@
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+
+class _MetricRanking:
+    def __init__(self, values: np.ndarray):
+        self.valid = int(np.count_nonzero(~np.isnan(values)))
+        # Stable sorts keep the original row order for ties (like nlargest/nsmallest
+        # with keep='first'); NaN sorts last in both directions
+        self.descending = np.argsort(-values, kind='stable')
+        self.ascending = np.argsort(values, kind='stable')
+        self.sorted_values = values[self.ascending[:self.valid]]
+
+        ordered = values[self.descending[:self.valid]]
+        starts = np.ones(self.valid, dtype=bool)
+        starts[1:] = ordered[1:] != ordered[:-1]
+        self.dense_rank = np.zeros(len(values), dtype=np.int32)
+        self.dense_rank[self.descending[:self.valid]] = np.cumsum(starts)
+        self.values = values
+
+
+class MetricRankings:
+    """Sort permutations and dense ranks for every numeric metric of one snapshot
+
+    Everything is computed once up front; each query is then an array slice
+    or a single lookup instead of a fresh sort of the whole table.
+    """
+
+    def __init__(self, data: pd.DataFrame, metrics: Optional[List[str]] = None):
+        if metrics is None:
+            metrics = [col for col in data.columns
+                       if pd.api.types.is_numeric_dtype(data[col].dtype) and col != 'Rank']
+        self._rankings: Dict[str, _MetricRanking] = {
+            metric: _MetricRanking(data[metric].to_numpy(dtype=np.float64, na_value=np.nan))
+            for metric in metrics
+        }
+
+    @property
+    def metrics(self) -> List[str]:
+        return list(self._rankings)
+
+    def __contains__(self, metric: str) -> bool:
+        return metric in self._rankings
+
+    def _get(self, metric: str) -> _MetricRanking:
+        if metric not in self._rankings:
+            raise ValueError(f"Column '{metric}' not found in data")
+        return self._rankings[metric]
+
+    def top(self, metric: str, n: int) -> np.ndarray:
+        """Row positions of the n largest values, largest first"""
+        ranking = self._get(metric)
+        return ranking.descending[:min(max(n, 0), ranking.valid)]
+
+    def bottom(self, metric: str, n: int) -> np.ndarray:
+        """Row positions of the n smallest values, smallest first"""
+        ranking = self._get(metric)
+        return ranking.ascending[:min(max(n, 0), ranking.valid)]
+
+    def rank_of(self, metric: str, position: int) -> Optional[int]:
+        """Dense rank (1 = largest) of the row at a position, None if its value is missing"""
+        rank = int(self._get(metric).dense_rank[position])
+        return rank or None
+
+    def percentile(self, metric: str, position: int) -> Optional[float]:
+        """Percentage of rows with a strictly smaller value than the row at a position"""
+        ranking = self._get(metric)
+        value = ranking.values[position]
+        if np.isnan(value) or ranking.valid == 0:
+            return None
+        below = np.searchsorted(ranking.sorted_values, value, side='left')
+        return 100.0 * float(below) / ranking.valid
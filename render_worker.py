@@ -0,0 +1,97 @@
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional, Tuple
+import numpy as np
+import pandas as pd
+from chart_spec import ChartSpec
+
+_visualizer = None
+
+
+def init_worker():
+    """Set up the Agg backend and chart style once per worker process"""
+    global _visualizer
+    import matplotlib
+    matplotlib.use('Agg')
+    from visualizer import PopulationVisualizer
+    _visualizer = PopulationVisualizer()
+
+
+def worker_visualizer():
+    """Get this process's visualizer, setting the process up on first use"""
+    if _visualizer is None:
+        init_worker()
+    return _visualizer
+
+
+def _noop():
+    return None
+
+
+def render_chart(spec: ChartSpec, data: pd.DataFrame, width: int, height: int, dpi: int = 100) -> np.ndarray:
+    """Render a chart with Agg and return its pixels as an (height, width, 4) RGBA array"""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    worker_visualizer().draw_chart(fig, spec, data)
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba()).copy()
+
+
+class RenderWorker:
+    """Renders charts in a background process so Tk stays responsive
+
+    Only the most recent request matters: submitting a new chart cancels the
+    previous one if it has not started yet, and a stale result that finishes
+    anyway is never handed back.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._future: Optional[Future] = None
+        self._spec: Optional[ChartSpec] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn keeps the worker free of the parent's Tk state and threads
+            self._executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'),
+                                                 initializer=init_worker)
+        return self._executor
+
+    def warm(self):
+        """Start the worker process ahead of the first heavy chart"""
+        self._get_executor().submit(_noop)
+
+    def submit(self, spec: ChartSpec, data: pd.DataFrame, width: int, height: int, dpi: int = 100):
+        """Queue a render, superseding any render still pending"""
+        self.cancel()
+        self._spec = spec
+        self._future = self._get_executor().submit(render_chart, spec, data, width, height, dpi)
+
+    def cancel(self):
+        """Drop the pending render, if any"""
+        if self._future is not None:
+            self._future.cancel()
+        self._future = None
+        self._spec = None
+
+    @property
+    def busy(self) -> bool:
+        return self._future is not None
+
+    def poll(self) -> Optional[Tuple[ChartSpec, np.ndarray]]:
+        """Get (spec, RGBA pixels) once the latest render is done; re-raises render errors"""
+        if self._future is None or not self._future.done():
+            return None
+        future, spec = self._future, self._spec
+        self._future = None
+        self._spec = None
+        return spec, future.result()
+
+    def shutdown(self):
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,191 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+# Label boxes are estimated from the text length instead of measuring every Text artist
+CHAR_WIDTH = 0.6   # average glyph width, in units of the font size
+LINE_HEIGHT = 1.25  # line height, in units of the font size
+# Hover picks the nearest point within this many pixels of the mouse
+PICK_RADIUS_PX = 12
+
+
+class GridIndex:
+    """Uniform grid over points in display (pixel) coordinates
+
+    Points are bucketed into square cells, so finding the points near a
+    position or inside a box only looks at the few cells it touches.
+    Points with a missing coordinate are left out.
+    """
+
+    def __init__(self, points: np.ndarray, cell_size: float):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.cell_size = float(cell_size)
+        valid = np.flatnonzero(np.isfinite(self.points).all(axis=1))
+        cells = np.floor(self.points[valid] / self.cell_size).astype(np.int64)
+
+        # Group the point ids by cell with one sort instead of a dict insert per point
+        order = np.lexsort((cells[:, 1], cells[:, 0]))
+        cells, ids = cells[order], valid[order]
+        starts = np.flatnonzero(np.r_[True, (np.diff(cells, axis=0) != 0).any(axis=1)]) if len(ids) else []
+        self._cells: Dict[Tuple[int, int], np.ndarray] = {
+            (int(cells[start, 0]), int(cells[start, 1])): group
+            for start, group in zip(starts, np.split(ids, starts[1:]))
+        }
+
+    def in_box(self, x0: float, y0: float, x1: float, y1: float) -> np.ndarray:
+        """Ids of the points inside a box"""
+        cx0, cy0 = int(np.floor(x0 / self.cell_size)), int(np.floor(y0 / self.cell_size))
+        cx1, cy1 = int(np.floor(x1 / self.cell_size)), int(np.floor(y1 / self.cell_size))
+        groups = [self._cells[(cx, cy)] for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)
+                  if (cx, cy) in self._cells]
+        if not groups:
+            return np.empty(0, dtype=np.int64)
+        ids = np.concatenate(groups)
+        xy = self.points[ids]
+        inside = (xy[:, 0] >= x0) & (xy[:, 0] <= x1) & (xy[:, 1] >= y0) & (xy[:, 1] <= y1)
+        return ids[inside]
+
+    def nearest(self, x: float, y: float, radius: float = PICK_RADIUS_PX) -> Optional[int]:
+        """Id of the point closest to (x, y) within radius, or None"""
+        ids = self.in_box(x - radius, y - radius, x + radius, y + radius)
+        if ids.size == 0:
+            return None
+        distances = np.hypot(self.points[ids, 0] - x, self.points[ids, 1] - y)
+        best = int(np.argmin(distances))
+        return int(ids[best]) if distances[best] <= radius else None
+
+
+def label_boxes(points: np.ndarray, names: Sequence[str], fontsize: float, dpi: float,
+                offset: Tuple[float, float] = (5, 5)) -> np.ndarray:
+    """Estimated (x0, y0, x1, y1) pixel boxes of labels placed at an offset (in points) from each point"""
+    scale = dpi / 72.0
+    widths = np.char.str_len(np.asarray(names, dtype=str)) * CHAR_WIDTH * fontsize * scale
+    height = LINE_HEIGHT * fontsize * scale
+    x0 = points[:, 0] + offset[0] * scale
+    y0 = points[:, 1] + offset[1] * scale
+    return np.column_stack([x0, y0, x0 + widths, y0 + height])
+
+
+def select_labels(boxes: np.ndarray, priority: Optional[Sequence[int]] = None,
+                  bounds: Optional[Tuple[float, float, float, float]] = None) -> np.ndarray:
+    """Greedily pick labels whose boxes overlap no label picked before them
+
+    Labels are considered in priority order (row order by default); the ones
+    with a missing coordinate or outside bounds are skipped. Accepted boxes are
+    bucketed by their lower-left corner in cells as large as the largest box,
+    so any box overlapping a new one sits at most one cell outside it.
+    """
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    order = np.arange(len(boxes)) if priority is None else np.asarray(priority)
+    usable = np.isfinite(boxes).all(axis=1)
+    if bounds is not None:
+        bx0, by0, bx1, by1 = bounds
+        usable &= (boxes[:, 0] >= bx0) & (boxes[:, 1] >= by0) & (boxes[:, 2] <= bx1) & (boxes[:, 3] <= by1)
+    if not usable.any():
+        return np.empty(0, dtype=np.int64)
+
+    cell = float(max((boxes[usable, 2] - boxes[usable, 0]).max(), (boxes[usable, 3] - boxes[usable, 1]).max(), 1.0))
+    occupied: Dict[Tuple[int, int], List[int]] = {}
+    chosen = []
+    for i in order:
+        if not usable[i]:
+            continue
+        x0, y0, x1, y1 = boxes[i]
+        cx0, cy0 = int(np.floor(x0 / cell)) - 1, int(np.floor(y0 / cell)) - 1
+        cx1, cy1 = int(np.floor(x1 / cell)) + 1, int(np.floor(y1 / cell)) + 1
+        neighbours = {j for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)
+                      for j in occupied.get((cx, cy), ())}
+        if any(boxes[j, 0] < x1 and x0 < boxes[j, 2] and boxes[j, 1] < y1 and y0 < boxes[j, 3]
+               for j in neighbours):
+            continue
+        chosen.append(int(i))
+        occupied.setdefault((int(np.floor(x0 / cell)), int(np.floor(y0 / cell))), []).append(int(i))
+    return np.asarray(chosen, dtype=np.int64)
+
+
+class ScatterLabeler:
+    """Decluttered point labels plus hover picking for one scatter plot
+
+    Only labels that do not overlap a higher priority label are shown; every
+    other point can still be identified by hovering, which looks the point up
+    in a grid index of the same display coordinates used for the labels.
+    Call relabel() after the axes limits or the figure size change.
+    """
+
+    def __init__(self, ax, x: np.ndarray, y: np.ndarray, names: Sequence[str],
+                 hover_texts: Optional[Sequence[str]] = None, fontsize: float = 8,
+                 animated: bool = False):
+        self.ax = ax
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.names = list(names)
+        self.hover_texts = list(hover_texts) if hover_texts is not None else self.names
+        self.fontsize = fontsize
+        self.animated = animated
+        self.index: Optional[GridIndex] = None
+        self.shown = np.empty(0, dtype=np.int64)
+        self._annotations = []
+        self._hovered: Optional[int] = None
+        self.hover = ax.annotate('', (0, 0), xytext=(10, 10), textcoords='offset points', fontsize=9,
+                                 bbox=dict(boxstyle='round', fc='lightyellow', alpha=0.9),
+                                 visible=False, animated=animated, zorder=10)
+
+    @property
+    def artists(self) -> list:
+        """Every label artist, including the hover tooltip (e.g. for blitting)"""
+        return self._annotations + [self.hover]
+
+    def set_data(self, x: np.ndarray, y: np.ndarray, names: Sequence[str],
+                 hover_texts: Optional[Sequence[str]] = None):
+        """Switch to another set of points, keeping the label artists for reuse"""
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.names = list(names)
+        self.hover_texts = list(hover_texts) if hover_texts is not None else self.names
+        self._hovered = None
+        self.hover.set_visible(False)
+
+    def relabel(self):
+        """Rebuild the index in current display coordinates and pick the labels to show"""
+        fig = self.ax.figure
+        points = self.ax.transData.transform(np.column_stack([self.x, self.y]))
+        self.index = GridIndex(points, cell_size=2 * PICK_RADIUS_PX)
+        boxes = label_boxes(points, self.names, self.fontsize, fig.dpi)
+        self.shown = select_labels(boxes, bounds=tuple(self.ax.bbox.extents))
+
+        # Grow the pool of annotations as needed, hide the ones left over
+        while len(self._annotations) < len(self.shown):
+            self._annotations.append(self.ax.annotate('', (0, 0), xytext=(5, 5), textcoords='offset points',
+                                                      fontsize=self.fontsize, animated=self.animated))
+        for annotation in self._annotations[len(self.shown):]:
+            annotation.set_visible(False)
+        for annotation, i in zip(self._annotations, self.shown):
+            annotation.set_text(self.names[i])
+            annotation.xy = (self.x[i], self.y[i])
+            annotation.set_visible(True)
+
+    def on_move(self, event) -> bool:
+        """Show the tooltip of the point under the mouse; returns True if it changed"""
+        i = None
+        if event.inaxes is self.ax and self.index is not None:
+            i = self.index.nearest(event.x, event.y)
+        if i == self._hovered:
+            return False
+        self._hovered = i
+        if i is None:
+            self.hover.set_visible(False)
+        else:
+            self.hover.xy = (self.x[i], self.y[i])
+            self.hover.set_text(self.hover_texts[i])
+            self.hover.set_visible(True)
+        return True
+
+    def connect(self, canvas, redraw=None):
+        """Relabel on zoom, pan and resize, and track the mouse for the tooltip
+
+        redraw is called after the tooltip changes (default: canvas.draw_idle).
+        """
+        redraw = redraw or canvas.draw_idle
+        self.ax.callbacks.connect('xlim_changed', lambda ax: self.relabel())
+        self.ax.callbacks.connect('ylim_changed', lambda ax: self.relabel())
+        canvas.mpl_connect('resize_event', lambda event: self.relabel())
+        canvas.mpl_connect('motion_notify_event', lambda event: self.on_move(event) and redraw())
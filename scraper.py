@@ -1,210 +1,475 @@
+import os
+import numpy as np
 import pandas as pd
 import re
-from typing import Dict, List, Optional
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 import time
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium.webdriver.chrome.options import Options
+from fetch_cache import DEFAULT_TTL, FetchCache, content_hash
+from snapshot_store import SnapshotStore
+from country_index import CountryIndex
+from fuzzy_match import TrigramIndex
+from prefix_index import PrefixIndex
+from rankings import MetricRankings
+from grid_model import GridModel
+from filters import FilterEngine
+
+# requests, lxml and Selenium are only needed to fetch fresh data, so they are imported
+# on first use; opening a stored snapshot (the app's start-up path) never loads them
+if TYPE_CHECKING:
+    import requests
+    from driver_pool import DriverPool
+
+HTTP_HEADERS = {
+    'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/124.0 Safari/537.36'),
+    'Accept': 'text/html,application/xhtml+xml',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+NUMERIC_COLUMNS = ['Population', 'Net_Change', 'Density', 'Land_Area',
+                   'Net_Migration', 'Fertility_Rate', 'Median_Age']
+PERCENTAGE_COLUMNS = ['Yearly_Change', 'Urban_Population_Percent', 'World_Share']
+
+# Matched against the lower-cased, whitespace-collapsed header text, so year-stamped
+# headers like 'Population (2025)' keep working when the site rolls over to a new year
+COLUMN_PATTERNS = [
+    (re.compile(r'^country\b'), 'Country'),
+    (re.compile(r'^population\b'), 'Population'),
+    (re.compile(r'^yearly (% )?change\b'), 'Yearly_Change'),
+    (re.compile(r'^net change\b'), 'Net_Change'),
+    (re.compile(r'^density\b'), 'Density'),
+    (re.compile(r'^land area\b'), 'Land_Area'),
+    (re.compile(r'^migrants\b'), 'Net_Migration'),
+    (re.compile(r'^fert(\.|ility)? rate\b'), 'Fertility_Rate'),
+    (re.compile(r'^med(\.|ian)? age\b'), 'Median_Age'),
+    (re.compile(r'^urban pop(\.|ulation)? %'), 'Urban_Population_Percent'),
+    (re.compile(r'^world share\b'), 'World_Share'),
+]
+
+# Thousands separators, percent signs and spaces are dropped and the Unicode minus
+# (U+2212) becomes '-'; anything still not a number (e.g. 'N.A.') is coerced to NaN
+_NUMERIC_TRANSLATION = str.maketrans({',': None, '%': None, ' ': None, '\xa0': None, '\u2212': '-'})
+
+_session = None
+
+
+def new_session(pool_maxsize: int = 16) -> 'requests.Session':
+    """Create a connection-pooled HTTP session with the scraper's headers"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    session.headers.update(HTTP_HEADERS)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=1)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session() -> 'requests.Session':
+    """Get the shared, connection-pooled HTTP session (for the main scrape only)"""
+    global _session
+    if _session is None:
+        _session = new_session()
+    return _session
+
+
+def normalize_column_name(name: str) -> str:
+    """Map a raw table header onto its canonical column name"""
+    key = ' '.join(str(name).split()).lower()
+    for pattern, column in COLUMN_PATTERNS:
+        if pattern.search(key):
+            return column
+    return name
+
+
+def convert_numeric_block(df: pd.DataFrame, columns: List[str]) -> Dict[str, pd.Series]:
+    """Convert formatted text columns to numbers in a single vectorised pass
+
+    Columns whose values are all whole numbers come back as int64, the rest as float64.
+    """
+    if not columns:
+        return {}
+    flat = pd.Series(df[columns].to_numpy(dtype=object).ravel(), dtype=object)
+    flat = flat.astype(str).str.translate(_NUMERIC_TRANSLATION)
+    values = pd.to_numeric(flat, errors='coerce').to_numpy(dtype=np.float64)
+    values = values.reshape(len(df), len(columns))
+
+    missing = np.isnan(values)
+    integral = ~missing.any(axis=0) & (values == np.round(values)).all(axis=0)
+    return {
+        col: pd.Series(values[:, i].astype(np.int64) if integral[i] else values[:, i],
+                       index=df.index, name=col)
+        for i, col in enumerate(columns)
+    }
+
+
+def _cell_text(cell) -> str:
+    """Get the visible text of a table cell, treating <br> as a line break"""
+    for br in cell.iter('br'):
+        br.tail = '\n' + (br.tail or '')
+    lines = [' '.join(line.split()) for line in cell.text_content().split('\n')]
+    return '\n'.join(line for line in lines if line)
+
+
+def _find_datatable(page_html: str):
+    from lxml import html as lxml_html
+    doc = lxml_html.fromstring(page_html)
+    tables = doc.xpath('//table[contains(concat(" ", normalize-space(@class), " "), " datatable ")]')
+    if not tables:
+        raise ValueError("Could not find data table in the page")
+    return tables[0]
+
+
+def extract_datatable_html(page_html: str) -> str:
+    """Get the markup of the first 'datatable' table in an HTML document"""
+    table = _find_datatable(page_html)
+    if not table.xpath('.//tr[td]'):
+        raise ValueError("No data rows found in the table")
+    from lxml import etree
+    return etree.tostring(table, encoding='unicode')
+
+
+def table_to_frame(table, min_cells: int = 10) -> pd.DataFrame:
+    """Convert a parsed lxml <table> element into a raw DataFrame of cell text"""
+    # lxml does not synthesise <tbody> like a browser does, so match rows directly
+    headers = [_cell_text(cell) for cell in table.xpath('.//tr[th][1]/th')]
+    rows = []
+    for row in table.xpath('.//tr[td]'):
+        cells = row.xpath('./td')
+        if len(cells) >= min_cells:
+            rows.append([_cell_text(cell) for cell in cells])
+
+    if not rows:
+        raise ValueError("No data rows found in the table")
+
+    return pd.DataFrame(rows, columns=headers[:len(rows[0])])
+
+
+def parse_datatable(page_html: str, min_cells: int = 10) -> pd.DataFrame:
+    """Parse the first 'datatable' table in an HTML document into a raw DataFrame"""
+    return table_to_frame(_find_datatable(page_html), min_cells)
+
 
 class PopulationScraper:
-    def __init__(self, max_retries: int = 1, retry_delay: int = 5):
+    def __init__(self, max_retries: int = 1, retry_delay: int = 5, fetch_mode: str = 'http',
+                 timeout: int = 15, debug: bool = False, driver_pool: Optional['DriverPool'] = None,
+                 use_cache: bool = True, cache_dir: Optional[str] = None, cache_ttl: float = DEFAULT_TTL,
+                 snapshot_dir: Optional[str] = None):
+        if fetch_mode not in ('http', 'selenium'):
+            raise ValueError(f"Unknown fetch mode '{fetch_mode}'")
         self.url = "https://www.worldometers.info/world-population/population-by-country/"
         self.data = None
+        self.snapshot_id = None
+        self._derived = {}
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self.driver = None
-        
-    def _setup_driver(self):
-        """Set up and configure the Chrome WebDriver"""
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('--disable-software-rasterizer')
-        chrome_options.add_argument('--disable-webgl')
-        chrome_options.add_argument('--disable-webgl2')
-        
-        self.driver = webdriver.Chrome(options=chrome_options)
-        
-    def _close_driver(self):
-        """Close the WebDriver"""
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
-        
-    def scrape_data(self) -> pd.DataFrame:
+        self.fetch_mode = fetch_mode
+        self.timeout = timeout
+        self.debug = debug
+        self.progress_callback = None
+        self.driver_pool = driver_pool
+        self.cache = FetchCache(cache_dir, cache_ttl) if use_cache else None
+        self.snapshots = SnapshotStore(snapshot_dir)
+        self.history = None
+        self.history_snapshots = SnapshotStore(os.path.join(self.snapshots.root, 'history'))
+        
+    def _report(self, message: str):
+        """Print a progress message and forward it to the progress callback, if any"""
+        print(message)
+        if self.progress_callback:
+            self.progress_callback(message.strip())
+    
+    def _scrape_http(self, headers: Dict[str, str]) -> Tuple[Optional[str], Dict[str, Optional[str]]]:
+        """Fetch the page over HTTP and return the server-rendered table markup
+
+        Returns None instead of markup when the server answers 304 Not Modified.
+        """
+        response = get_session().get(self.url, timeout=self.timeout, headers=headers)
+        validators = {'etag': response.headers.get('ETag'),
+                      'last_modified': response.headers.get('Last-Modified')}
+        if response.status_code == 304:
+            return None, validators
+        response.raise_for_status()
+        return extract_datatable_html(response.text), validators
+
+    def _scrape_selenium(self) -> str:
+        """Render the page in headless Chrome and return the table markup"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from driver_pool import get_default_pool
+        
+        pool = self.driver_pool or get_default_pool()
+        with pool.lease() as driver:
+            driver.get(self.url)
+            
+            if self.debug:
+                # These serialise the whole DOM, so only pay for them when asked to
+                print("\nPage Title:", driver.title)
+                print("\nPage Source Length:", len(driver.page_source))
+                tables = driver.find_elements(By.TAG_NAME, "table")
+                print(f"Number of tables found: {len(tables)}")
+            
+            self._report("\nWaiting for table to load...")
+            wait = WebDriverWait(driver, 10)
+            table = wait.until(
+                EC.presence_of_element_located((By.CLASS_NAME, "datatable"))
+            )
+            
+            # Pull the whole table in one round-trip and parse it locally instead
+            # of issuing a WebDriver call per header and per cell
+            self._report("\nExtracting table data...")
+            return table.get_attribute("outerHTML")
+
+    @staticmethod
+    def _parse_if_changed(table_html: Optional[str], entry: Optional[Dict]) -> Optional[pd.DataFrame]:
+        """Parse the table markup, or get None when it is missing (304) or identical to the cached table"""
+        if table_html is None or (entry is not None and content_hash(table_html) == entry.get('content_hash')):
+            return None
+        return parse_datatable(table_html)
+
+    def _fetch_table(self, entry: Optional[Dict]) -> Tuple[Optional[str], Optional[pd.DataFrame], Dict[str, Optional[str]]]:
+        """Fetch and parse the table, falling back to Selenium if the static fetch or its parse fails
+
+        Returns the markup, the raw frame (None when the table is unchanged) and the cache validators.
+        """
+        if self.fetch_mode == 'http':
+            try:
+                table_html, validators = self._scrape_http(FetchCache.validators(entry))
+                # Parsed here so a page that extracts but does not parse still reaches Selenium
+                return table_html, self._parse_if_changed(table_html, entry), validators
+            except Exception as e:
+                self._report(f"\nStatic fetch failed ({str(e)}), falling back to Selenium...")
+        table_html = self._scrape_selenium()
+        return table_html, self._parse_if_changed(table_html, entry), {}
+
+    def _load_cached(self, entry: Optional[Dict]) -> Optional[pd.DataFrame]:
+        if entry is None or not self.snapshots.exists(entry.get('snapshot_id')):
+            return None
+        if entry['snapshot_id'] == self.snapshot_id and self.data is not None:
+            # Already loaded; keeping the same frame keeps its per-snapshot indexes too
+            return self.data
+        try:
+            df = self.snapshots.load(entry['snapshot_id'])
+        except Exception as e:
+            print(f"\nIgnoring unreadable snapshot: {str(e)}")
+            return None
+        return df
+
+    def adopt(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Make a loaded frame the current data"""
+        self.data = df
+        self.snapshot_id = df.attrs.get('snapshot_id')
+        return df
+
+    def load_snapshot(self, snapshot_id: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Load a stored snapshot (the latest by default) without any network access"""
+        snapshot_id = snapshot_id or self.snapshots.latest_id()
+        if not self.snapshots.exists(snapshot_id):
+            return None
+        return self.adopt(self.snapshots.load(snapshot_id))
+
+    def scrape_data(self, force_refresh: bool = False) -> pd.DataFrame:
+        """Get the population table and make it the current data"""
+        return self.adopt(self.fetch_data(force_refresh=force_refresh))
+
+    def fetch_data(self, force_refresh: bool = False,
+                   cancel_event: Optional[threading.Event] = None) -> pd.DataFrame:
+        """Get the population table, reusing the on-disk cache when it is still valid
+        
+        The result is not adopted as the current data, so a caller on another thread can
+        hand it back to its owner first. Setting cancel_event stops the scrape before the
+        next attempt.
+        """
+        entry = self.cache.get_entry(self.url) if self.cache else None
+        
+        if entry is not None and not force_refresh and self.cache.is_fresh(entry):
+            df = self._load_cached(entry)
+            if df is not None:
+                self._report("Using cached data from Worldometers")
+                return df
+        
         retry_count = 0
         last_error = None
         
         while retry_count < self.max_retries:
+            if cancel_event is not None and cancel_event.is_set():
+                raise InterruptedError("Scrape cancelled")
             try:
-                print(f"Fetching data from Worldometers... (Attempt {retry_count + 1}/{self.max_retries})")
-                
-                if not self.driver:
-                    self._setup_driver()
-                
-                self.driver.get(self.url)
-                
-                print("\nPage Title:", self.driver.title)
-                
-                print("\nPage Source Length:", len(self.driver.page_source))
-                
-                print("\nAll tables found on page:")
-                tables = self.driver.find_elements(By.TAG_NAME, "table")
-                print(f"Number of tables found: {len(tables)}")
+                self._report(f"Fetching data from Worldometers... (Attempt {retry_count + 1}/{self.max_retries})")
                 
-                print("\nWaiting for table to load...")
-                wait = WebDriverWait(self.driver, 10)
-                table = wait.until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "datatable"))
-                )
+                table_html, df, validators = self._fetch_table(entry)
                 
-                print("\nFound target table:")
+                # Not modified, or modified page with an identical table: skip parsing
+                table_hash = content_hash(table_html) if table_html is not None else None
+                if entry is not None and table_hash in (None, entry.get('content_hash')):
+                    df = self._load_cached(entry)
+                    if df is not None:
+                        self._report("\nTable unchanged since last fetch, using cached data")
+                        self.cache.touch(self.url, entry, **validators)
+                        return df
+                    if table_html is None:
+                        # Cached frame is gone, fetch again without validators
+                        entry = None
+                        table_html, df, validators = self._fetch_table(None)
+                        table_hash = content_hash(table_html)
                 
-                print("\nExtracting table data...")
-                headers = []
-                header_cells = table.find_elements(By.CSS_SELECTOR, "thead th")
-                print(f"\nNumber of header cells found: {len(header_cells)}")
-                for cell in header_cells:
-                    header_text = cell.text.strip()
-                    headers.append(header_text)
+                if df is None:
+                    # Unchanged table whose cached frame is gone
+                    df = parse_datatable(table_html)
                 
-                rows = []
-                data_rows = table.find_elements(By.CSS_SELECTOR, "tbody tr")
-                print(f"\nNumber of data rows found: {len(data_rows)}")
-                
-                for i, row in enumerate(data_rows[:len(data_rows)]):
-                    cells = row.find_elements(By.TAG_NAME, "td")
-                    if len(cells) >= 10:
-                        row_data = [cell.text.strip() for cell in cells]
-                        rows.append(row_data)
-                
-                if not rows:
-                    raise ValueError("No data rows found in the table")
-                
-                print("\nCreating DataFrame...")
-                
-                df = pd.DataFrame(rows, columns=headers[:len(rows[0]) if rows else 0])
-                
-                print("\nCleaning and processing data...")
+                self._report("\nCleaning and processing data...")
                 df = self._clean_data(df)
                 
-                self.data = df
-                print("\nScraping completed successfully!")
+                snapshot_id = self.snapshots.save(df, source=self.url)
+                if self.cache:
+                    self.cache.store(self.url, snapshot_id, table_hash, **validators)
+                
+                df = self.snapshots.load(snapshot_id)
+                self._report("\nScraping completed successfully!")
                 return df
                 
+            except InterruptedError:
+                raise
             except Exception as e:
                 last_error = e
                 retry_count += 1
                 if retry_count < self.max_retries:
-                    print(f"\nError occurred: {str(e)}")
-                    print(f"Retrying in {self.retry_delay} seconds...")
-                    time.sleep(self.retry_delay)
+                    self._report(f"\nError occurred: {str(e)}")
+                    self._report(f"Retrying in {self.retry_delay} seconds...")
+                    if cancel_event is not None:
+                        cancel_event.wait(self.retry_delay)
+                    else:
+                        time.sleep(self.retry_delay)
                 else:
-                    print(f"\nFailed after {self.max_retries} attempts. Last error: {str(last_error)}")
+                    self._report(f"\nFailed after {self.max_retries} attempts. Last error: {str(last_error)}")
                     raise last_error
-            finally:
-                self._close_driver()
-    
-    def __del__(self):
-        """Cleanup when the object is destroyed"""
-        self._close_driver()
     
     def _clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean and format the scraped data"""
+        original_columns = df.columns.tolist()
+        df = df.rename(columns=normalize_column_name)
+        
+        if self.debug:
+            print("\nColumn names:")
+            for old_name, new_name in zip(original_columns, df.columns):
+                print(f"  {old_name!r} -> {new_name!r}")
         
-        column_mapping = {
-            'Country (or\ndependency)': 'Country',
-            'Country (or dependency)': 'Country',
-            'Population\n(2025)': 'Population',
-            'Population (2025)': 'Population',
-            'Yearly\nChange': 'Yearly_Change',
-            'Yearly Change': 'Yearly_Change',
-            'Net\nChange': 'Net_Change',
-            'Net Change': 'Net_Change',
-            'Density\n(P/Km²)': 'Density',
-            'Density (P/Km²)': 'Density',
-            'Land Area\n(Km²)': 'Land_Area',
-            'Land Area (Km²)': 'Land_Area',
-            'Migrants\n(net)': 'Net_Migration',
-            'Migrants (net)': 'Net_Migration',
-            'Fert.\nRate': 'Fertility_Rate',
-            'Fert. Rate': 'Fertility_Rate',
-            'Median\nAge': 'Median_Age',
-            'Median Age': 'Median_Age',
-            'Urban\nPop %': 'Urban_Population_Percent',
-            'Urban Pop %': 'Urban_Population_Percent',
-            'World\nShare': 'World_Share',
-            'World Share': 'World_Share'
-        }
-        
-        print("\nOriginal column names:")
-        print(df.columns.tolist())
-        
-        for old_name, new_name in column_mapping.items():
-            if old_name in df.columns:
-                df = df.rename(columns={old_name: new_name})
-        
-        print("\nColumn names after mapping:")
-        print(df.columns.tolist())
-        
-        numeric_columns = ['Population', 'Net_Change', 'Density', 'Land_Area', 
-                          'Net_Migration', 'Fertility_Rate', 'Median_Age']
-        
-        for col in numeric_columns:
-            if col in df.columns:
-                df[col] = df[col].astype(str).str.replace(',', '').str.replace('−', '-')
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        percentage_columns = ['Yearly_Change', 'Urban_Population_Percent', 'World_Share']
-        for col in percentage_columns:
-            if col in df.columns:
-                df[col] = df[col].astype(str).str.replace('%', '').str.replace('−', '-')
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+        value_columns = [col for col in NUMERIC_COLUMNS + PERCENTAGE_COLUMNS if col in df.columns]
+        converted = convert_numeric_block(df, value_columns)
+        df = pd.DataFrame({col: converted.get(col, df[col]) for col in df.columns}, index=df.index)
         
         df.insert(0, 'Rank', range(1, len(df) + 1))
         
         return df
     
+    def crawl_history(self, max_workers: int = 16, progress_callback=None) -> pd.DataFrame:
+        """Crawl every country's yearly history page into a long (Country, Year, ...) dataset"""
+        # Imported here because the crawler reuses this module's parsing helpers
+        from history_crawler import HistoryCrawler
+        
+        crawler = HistoryCrawler(max_workers=max_workers, timeout=self.timeout)
+        history = crawler.crawl(progress_callback=progress_callback)
+        snapshot_id = self.history_snapshots.save(history, source='country pages')
+        self.history = self.history_snapshots.load(snapshot_id)
+        return self.history
+    
+    def load_history(self, snapshot_id: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Load a stored history snapshot (the latest by default) without any network access"""
+        snapshot_id = snapshot_id or self.history_snapshots.latest_id()
+        if not self.history_snapshots.exists(snapshot_id):
+            return None
+        self.history = self.history_snapshots.load(snapshot_id)
+        return self.history
+    
     def get_data(self) -> pd.DataFrame:
         """Get the scraped data, scraping if necessary"""
         if self.data is None:
             self.scrape_data()
         return self.data
     
+    def _per_snapshot(self, key: str, builder, source: str = 'data'):
+        """Get a structure derived from the current data (or history), rebuilding it when that changes"""
+        data = self.get_data() if source == 'data' else getattr(self, source)
+        cached_source, derived = self._derived.get(source, (None, None))
+        if cached_source is not data:
+            derived = {}
+            self._derived[source] = (data, derived)
+        if key not in derived:
+            derived[key] = builder(data)
+        return derived[key]
+    
+    def _country_column(self) -> str:
+        possible_columns = ['Country (or\ndependency)', 'Country (or dependency)', 'Country']
+        for col in possible_columns:
+            if col in self.data.columns:
+                return col
+        raise ValueError("Could not find country column in the data")
+    
+    def get_country_index(self) -> CountryIndex:
+        """Get the country name index for the current data"""
+        return self._per_snapshot(
+            'country_index', lambda data: CountryIndex(data[self._country_column()].astype(str).tolist()))
+    
+    def get_fuzzy_index(self) -> TrigramIndex:
+        """Get the trigram index over country names and aliases for the current data"""
+        return self._per_snapshot('fuzzy_index', lambda data: TrigramIndex(self.get_country_index().entries()))
+    
+    def get_prefix_index(self) -> PrefixIndex:
+        """Get the autocomplete index over country names and aliases for the current data"""
+        return self._per_snapshot('prefix_index', lambda data: PrefixIndex(self.get_country_index().entries()))
+    
+    def complete_countries(self, prefix: str, k: int = 8) -> List[str]:
+        """Get up to k country names completing a partially typed name, most relevant first"""
+        index = self.get_country_index()
+        return [index.names[pos] for pos in self.get_prefix_index().complete(prefix, k)]
+    
+    def suggest_countries(self, country_name: str, k: int = 5) -> List[str]:
+        """Suggest up to k country names for a possibly misspelled query, best match first"""
+        index = self.get_country_index()
+        return [index.names[pos] for pos, _ in self.get_fuzzy_index().query(country_name, k)]
+    
     def search_country(self, country_name: str) -> Optional[pd.Series]:
         """Search for a specific country"""
         if self.data is None:
             self.scrape_data()
         
-        print("\nAvailable columns in DataFrame:")
-        print(self.data.columns.tolist())
-        
-        possible_columns = ['Country (or\ndependency)', 'Country (or dependency)', 'Country']
-        country_column = None
-        
-        for col in possible_columns:
-            if col in self.data.columns:
-                country_column = col
-                break
-        
-        if country_column is None:
-            raise ValueError("Could not find country column in the data")
+        if self.debug:
+            print("\nAvailable columns in DataFrame:")
+            print(self.data.columns.tolist())
         
-        exact_match = self.data[self.data[country_column].str.lower() == country_name.lower()]
-        if not exact_match.empty:
-            return exact_match.iloc[0]
-
-        partial_match = self.data[self.data[country_column].str.contains(country_name, case=False, na=False)]
-        if not partial_match.empty:
-            return partial_match.iloc[0]
-        
-        return None
+        pos = self.get_country_index().search(country_name)
+        if pos is None:
+            return None
+        return self.data.iloc[pos]
+    
+    def get_countries(self, country_names: List[str]) -> pd.DataFrame:
+        """Get the rows for several countries at once, in the order given"""
+        index = self.get_country_index()
+        positions = index.lookup_many(country_names)
+        for i in np.flatnonzero(positions < 0):
+            pos = index.search(country_names[i])
+            positions[i] = -1 if pos is None else pos
+        return self.data.iloc[positions[positions >= 0]]
+    
+    def get_grid_model(self, history: bool = False) -> GridModel:
+        """Get the preformatted, sortable grid model for the current data or history"""
+        if history and self.history is None and self.load_history() is None:
+            raise ValueError("No country history has been crawled yet")
+        return self._per_snapshot('grid', GridModel, 'history' if history else 'data')
+    
+    def get_filter_engine(self) -> FilterEngine:
+        """Get the filter engine (and its mask cache) for the current data"""
+        return self._per_snapshot('filters', FilterEngine)
+    
+    def filter_countries(self, expression: str) -> pd.DataFrame:
+        """Get the rows matching a filter such as 'Density > 500 and Median_Age < 30'"""
+        return self.data.iloc[self.get_filter_engine().positions(expression)]
+    
+    def get_rankings(self) -> MetricRankings:
+        """Get the precomputed per-metric rankings for the current data"""
+        return self._per_snapshot('rankings', MetricRankings)
     
     def get_top_countries(self, n: int = 10, by: str = 'Population') -> pd.DataFrame:
         """Get top N countries by specified metric"""
@@ -214,4 +479,30 @@ class PopulationScraper:
         if by not in self.data.columns:
             raise ValueError(f"Column '{by}' not found in data")
         
-        return self.data.nlargest(n, by)
\ No newline at end of file
+        rankings = self.get_rankings()
+        if by not in rankings:
+            # No precomputed ranking (e.g. the site's own Rank column)
+            return self.data.nlargest(n, by)
+        return self.data.iloc[rankings.top(by, n)]
+    
+    def get_bottom_countries(self, n: int = 10, by: str = 'Population') -> pd.DataFrame:
+        """Get bottom N countries by specified metric"""
+        if self.data is None:
+            self.scrape_data()
+        
+        if by not in self.data.columns:
+            raise ValueError(f"Column '{by}' not found in data")
+        
+        rankings = self.get_rankings()
+        if by not in rankings:
+            # No precomputed ranking (e.g. the site's own Rank column)
+            return self.data.nsmallest(n, by)
+        return self.data.iloc[rankings.bottom(by, n)]
+    
+    def get_country_rank(self, country_name: str, by: str = 'Population') -> Optional[Dict[str, float]]:
+        """Get a country's rank (1 = largest) and percentile for a metric"""
+        pos = self.get_country_index().search(country_name)
+        if pos is None:
+            return None
+        rankings = self.get_rankings()
+        return {'rank': rankings.rank_of(by, pos), 'percentile': rankings.percentile(by, pos)}
@@ -0,0 +1,29 @@
+import json
+import os
+from typing import Dict, Optional
+from fetch_cache import DEFAULT_CACHE_DIR
+
+DEFAULT_SESSION_PATH = os.path.join(DEFAULT_CACHE_DIR, 'session.json')
+SESSION_VERSION = 1
+
+
+def load_session(path: Optional[str] = None) -> Dict:
+    """Load the saved explorer session, or an empty one if there is none or it is unreadable"""
+    try:
+        with open(path or DEFAULT_SESSION_PATH, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(state, dict) or state.get('version') != SESSION_VERSION:
+        return {}
+    return state
+
+
+def save_session(state: Dict, path: Optional[str] = None):
+    """Save the explorer session atomically, so a crash mid-write keeps the previous one"""
+    path = path or DEFAULT_SESSION_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(state, version=SESSION_VERSION), f, indent=1)
+    os.replace(tmp_path, path)
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from fetch_cache import DEFAULT_CACHE_DIR
+
+DEFAULT_SNAPSHOT_DIR = os.path.join(DEFAULT_CACHE_DIR, 'snapshots')
+FORMAT_VERSION = 1
+
+
+def downcast_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Shrink integer columns to the smallest safe dtype and store text columns as categoricals
+
+    Float metrics stay float64: float32 would change values such as 40.1 on the way back out.
+    """
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            columns[col] = series
+        elif pd.api.types.is_integer_dtype(series.dtype):
+            columns[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series.dtype):
+            columns[col] = series.astype(np.float64)
+        else:
+            columns[col] = series.astype('category')
+    return pd.DataFrame(columns, index=df.index)
+
+
+def frame_hash(df: pd.DataFrame) -> str:
+    """Hash the values of a DataFrame, independent of its dtypes"""
+    hashed = pd.util.hash_pandas_object(df.astype(object), index=False).to_numpy()
+    return hashlib.sha1(hashed.tobytes() + ','.join(map(str, df.columns)).encode('utf-8')).hexdigest()
+
+
+class SnapshotStore:
+    """Columnar on-disk snapshots of cleaned data, one .npy file per column
+
+    Snapshots are loaded with memory-mapping, so opening one is close to
+    free and processes that open the same snapshot share its pages.
+    """
+
+    def __init__(self, root: Optional[str] = None, keep: int = 30):
+        self.root = root or DEFAULT_SNAPSHOT_DIR
+        self.keep = keep
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, snapshot_id: str, name: str = '') -> str:
+        return os.path.join(self.root, snapshot_id, name)
+
+    def list_snapshots(self) -> List[str]:
+        """List snapshot ids, oldest first"""
+        return sorted(name for name in os.listdir(self.root)
+                      if not name.startswith('.') and os.path.isfile(self._path(name, 'meta.json')))
+
+    def latest_id(self) -> Optional[str]:
+        """Get the id of the most recent snapshot, if any"""
+        snapshots = self.list_snapshots()
+        return snapshots[-1] if snapshots else None
+
+    def exists(self, snapshot_id: Optional[str]) -> bool:
+        return bool(snapshot_id) and os.path.isfile(self._path(snapshot_id, 'meta.json'))
+
+    def read_meta(self, snapshot_id: str) -> Dict:
+        with open(self._path(snapshot_id, 'meta.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save(self, df: pd.DataFrame, source: Optional[str] = None) -> str:
+        """Persist a cleaned DataFrame as a new snapshot and return its id"""
+        df = downcast_frame(df.reset_index(drop=True))
+        snapshot_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{frame_hash(df)[:8]}"
+        if self.exists(snapshot_id):
+            return snapshot_id
+
+        tmp_dir = os.path.join(self.root, f".tmp-{snapshot_id}-{os.getpid()}")
+        os.makedirs(tmp_dir)
+        columns = []
+        try:
+            for i, col in enumerate(df.columns):
+                series = df[col]
+                column = {'name': col}
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    column['kind'] = 'category'
+                    column['categories'] = [str(c) for c in series.cat.categories]
+                    values = np.asarray(series.cat.codes)
+                else:
+                    column['kind'] = 'numeric'
+                    values = series.to_numpy()
+                column['file'] = f"{i}.npy"
+                column['dtype'] = values.dtype.str
+                np.save(os.path.join(tmp_dir, column['file']), values, allow_pickle=False)
+                columns.append(column)
+
+            meta = {
+                'format': FORMAT_VERSION,
+                'id': snapshot_id,
+                'created_at': time.time(),
+                'source': source,
+                'rows': len(df),
+                'columns': columns,
+            }
+            with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(tmp_dir, self._path(snapshot_id))
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        self.prune()
+        return snapshot_id
+
+    def load(self, snapshot_id: Optional[str] = None, mmap: bool = True) -> pd.DataFrame:
+        """Load a snapshot (the latest by default) without copying column data"""
+        snapshot_id = snapshot_id or self.latest_id()
+        if not self.exists(snapshot_id):
+            raise FileNotFoundError(f"Snapshot '{snapshot_id}' not found in {self.root}")
+
+        meta = self.read_meta(snapshot_id)
+        mmap_mode = 'r' if mmap else None
+        columns = {}
+        for column in meta['columns']:
+            values = np.load(self._path(snapshot_id, column['file']),
+                             mmap_mode=mmap_mode, allow_pickle=False)
+            if column['kind'] == 'category':
+                values = pd.Categorical.from_codes(values, column['categories'])
+            columns[column['name']] = values
+        # copy=False keeps each column backed by its memory-mapped file
+        df = pd.DataFrame(columns, copy=False)
+        # Travels with slices of the frame, so derived charts and caches can tell snapshots apart
+        df.attrs['snapshot_id'] = snapshot_id
+        return df
+
+    def prune(self):
+        """Delete the oldest snapshots beyond the retention limit"""
+        snapshots = self.list_snapshots()
+        for snapshot_id in snapshots[:max(0, len(snapshots) - self.keep)]:
+            shutil.rmtree(self._path(snapshot_id), ignore_errors=True)
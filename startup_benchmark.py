@@ -0,0 +1,97 @@
+"""Start-up benchmark for the explorer
+
+Imports main.py in fresh interpreters under ``python -X importtime`` and checks
+the median import time against a budget, and that none of the lazily loaded
+packages crept back onto the start-up path. With --first-paint it also times
+process start to the first painted window (needs a display).
+
+    python startup_benchmark.py [--runs 5] [--budget 600] [--first-paint]
+
+Exits with status 1 when the budget is exceeded or a lazy package is imported.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+IMPORT_BUDGET_MS = 600
+# Packages that must only load when a chart is drawn or fresh data is fetched
+LAZY_MODULES = ('matplotlib', 'selenium', 'requests', 'PIL', 'lxml', 'IPython')
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+FIRST_PAINT_SCRIPT = """
+import tkinter as tk
+import main
+root = tk.Tk()
+app = main.PopulationExplorerApp(root)
+root.update()
+print('painted', flush=True)
+root.destroy()
+"""
+
+
+def import_profile(module: str = 'main') -> Tuple[float, Dict[str, Tuple[float, int]]]:
+    """Import a module in a fresh interpreter and get (total ms, {module: (cumulative ms, depth)})"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=HERE, capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(cumulative) / 1000.0, depth)
+    return modules[module][0], modules
+
+
+def first_paint_ms() -> float:
+    """Wall time from starting a new interpreter to the explorer's first painted window"""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-c', FIRST_PAINT_SCRIPT], cwd=HERE,
+                               stdout=subprocess.PIPE, text=True)
+    for line in process.stdout:
+        if line.strip() == 'painted':
+            break
+    elapsed = (time.perf_counter() - start) * 1000.0
+    process.wait()
+    return elapsed
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help="fresh interpreters to time (default 5)")
+    parser.add_argument('--budget', type=float, default=IMPORT_BUDGET_MS,
+                        help=f"median import budget in ms (default {IMPORT_BUDGET_MS})")
+    parser.add_argument('--top', type=int, default=10, help="slowest direct imports to list")
+    parser.add_argument('--first-paint', action='store_true', help="also time the first window paint")
+    args = parser.parse_args(argv)
+
+    import_profile()  # warm the bytecode cache so compiling .pyc files is not counted
+    totals = []
+    for _ in range(args.runs):
+        total, modules = import_profile()
+        totals.append(total)
+    median = statistics.median(totals)
+
+    print(f"import main: median {median:.0f} ms over {args.runs} runs "
+          f"(min {min(totals):.0f}, max {max(totals):.0f}, budget {args.budget:.0f})")
+    direct = sorted(((ms, name) for name, (ms, depth) in modules.items() if depth == 1), reverse=True)
+    for ms, name in direct[:args.top]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    leaked = sorted({name.split('.')[0] for name in modules} & set(LAZY_MODULES))
+    if leaked:
+        print(f"Lazily loaded packages imported at start-up: {', '.join(leaked)}")
+
+    if args.first_paint:
+        paints = [first_paint_ms() for _ in range(args.runs)]
+        print(f"first paint: median {statistics.median(paints):.0f} ms over {args.runs} runs")
+
+    return 1 if leaked or median > args.budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import pickle
+import threading
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from animation import (BarRace, ChartAnimation, ScatterAnimation, export_animation, interpolate, keyframes,
+                       snapshot_timeline)
+from snapshot_store import SnapshotStore
+from visualizer import PopulationVisualizer
+
+
+def test_keyframes(history):
+    times, names, grids = keyframes(history, ['Population'], countries=['India'])
+    assert times.tolist() == [2000, 2010, 2020]
+    assert names == ['India']
+    assert grids['Population'][:, 0].tolist() == [1.06e9, 1.24e9, 1.43e9]
+    with pytest.raises(ValueError):
+        keyframes(history, ['Density'])
+    with pytest.raises(ValueError):
+        keyframes(history, ['Population'], countries=['Atlantis'])
+
+
+def test_interpolate():
+    values = np.array([[0.0, 10.0], [4.0, 30.0]])
+    frames = interpolate(values, 4)
+    assert frames.shape == (5, 2)
+    np.testing.assert_allclose(frames[:, 0], [0, 1, 2, 3, 4])
+    np.testing.assert_allclose(frames[-1], values[-1])
+    np.testing.assert_array_equal(interpolate(values[:1], 4), values[:1])
+
+
+def test_chart_animation_is_abstract():
+    with pytest.raises(TypeError):
+        ChartAnimation(np.array([2000.0]), 'Year', 1)
+
+
+def test_bar_race(history):
+    race = BarRace(history, 'Population', top_n=5, steps=4)
+    assert race.top_n == 2
+    assert race.n_frames == 9
+    assert race.frame_label(5) == '2010'
+    fig = plt.figure()
+    race.setup(fig, PopulationVisualizer())
+    assert race.update(race.n_frames - 1)
+    # China leads in 2000, India by 2020
+    assert race.countries == ['China', 'India']
+    assert race.positions[0].tolist() == [0, 1] and race.positions[-1].tolist() == [1, 0]
+    plt.close(fig)
+
+
+def test_scatter_animation_pickles_without_artists(history):
+    animation = ScatterAnimation(history, 'Median_Age', 'Population', steps=2)
+    fig = plt.figure()
+    animation.setup(fig, PopulationVisualizer())
+    animation.update(1)
+    copy = pickle.loads(pickle.dumps(animation))
+    assert copy.artists == [] and not hasattr(copy, 'ax')
+    np.testing.assert_array_equal(copy.x, animation.x)
+    plt.close(fig)
+
+
+def test_snapshot_timeline(tmp_path, countries):
+    store = SnapshotStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        snapshot_timeline(store)
+    store.save(countries)
+    timeline = snapshot_timeline(store)
+    assert timeline['Snapshot'].nunique() == 1
+    assert len(timeline) == len(countries)
+
+
+def test_export_gif(tmp_path, history):
+    pytest.importorskip('PIL')
+    path = str(tmp_path / 'race.gif')
+    progress = []
+    frames = export_animation(BarRace(history, 'Population', steps=2), path, size=(160, 120), dpi=40,
+                              max_workers=1, progress_callback=lambda done, total: progress.append(done))
+    assert frames == 5 and progress[-1] == 5
+    from PIL import Image
+    with Image.open(path) as gif:
+        assert gif.n_frames == 5
+    with pytest.raises(ValueError):
+        export_animation(BarRace(history, 'Population'), str(tmp_path / 'race.avi'))
+
+
+def test_export_cancelled(tmp_path, history):
+    pytest.importorskip('PIL')
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(InterruptedError):
+        export_animation(BarRace(history, 'Population', steps=8), str(tmp_path / 'race.gif'),
+                         size=(160, 120), dpi=40, max_workers=1, cancel_event=cancel)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,27 @@
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from chart_cache import ChartCache, figure_nbytes
+
+
+def test_chart_cache_evicts_least_recently_used():
+    released = []
+    cache = ChartCache(budget_mb=3 / (1024 * 1024), release=released.append)
+    cache.put('a', 'A', 1)
+    cache.put('b', 'B', 1)
+    cache.put('c', 'C', 1)
+    assert cache.get('a') == 'A'
+    cache.put('d', 'D', 1)
+    assert released == ['B']
+    assert 'b' not in cache and len(cache) == 3
+    # The newest entry is kept even when it alone is over budget
+    cache.put('e', 'E', 10)
+    assert list(cache._entries) == ['e'] and cache.nbytes == 10
+    cache.discard('e')
+    assert released[-1] == 'E' and cache.nbytes == 0
+
+
+def test_figure_nbytes():
+    fig = plt.figure(figsize=(2, 1), dpi=100)
+    assert figure_nbytes(fig) == 200 * 100 * 4
+    plt.close(fig)
@@ -0,0 +1,78 @@
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from chart_spec import METRICS, ChartSpec, grid_shape
+from density import bin_points, rows_key
+from scatter_labels import GridIndex, ScatterLabeler, label_boxes, select_labels
+from visualizer import chart_rows
+
+
+@pytest.mark.parametrize('panels, shape', [(1, (1, 1)), (2, (1, 2)), (4, (2, 2)), (10, (3, 4))])
+def test_grid_shape(panels, shape):
+    assert grid_shape(panels) == shape
+
+
+def test_chart_spec_is_hashable():
+    spec = ChartSpec('multi', tuple(METRICS[:2]), ('India', 'China'))
+    assert spec == ChartSpec('multi', ('Population', 'Yearly_Change'), ('India', 'China'), 0, 'data')
+    assert {spec: 1}[ChartSpec(*spec)] == 1
+    assert spec._replace(source='history') != spec
+
+
+def test_chart_rows(countries):
+    assert chart_rows(ChartSpec('top', ('Median_Age',), top_n=2), countries)['Country'].tolist() == \
+        ['South Korea', 'China']
+    picked = chart_rows(ChartSpec('single', ('Population',), ('Iceland', 'Atlantis', 'India')), countries)
+    assert picked['Country'].tolist() == ['Iceland', 'India']
+
+
+def test_bin_points():
+    x = np.array([0.0, 1.0, 1.0, np.nan, 2.0])
+    y = np.array([0.0, 1.0, 1.0, 5.0, np.inf])
+    grid = bin_points(x, y, bins=2)
+    assert grid.points == 3
+    assert grid.counts.sum() == 3
+    assert grid.extent == (0.0, 1.0, 0.0, 1.0)
+    assert bin_points(np.array([3.0]), np.array([3.0])).extent[0] < 3.0
+
+
+def test_rows_key(countries):
+    assert rows_key(countries) == rows_key(countries.copy())
+    assert rows_key(countries.iloc[[0, 2]]) != rows_key(countries.iloc[[0, 3]])
+
+
+def test_grid_index():
+    points = np.array([[0.0, 0.0], [10.0, 0.0], [100.0, 100.0], [np.nan, 1.0]])
+    index = GridIndex(points, cell_size=24)
+    assert sorted(index.in_box(-1, -1, 20, 20).tolist()) == [0, 1]
+    assert index.nearest(8, 1) == 1
+    assert index.nearest(50, 50) is None
+
+
+def test_select_labels_skips_overlaps():
+    boxes = np.array([[0, 0, 10, 10], [5, 5, 15, 15], [20, 0, 30, 10], [np.nan, 0, 1, 1]], dtype=float)
+    assert select_labels(boxes).tolist() == [0, 2]
+    assert select_labels(boxes, priority=[1, 0, 2, 3]).tolist() == [1, 2]
+    assert select_labels(boxes, bounds=(0, 0, 25, 25)).tolist() == [0]
+    widths = label_boxes(np.zeros((2, 2)), ['ab', 'abcd'], fontsize=10, dpi=72)
+    assert widths[1, 2] - widths[1, 0] == 2 * (widths[0, 2] - widths[0, 0])
+
+
+def test_scatter_labeler(countries):
+    fig, ax = plt.subplots(figsize=(6, 4), dpi=100)
+    x, y = countries['Median_Age'].to_numpy(), countries['Fertility_Rate'].to_numpy()
+    ax.scatter(x, y)
+    fig.canvas.draw()
+    labeler = ScatterLabeler(ax, x, y, countries['Country'].tolist())
+    labeler.relabel()
+    assert 0 < len(labeler.shown) < len(countries)
+    assert len(countries) - 1 not in labeler.shown  # Holy See has no coordinates
+
+    px, py = ax.transData.transform((x[1], y[1]))
+    event = type('Event', (), {'inaxes': ax, 'x': px, 'y': py})()
+    assert labeler.on_move(event)
+    assert labeler.hover.get_text() == 'China'
+    assert not labeler.on_move(event)
+    plt.close(fig)
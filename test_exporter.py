@@ -0,0 +1,79 @@
+import gzip
+import os
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+from exporter import available_formats, export_frame, export_snapshots, format_for_path, frame_chunks
+from snapshot_store import SnapshotStore
+
+
+def test_format_for_path():
+    assert format_for_path('data.CSV') == 'csv'
+    assert format_for_path('data.csv.gz') == 'csv.gz'
+    assert format_for_path('data.xlsx') == 'xlsx'
+    with pytest.raises(ValueError):
+        format_for_path('data.txt')
+    assert {'csv', 'csv.gz'} <= set(available_formats())
+
+
+def test_csv_round_trip(tmp_path, countries):
+    path = str(tmp_path / 'countries.csv')
+    progress = []
+    assert export_frame(countries, path, chunk_rows=4, progress_callback=lambda done, total: progress.append(done)) == 9
+    assert progress == [4, 8, 9]
+    exported = pd.read_csv(path)
+    assert exported['Country'].tolist() == countries['Country'].tolist()
+    assert exported['Median_Age'].iloc[1] == 40.1
+    assert not os.path.exists(path + '.part')
+
+
+def test_gzip_export(tmp_path, countries):
+    path = str(tmp_path / 'countries.csv.gz')
+    export_frame(countries, path)
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        assert f.readline().startswith('Rank,#,Country,Population')
+
+def test_chunks_have_plain_columns(countries):
+    small = countries.astype({'Country': 'category', 'Rank': np.int8})
+    chunk = next(frame_chunks(small, chunk_rows=3))
+    assert chunk['Country'].dtype == object
+    assert chunk['Rank'].dtype == np.int64
+
+
+def test_cancelled_export_leaves_no_file(tmp_path, countries):
+    out_dir = tmp_path / 'out'
+    out_dir.mkdir()
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(InterruptedError):
+        export_frame(countries, str(out_dir / 'countries.csv'), cancel_event=cancel)
+    assert os.listdir(str(out_dir)) == []
+
+
+def test_export_snapshots(tmp_path, countries):
+    store = SnapshotStore(str(tmp_path / 'snapshots'))
+    first = store.save(countries.head(3))
+    second = store.save(countries.drop(columns='Median_Age'))
+    path = str(tmp_path / 'all.csv')
+    assert export_snapshots(store, path, chunk_rows=2) == 3 + len(countries)
+    exported = pd.read_csv(path)
+    assert exported['Snapshot'].unique().tolist() == sorted([first, second])
+    assert exported.loc[exported['Snapshot'] == second, 'Median_Age'].isna().all()
+
+
+def test_excel_export(tmp_path, countries):
+    if 'xlsx' not in available_formats():
+        pytest.skip("needs xlsxwriter or openpyxl")
+    path = str(tmp_path / 'countries.xlsx')
+    export_frame(countries, path)
+    assert pd.read_excel(path)['Country'].tolist() == countries['Country'].tolist()
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'feather'])
+def test_arrow_export(tmp_path, countries, fmt):
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / f'countries.{fmt}')
+    export_frame(countries, path, chunk_rows=4)
+    exported = pd.read_parquet(path) if fmt == 'parquet' else pd.read_feather(path)
+    assert exported['Population'].tolist() == countries['Population'].tolist()
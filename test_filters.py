@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from filters import FilterEngine, compile_filter
+
+
+def countries_matching(countries, expression):
+    return countries['Country'].iloc[FilterEngine(countries).positions(expression)].tolist()
+
+
+def test_comparisons(countries):
+    assert countries_matching(countries, 'Population > 1e9') == ['India', 'China']
+    assert countries_matching(countries, 'Density >= 500') == ['South Korea', 'Holy See']
+
+
+def test_chained_and_boolean(countries):
+    assert countries_matching(countries, '100 < Density < 200') == ['China', 'Indonesia', 'Türkiye']
+    assert countries_matching(countries, 'Median_Age > 40 or Fertility_Rate > 3') == ['China', 'Pakistan',
+                                                                                     'South Korea']
+    assert countries_matching(countries, 'Density > 100 and not (Median_Age < 35)') == ['China', 'South Korea']
+
+
+def test_missing_values_never_match(countries):
+    assert 'Holy See' not in countries_matching(countries, 'Median_Age < 100')
+    assert 'Holy See' not in countries_matching(countries, 'not Median_Age > 100')
+
+
+def test_invalid_filters(countries):
+    engine = FilterEngine(countries)
+    with pytest.raises(ValueError):
+        engine.mask('Population >')
+    with pytest.raises(ValueError):
+        engine.mask('Altitude > 3')
+    with pytest.raises(ValueError):
+        engine.mask('Country == 1')
+
+
+def test_masks_are_cached(countries):
+    engine = FilterEngine(countries)
+    first = engine.mask('Density > 100')
+    assert engine.mask('Density>100') is first
+    assert not first.flags.writeable
+    assert compile_filter('Density > 100').canonical == compile_filter('Density>100').canonical
+
+
+def test_scraper_filter(scraper):
+    assert scraper.filter_countries('World_Share > 17')['Country'].tolist() == ['India', 'China']
+    assert np.array_equal(scraper.get_filter_engine().positions('Population < 1000'), [len(scraper.data) - 1])
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+from grid_model import GridModel, format_column
+
+
+def test_format_column(countries):
+    assert format_column(countries['Population'])[0] == '1,463,865,525'
+    assert format_column(countries['Yearly_Change'])[1] == '-0.23%'
+    assert format_column(countries['Median_Age']).tolist()[-2:] == ['36.7', 'N/A']
+    assert format_column(pd.Series(['a', None], name='Country')).tolist() == ['a', 'N/A']
+
+
+def test_grid_model_sorting(countries):
+    model = GridModel(countries)
+    assert len(model) == len(countries)
+    descending = model.order('Median_Age', descending=True)
+    assert countries['Country'].iloc[descending].tolist()[:2] == ['South Korea', 'China']
+    # Missing values sort last in both directions
+    assert descending[-1] == model.order('Median_Age')[-1] == len(countries) - 1
+    assert countries['Country'].iloc[model.order('Country')].tolist()[0] == 'China'
+    assert model.order('Density') is model.order('Density')
+    assert model.rows(np.array([1]))[0][model.columns.index('Country')] == 'China'
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from conftest import COUNTRY_ROWS, country_table_html
+from history_crawler import country_slug, normalize_history_column, parse_country_links, parse_history_tables
+from scraper import extract_datatable_html, normalize_column_name, parse_datatable
+
+
+def test_parse_datatable_reads_every_row():
+    df = parse_datatable(country_table_html())
+    assert len(df) == len(COUNTRY_ROWS)
+    assert df.iloc[0, 1] == 'India'
+
+
+def test_parse_datatable_without_table():
+    with pytest.raises(ValueError):
+        parse_datatable('<html><body><p>Just a moment...</p></body></html>')
+
+
+def test_extract_datatable_html_round_trips():
+    table_html = extract_datatable_html(country_table_html())
+    assert table_html.startswith('<table')
+    assert len(parse_datatable(table_html)) == len(COUNTRY_ROWS)
+
+
+@pytest.mark.parametrize('header, column', [
+    ('Country (or dependency)', 'Country'),
+    ('Population (2030)', 'Population'),
+    ('Yearly  %\nChange', 'Yearly_Change'),
+    ('Fert. Rate', 'Fertility_Rate'),
+    ('Urban Pop %', 'Urban_Population_Percent'),
+])
+def test_normalize_column_name(header, column):
+    assert normalize_column_name(header) == column
+
+
+def test_clean_data_converts_numbers(countries):
+    assert countries['Rank'].tolist() == list(range(1, len(COUNTRY_ROWS) + 1))
+    china = countries.iloc[1]
+    assert china['Population'] == 1_416_096_094
+    assert china['Yearly_Change'] == -0.23
+    assert china['Net_Migration'] == -268_126
+    assert china['Median_Age'] == 40.1
+    # 'N.A.' becomes NaN
+    assert np.isnan(countries.iloc[-1]['Fertility_Rate'])
+
+
+HISTORY_PAGE = '''<html><body>
+<table><tr><th>Year</th><th>Population</th><th>Yearly % Change</th><th>Yearly Change</th>
+<th>Migrants (net)</th><th>Median Age</th></tr>
+<tr><td>2020</td><td>1,396,387,127</td><td>0.92 %</td><td>12,599,000</td><td>−300,000</td><td>27.3</td></tr>
+<tr><td>2010</td><td>1,240,613,620</td><td>1.50 %</td><td>18,000,000</td><td>−500,000</td><td>24.9</td></tr></table>
+<table><tr><th>Year</th><th>Population</th><th>Yearly % Change</th></tr>
+<tr><td>2030</td><td>1,525,000,000</td><td>0.70 %</td></tr>
+<tr><td>2020</td><td>1,396,387,127</td><td>0.92 %</td></tr></table>
+</body></html>'''
+
+
+def test_parse_history_tables_merges_tables():
+    df = parse_history_tables(HISTORY_PAGE)
+    assert df['Year'].tolist() == [2010, 2020, 2030]
+    assert df['Net_Change'].iloc[0] == 18_000_000
+    assert df['Yearly_Change'].iloc[-1] == 0.7
+    assert df['Net_Migration'].iloc[1] == -300_000
+    assert np.isnan(df['Median_Age'].iloc[-1])
+
+
+def test_normalize_history_column():
+    assert normalize_history_column('Yearly % Change') == 'Yearly_Change'
+    assert normalize_history_column('Yearly Change') == 'Net_Change'
+    assert normalize_history_column("Country's Share of World Pop") == 'World_Share'
+
+
+def test_country_links_and_slugs():
+    links = parse_country_links(country_table_html().replace(
+        '<td>India</td>', '<td><a href="/world-population/india-population/">India</a></td>'))
+    assert links == {'India': 'https://www.worldometers.info/world-population/india-population/'}
+    assert country_slug("Côte d'Ivoire").endswith('/c-te-divoire-population/')
+    assert country_slug('United States') == 'https://www.worldometers.info/world-population/united-states-population/'
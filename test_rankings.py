@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from rankings import MetricRankings
+
+
+def test_top_and_bottom(countries):
+    rankings = MetricRankings(countries)
+    names = countries['Country']
+    assert names.iloc[rankings.top('Population', 3)].tolist() == ['India', 'China', 'United States']
+    assert names.iloc[rankings.bottom('Density', 2)].tolist() == ['Iceland', 'United States']
+    # Missing values are never ranked
+    assert len(rankings.top('Median_Age', 100)) == len(countries) - 1
+
+
+def test_matches_nlargest(countries):
+    rankings = MetricRankings(countries)
+    for metric in rankings.metrics:
+        expected = countries.nlargest(4, metric).index.tolist()
+        assert countries.index[rankings.top(metric, 4)].tolist() == expected
+
+
+def test_dense_rank_and_percentile(countries):
+    rankings = MetricRankings(countries)
+    # The United States, Türkiye and Iceland share a fertility rate of 1.6
+    assert rankings.rank_of('Population', 0) == 1
+    assert rankings.rank_of('Fertility_Rate', 2) == rankings.rank_of('Fertility_Rate', 5)
+    assert rankings.rank_of('Fertility_Rate', len(countries) - 1) is None
+    assert rankings.percentile('Population', len(countries) - 1) == 0.0
+    assert rankings.percentile('Population', 0) == pytest.approx(100.0 * 8 / 9)
+
+
+def test_rank_column_is_not_precomputed(countries):
+    rankings = MetricRankings(countries)
+    assert 'Rank' not in rankings
+    with pytest.raises(ValueError):
+        rankings.top('Rank', 3)
+
+
+def test_scraper_top_countries(scraper):
+    assert scraper.get_top_countries(2, 'Median_Age')['Country'].tolist() == ['South Korea', 'China']
+    assert scraper.get_bottom_countries(1, 'Population')['Country'].tolist() == ['Holy See']
+    # Columns without a precomputed ranking fall back to sorting
+    assert scraper.get_top_countries(2, 'Rank')['Rank'].tolist() == [9, 8]
+    assert scraper.get_bottom_countries(2, 'Rank')['Rank'].tolist() == [1, 2]
+    with pytest.raises(ValueError):
+        scraper.get_top_countries(2, 'Altitude')
+    assert scraper.get_country_rank('usa', 'Population')['rank'] == 3
+    assert scraper.get_country_rank('Atlantis') is None
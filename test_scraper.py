@@ -18,7 +18,7 @@ def test_scraper():
         
         # Test search functionality
         print("\nTesting country search...")
-        test_countries = ['Indonesia', 'China', 'India']
+        test_countries = ['Indonesia', 'China', 'India', 'USA']
         for country in test_countries:
             result = scraper.search_country(country)
             if result is not None:
@@ -27,6 +27,11 @@ def test_scraper():
             else:
                 print(f"\nNo data found for {country}")
         
+        # Test bulk lookup
+        print("\nTesting bulk country lookup...")
+        comparison = scraper.get_countries(test_countries)
+        print(comparison[['Country', 'Population']])
+        
         # Test top countries
         print("\nTesting top countries by population:")
         top_countries = scraper.get_top_countries(n=5, by='Population')
@@ -0,0 +1,57 @@
+from country_index import CountryIndex, normalize_name
+from fuzzy_match import TrigramIndex, edit_distance
+from prefix_index import PrefixIndex
+
+NAMES = ['India', 'China', 'United States', 'Türkiye', 'South Korea', 'South Sudan', 'Iceland']
+
+
+def test_normalize_name():
+    assert normalize_name('  Türkiye ') == 'turkiye'
+    assert normalize_name('Bosnia & Herzegovina') == 'bosnia and herzegovina'
+    assert normalize_name("Côte d'Ivoire") == 'cote d ivoire'
+
+
+def test_country_index_lookup_and_aliases():
+    index = CountryIndex(NAMES)
+    assert index.lookup('india') == 0
+    assert index.lookup('USA') == 2
+    assert index.lookup('Turkey') == 3
+    assert index.lookup('Atlantis') is None
+    assert index.search('korea') == 4
+
+
+def test_country_index_lookup_many():
+    index = CountryIndex(NAMES)
+    assert index.lookup_many(['China', 'Atlantis', 'us']).tolist() == [1, -1, 2]
+    assert CountryIndex([]).lookup_many(['China']).tolist() == [-1]
+
+
+def test_edit_distance():
+    assert edit_distance('kitten', 'sitting') == 3
+    assert edit_distance('', 'abc') == 3
+
+
+def test_trigram_suggestions():
+    index = TrigramIndex(CountryIndex(NAMES).entries())
+    assert index.query('Indai')[0][0] == 0
+    assert index.query('Icelnd')[0][0] == 6
+    assert index.query('zzzz') == []
+    targets = [target for target, _ in index.query('South', k=5)]
+    assert len(targets) == len(set(targets))
+
+
+def test_prefix_completion():
+    index = PrefixIndex(CountryIndex(NAMES).entries())
+    # Names starting with the text come before inner-word matches
+    assert index.complete('sou') == [4, 5]
+    assert index.complete('kor') == [4]
+    assert index.complete('i', k=2) == [0, 6]
+    assert index.complete('') == []
+
+
+def test_scraper_lookups(scraper):
+    assert scraper.search_country('Turkey')['Country'] == 'Türkiye'
+    assert scraper.get_countries(['USA', 'Atlantis', 'china'])['Country'].tolist() == ['United States', 'China']
+    assert scraper.suggest_countries('Pakistn')[0] == 'Pakistan'
+    assert scraper.complete_countries('in') == ['India', 'Indonesia']
+    assert scraper.get_country_index().lookup_many(['India']).tolist() == [0]
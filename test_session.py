@@ -0,0 +1,16 @@
+import json
+from session import load_session, save_session
+
+
+def test_session_round_trip(tmp_path):
+    path = str(tmp_path / 'session.json')
+    assert load_session(path) == {}
+    save_session({'snapshot_id': 'snap-1', 'countries': ['India']}, path)
+    assert load_session(path)['countries'] == ['India']
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': -1, 'countries': ['India']}, f)
+    assert load_session(path) == {}
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{not json')
+    assert load_session(path) == {}
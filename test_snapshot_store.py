@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fetch_cache import FetchCache, content_hash
+from snapshot_store import SnapshotStore, downcast_frame, frame_hash
+
+
+def test_round_trip(tmp_path, countries):
+    store = SnapshotStore(str(tmp_path))
+    snapshot_id = store.save(countries, source='fixture')
+    loaded = store.load(snapshot_id)
+    assert loaded.attrs['snapshot_id'] == snapshot_id
+    assert loaded.iloc[2:4].attrs['snapshot_id'] == snapshot_id
+    assert store.read_meta(snapshot_id)['source'] == 'fixture'
+    assert loaded['Country'].astype(str).tolist() == countries['Country'].tolist()
+    for column in countries.columns.drop(['Country', '#']):
+        np.testing.assert_array_equal(loaded[column].to_numpy(dtype=np.float64, na_value=np.nan),
+                                      countries[column].to_numpy(dtype=np.float64, na_value=np.nan))
+    # Floats keep their exact values
+    assert loaded['Median_Age'].dtype == np.float64
+    assert loaded['Median_Age'].iloc[1] == 40.1
+
+
+def test_save_is_idempotent(tmp_path, countries):
+    store = SnapshotStore(str(tmp_path))
+    assert store.save(countries) == store.save(countries)
+    assert store.list_snapshots() == [store.latest_id()]
+
+
+def test_load_missing_snapshot(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    assert store.latest_id() is None
+    with pytest.raises(FileNotFoundError):
+        store.load()
+
+
+def test_prune_keeps_the_newest(tmp_path, countries):
+    store = SnapshotStore(str(tmp_path), keep=2)
+    ids = [store.save(countries.head(n)) for n in (3, 4, 5)]
+    assert store.list_snapshots() == sorted(ids)[-2:]
+
+
+def test_downcast_frame(countries):
+    small = downcast_frame(countries)
+    assert isinstance(small['Country'].dtype, pd.CategoricalDtype)
+    assert small['Rank'].dtype == np.int8
+    assert frame_hash(small) == frame_hash(countries)
+
+
+def test_fetch_cache(tmp_path):
+    cache = FetchCache(str(tmp_path), ttl=60)
+    url = 'https://example.com/table'
+    assert cache.get_entry(url) is None
+    cache.store(url, 'snap-1', content_hash('<table/>'), etag='"abc"')
+    entry = cache.get_entry(url)
+    assert entry['snapshot_id'] == 'snap-1'
+    assert cache.is_fresh(entry)
+    assert cache.validators(entry) == {'If-None-Match': '"abc"'}
+
+    entry['fetched_at'] = 0
+    assert not cache.is_fresh(entry)
+    cache.touch(url, entry, last_modified='Mon, 01 Jan 2024 00:00:00 GMT')
+    entry = cache.get_entry(url)
+    assert cache.is_fresh(entry)
+    assert set(cache.validators(entry)) == {'If-None-Match', 'If-Modified-Since'}
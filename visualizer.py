@@ -1,52 +1,267 @@
+import matplotlib
 import matplotlib.pyplot as plt
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Optional
 import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import LogNorm
+from matplotlib.figure import Figure
+from animation import DEFAULT_FPS, BarRace, ChartAnimation, ScatterAnimation, play
+from chart_cache import ChartCache, figure_nbytes
+from chart_spec import ChartSpec, METRICS, grid_shape
+from density import DENSITY_BINS, DENSITY_THRESHOLD, DensityGrid, bin_points, rows_key
+from rankings import MetricRankings
+from scatter_labels import ScatterLabeler
+
+# Memory budget for the open pyplot figures tracked for reuse
+FIGURE_BUDGET_MB = 256
+# Memory budget for binned density grids, kept per metric pair and snapshot
+DENSITY_BUDGET_MB = 32
+# Bars get value labels only while there are few enough to read
+MAX_BAR_LABELS = 40
+# Category axes with more names than this label every k-th one
+MAX_TICK_LABELS = 60
+COUNT_METRICS = ['Population', 'Net_Change', 'Land_Area', 'Net_Migration']
+PERCENT_METRICS = ['Yearly_Change', 'Urban_Population_Percent', 'World_Share']
+
+
+def chart_rows(spec: ChartSpec, data: pd.DataFrame, rankings: Optional[MetricRankings] = None) -> pd.DataFrame:
+    """Pick the rows a chart shows from the full table, in display order"""
+    if spec.kind == 'top':
+        metric = spec.metrics[0]
+        if rankings is not None and metric in rankings:
+            return data.iloc[rankings.top(metric, spec.top_n)]
+        return data.nlargest(spec.top_n, metric)
+    if not spec.countries:
+        return data
+    positions = pd.Index(data['Country'].astype(str)).get_indexer(list(spec.countries))
+    return data.iloc[positions[positions >= 0]]
+
 
 class PopulationVisualizer:
     def __init__(self):
         plt.style.use('seaborn-v0_8' if 'seaborn-v0_8' in plt.style.available else 'default')
+        # Figures by chart key. Every cached figure has an open window (closing one drops it),
+        # so eviction only stops reusing a figure and never closes a window the user still has
+        self.figures = ChartCache(FIGURE_BUDGET_MB)
+        self.density_grids = ChartCache(DENSITY_BUDGET_MB)
+        # Running animations by figure number; playback stops if they are garbage collected
+        self.animations = {}
+    
+    @staticmethod
+    def _chart_key(data: pd.DataFrame, *parts) -> Optional[tuple]:
+        """Cache key for a chart of a stored snapshot; None (no caching) for other data"""
+        version = data.attrs.get('snapshot_id')
+        return None if version is None else parts + (version,)
+    
+    def _reshow(self, key: Optional[tuple]) -> bool:
+        """Bring back a cached figure that is still open; returns False if it has to be drawn"""
+        fig = self.figures.get(key) if key is not None else None
+        if fig is None:
+            return False
+        if not plt.fignum_exists(fig.number):
+            self.figures.discard(key, release=False)
+            return False
+        plt.figure(fig.number)
+        plt.show()
+        return True
+    
+    def _show(self, fig, key: Optional[tuple]):
+        """Lay out and show a new figure, keeping it for reuse until it is closed or evicted"""
+        if key is not None:
+            self.figures.put(key, fig, figure_nbytes(fig))
+            fig.canvas.mpl_connect('close_event', lambda event: self._forget(key, fig))
+        fig.tight_layout()
+        plt.show()
+    
+    def _forget(self, key: tuple, fig):
+        """Drop a closed figure, unless it was evicted and its key now holds a newer one"""
+        if self.figures.get(key) is fig:
+            self.figures.discard(key, release=False)
+    
+    def draw_chart(self, fig: Figure, spec: ChartSpec, data: pd.DataFrame):
+        """Draw the chart described by spec onto fig, without going through pyplot
+        
+        data holds the rows to plot, in display order (see chart_rows). Safe to call from a worker
+        process on a Figure backed by FigureCanvasAgg.
+        """
+        countries = data['Country'].astype(str).tolist()
+        labeler = None
+        
+        if spec.kind == 'single':
+            metric = spec.metrics[0]
+            ax = fig.add_subplot(111)
+            self._draw_bars(ax, countries, data[metric], metric, f'{metric} Comparison',
+                            self.colors('Set3', len(countries)), label_size=10)
+        elif spec.kind == 'multi':
+            self.draw_small_multiples(fig, data, spec.metrics)
+        elif spec.kind == 'scatter':
+            labeler = self.draw_scatter(fig.add_subplot(111), data, *spec.metrics)
+        elif spec.kind == 'top':
+            metric = spec.metrics[0]
+            ax = fig.add_subplot(111)
+            self._draw_bars(ax, countries, data[metric], metric, f'Top {len(countries)} Countries by {metric}',
+                            self.colors('viridis', len(countries), spread=True), label_size=10,
+                            horizontal=True, title_size=16, axis_size=12)
+        else:
+            raise ValueError(f"Unknown chart kind '{spec.kind}'")
+        
+        fig.tight_layout()
+        if labeler is not None:
+            labeler.relabel()  # labels are picked in the final display coordinates
+    
+    def density_grid(self, data: pd.DataFrame, x_metric: str, y_metric: str,
+                     bins: int = DENSITY_BINS) -> DensityGrid:
+        """Binned point counts of two metrics, computed once per metric pair and snapshot"""
+        key = self._chart_key(data, 'density', x_metric, y_metric, bins, rows_key(data))
+        grid = self.density_grids.get(key) if key is not None else None
+        if grid is None:
+            grid = bin_points(data[x_metric].to_numpy(dtype=float, na_value=np.nan),
+                              data[y_metric].to_numpy(dtype=float, na_value=np.nan), bins)
+            if key is not None:
+                self.density_grids.put(key, grid, grid.nbytes)
+        return grid
+    
+    def draw_density(self, ax, grid: DensityGrid, x_metric: str, y_metric: str):
+        """Draw binned point counts as a log-scaled raster with a colour bar"""
+        image = ax.imshow(np.ma.masked_equal(grid.counts.T, 0), origin='lower', extent=grid.extent,
+                          aspect='auto', interpolation='nearest', cmap='viridis',
+                          norm=LogNorm(vmin=1, vmax=max(int(grid.counts.max()), 1)))
+        ax.figure.colorbar(image, ax=ax, label='Points per bin')
+        ax.set_title(f'{y_metric} vs {x_metric} ({grid.points:,} points)', fontsize=16, fontweight='bold', pad=20)
+        ax.set_xlabel(self.metric_label(x_metric), fontsize=12, fontweight='bold')
+        ax.set_ylabel(self.metric_label(y_metric), fontsize=12, fontweight='bold')
+        ax.grid(True, alpha=0.3, linestyle='--')
+    
+    def draw_scatter(self, ax, data: pd.DataFrame, x_metric: str, y_metric: str) -> Optional[ScatterLabeler]:
+        """Scatter every row of data; labels are added by the returned labeler once the layout is final
+        
+        Above DENSITY_THRESHOLD rows (e.g. country-by-year history) a density raster is drawn
+        instead, and there is no labeler.
+        """
+        if len(data) > DENSITY_THRESHOLD:
+            self.draw_density(ax, self.density_grid(data, x_metric, y_metric), x_metric, y_metric)
+            return None
+        
+        x_values = data[x_metric].to_numpy(dtype=float, na_value=np.nan)
+        y_values = data[y_metric].to_numpy(dtype=float, na_value=np.nan)
+        # Smaller markers once there are too many points to tell big ones apart
+        size = 100 if len(data) <= 50 else 40
+        ax.scatter(x_values, y_values, c=np.arange(len(data)), cmap='viridis', alpha=0.7, s=size, edgecolor='black')
+        
+        x_label, y_label = self.metric_label(x_metric), self.metric_label(y_metric)
+        ax.set_title(f'{y_metric} vs {x_metric}', fontsize=16, fontweight='bold', pad=20)
+        ax.set_xlabel(x_label, fontsize=12, fontweight='bold')
+        ax.set_ylabel(y_label, fontsize=12, fontweight='bold')
+        ax.grid(True, alpha=0.3, linestyle='--')
         
+        countries = data['Country'].astype(str).tolist()
+        return ScatterLabeler(ax, x_values, y_values, countries,
+                              self._hover_texts(countries, x_values, x_metric, y_values, y_metric))
+    
+    def _hover_texts(self, names: List[str], x_values, x_metric: str, y_values, y_metric: str) -> List[str]:
+        """Tooltip text for every point: the name and both formatted values"""
+        x_text = self.format_numbers(x_values, x_metric)
+        y_text = self.format_numbers(y_values, y_metric)
+        return [f"{name}\n{x_metric}: {x}\n{y_metric}: {y}" for name, x, y in zip(names, x_text, y_text)]
+    
+    def draw_small_multiples(self, fig: Figure, data: pd.DataFrame, metrics=METRICS,
+                             title: str = 'Multi-Metric Country Comparison'):
+        """One bar panel per metric (all ten by default), sharing the country axis"""
+        metrics = [metric for metric in metrics if metric in data.columns]
+        countries = data['Country'].astype(str).tolist()
+        colors = self.colors('Set2', len(countries))
+        nrows, ncols = grid_shape(len(metrics))
+        # Narrower panels get fewer country names
+        max_ticks = max(10, MAX_TICK_LABELS // ncols)
+        axes = fig.subplots(nrows, ncols, sharex=True, squeeze=False).ravel()
+        
+        for i, (ax, metric) in enumerate(zip(axes, metrics)):
+            self._draw_bars(ax, countries, data[metric], metric, metric, colors, label_size=8,
+                            title_size=12, axis_size=9, max_ticks=max_ticks)
+            # Country names only under the lowest panel of each column
+            bottom = i + ncols >= len(metrics)
+            ax.tick_params(axis='x', labelbottom=bottom)
+            if not bottom:
+                ax.set_xlabel('')
+        for ax in axes[len(metrics):]:
+            ax.set_visible(False)
+        
+        fig.suptitle(title, fontsize=16, fontweight='bold')
+    
+    @staticmethod
+    def colors(cmap: str, n: int, spread: bool = False) -> np.ndarray:
+        """n colours from a colormap, cycling through it (or spread over it when spread=True)"""
+        colormap = matplotlib.colormaps[cmap]
+        if spread:
+            return colormap(np.linspace(0, 1, n))
+        return colormap(np.arange(n) % colormap.N)
+    
+    def _draw_bars(self, ax, categories: List[str], values, metric: str, title: str, colors,
+                   label_size: int, horizontal: bool = False, title_size: int = 14, axis_size: int = 10,
+                   max_ticks: int = MAX_TICK_LABELS):
+        """Draw a bar chart as a single PolyCollection, however many bars there are"""
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        positions = np.arange(n, dtype=np.float64)
+        lengths = np.nan_to_num(values)
+        
+        # Four corners per bar, built for all bars at once
+        base, low, high = np.zeros(n), positions - 0.4, positions + 0.4
+        corners = [(low, base), (low, lengths), (high, lengths), (high, base)]
+        verts = np.stack([np.column_stack((y, x) if horizontal else (x, y)) for x, y in corners], axis=1)
+        bars = PolyCollection(verts, facecolors=colors, edgecolors='black', alpha=0.8,
+                              linewidths=1 if n <= MAX_BAR_LABELS else 0)
+        # Like ax.bar: no margin below the zero baseline
+        (bars.sticky_edges.x if horizontal else bars.sticky_edges.y).append(0)
+        ax.add_collection(bars)
+        ax.autoscale_view()
+        
+        step = max(1, -(-n // max_ticks))
+        names = categories[::step]
+        if horizontal:
+            ax.set_yticks(positions[::step], names)
+            ax.set_ylim(-0.6, n - 0.4)
+        else:
+            ax.set_xticks(positions[::step], names, rotation=45, ha='right')
+            ax.set_xlim(-0.6, n - 0.4)
+        
+        if n <= MAX_BAR_LABELS:
+            for position, length, text in zip(positions, lengths, self.format_numbers(values, metric)):
+                if horizontal:
+                    ax.text(length, position, text, ha='left' if length >= 0 else 'right', va='center',
+                            fontsize=label_size, fontweight='bold')
+                else:
+                    ax.text(position, length, text, ha='center', va='bottom' if length >= 0 else 'top',
+                            fontsize=label_size, fontweight='bold')
+        
+        ax.set_title(title, fontsize=title_size, fontweight='bold', pad=20 if title_size >= 16 else 6)
+        value_label, category_label = self.metric_label(metric), 'Countries'
+        ax.set_xlabel(value_label if horizontal else category_label, fontsize=axis_size, fontweight='bold')
+        ax.set_ylabel(category_label if horizontal else value_label, fontsize=axis_size, fontweight='bold')
+        ax.grid(axis='x' if horizontal else 'y', alpha=0.3, linestyle='--')
+        ax.set_axisbelow(True)
+    
     def create_comparison_chart(self, countries_data: pd.DataFrame, metric: str = 'Population'):
         """Create a comparison chart for selected countries"""
         if countries_data.empty or metric not in countries_data.columns:
             print("No data available for visualization")
             return
         
-        fig, ax = plt.subplots(figsize=(12, 8))
-        
         countries = countries_data['Country'].tolist()
-        values = countries_data[metric].tolist()
-        
-        # Create color palette
-        colors = plt.cm.Set3(np.linspace(0, 1, len(countries)))
-        
-        bars = ax.bar(countries, values, color=colors, alpha=0.8, edgecolor='black', linewidth=1)
-        
-        # Customize the chart
-        ax.set_title(f'{metric} Comparison', fontsize=16, fontweight='bold', pad=20)
-        ax.set_xlabel('Countries', fontsize=12, fontweight='bold')
-        ax.set_ylabel(self._get_ylabel(metric), fontsize=12, fontweight='bold')
-        
-        # Rotate x-axis labels for better readability
-        plt.xticks(rotation=45, ha='right')
-        
-        # Add value labels on bars
-        for bar, value in zip(bars, values):
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   self._format_number(value, metric),
-                   ha='center', va='bottom', fontsize=10, fontweight='bold')
+        key = self._chart_key(countries_data, 'comparison', metric, tuple(countries))
+        if self._reshow(key):
+            return
         
-        # Add grid for better readability
-        ax.grid(axis='y', alpha=0.3, linestyle='--')
-        ax.set_axisbelow(True)
+        fig, ax = plt.subplots(figsize=(12, 8))
+        self._draw_bars(ax, countries, countries_data[metric], metric, f'{metric} Comparison',
+                        self.colors('Set3', len(countries), spread=True), label_size=10,
+                        title_size=16, axis_size=12)
         
-        plt.tight_layout()
-        plt.show()
+        self._show(fig, key)
     
-    def create_multi_metric_comparison(self, countries_data: pd.DataFrame, metrics: List[str]):
-        """Create a multi-metric comparison chart"""
+    def create_multi_metric_comparison(self, countries_data: pd.DataFrame, metrics: List[str] = METRICS):
+        """Create a multi-metric comparison chart, one panel per metric"""
         if countries_data.empty:
             print("No data available for visualization")
             return
@@ -58,115 +273,86 @@ class PopulationVisualizer:
             return
         
         countries = countries_data['Country'].tolist()
+        key = self._chart_key(countries_data, 'multi', tuple(available_metrics), tuple(countries))
+        if self._reshow(key):
+            return
         
-        # Create subplots
-        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-        axes = axes.flatten()
-        
-        colors = plt.cm.Set2(np.linspace(0, 1, len(countries)))
-        
-        for i, metric in enumerate(available_metrics[:4]):  # Limit to 4 metrics
-            if i >= len(axes):
-                break
-                
-            ax = axes[i]
-            values = countries_data[metric].tolist()
-            
-            bars = ax.bar(countries, values, color=colors, alpha=0.8, edgecolor='black')
-            ax.set_title(f'{metric}', fontsize=14, fontweight='bold')
-            ax.set_xlabel('Countries', fontsize=10)
-            ax.set_ylabel(self._get_ylabel(metric), fontsize=10)
-            
-            # Rotate labels
-            ax.tick_params(axis='x', rotation=45, labelsize=9)
-            
-            # Add value labels
-            for bar, value in zip(bars, values):
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                       self._format_number(value, metric),
-                       ha='center', va='bottom', fontsize=8)
-            
-            ax.grid(axis='y', alpha=0.3, linestyle='--')
-        
-        # Hide unused subplots
-        for i in range(len(available_metrics), len(axes)):
-            axes[i].set_visible(False)
-        
-        plt.suptitle('Multi-Metric Country Comparison', fontsize=16, fontweight='bold')
-        plt.tight_layout()
-        plt.show()
+        rows, cols = grid_shape(len(available_metrics))
+        fig = plt.figure(figsize=(5 * cols, 4 * rows + 1))
+        self.draw_small_multiples(fig, countries_data, available_metrics)
+        self._show(fig, key)
     
-    def create_top_countries_chart(self, data: pd.DataFrame, n: int = 10, metric: str = 'Population'):
-        """Create a chart showing top N countries by metric"""
+    def create_top_countries_chart(self, data: pd.DataFrame, n: int = 10, metric: str = 'Population',
+                                   rankings: Optional[MetricRankings] = None):
+        """Create a chart showing top N countries by metric
+        
+        Pass the snapshot's precomputed rankings to slice the top N instead of sorting again.
+        """
         if data.empty or metric not in data.columns:
             print("No data available for visualization")
             return
         
-        top_data = data.nlargest(n, metric)
+        key = self._chart_key(data, 'top', metric, n)
+        if self._reshow(key):
+            return
+        
+        if rankings is not None and metric in rankings:
+            top_data = data.iloc[rankings.top(metric, n)]
+        else:
+            top_data = data.nlargest(n, metric)
         
         fig, ax = plt.subplots(figsize=(14, 8))
         
+        # Horizontal bars for better country name visibility
         countries = top_data['Country'].tolist()
-        values = top_data[metric].tolist()
-        
-        # Create horizontal bar chart for better country name visibility
-        colors = plt.cm.viridis(np.linspace(0, 1, len(countries)))
-        bars = ax.barh(countries, values, color=colors, alpha=0.8, edgecolor='black')
-        
-        ax.set_title(f'Top {n} Countries by {metric}', fontsize=16, fontweight='bold', pad=20)
-        ax.set_xlabel(self._get_ylabel(metric), fontsize=12, fontweight='bold')
-        ax.set_ylabel('Countries', fontsize=12, fontweight='bold')
-        
-        # Add value labels
-        for bar, value in zip(bars, values):
-            width = bar.get_width()
-            ax.text(width, bar.get_y() + bar.get_height()/2.,
-                   self._format_number(value, metric),
-                   ha='left', va='center', fontsize=10, fontweight='bold')
-        
-        ax.grid(axis='x', alpha=0.3, linestyle='--')
-        ax.set_axisbelow(True)
+        self._draw_bars(ax, countries, top_data[metric], metric, f'Top {n} Countries by {metric}',
+                        self.colors('viridis', len(countries), spread=True), label_size=10,
+                        horizontal=True, title_size=16, axis_size=12)
         
-        plt.tight_layout()
-        plt.show()
+        self._show(fig, key)
     
     def create_scatter_plot(self, data: pd.DataFrame, x_metric: str, y_metric: str, countries: List[str] = None):
-        """Create a scatter plot comparing two metrics"""
+        """Create a scatter plot comparing two metrics, with decluttered labels and hover tooltips"""
         if data.empty or x_metric not in data.columns or y_metric not in data.columns:
             print("No data available for scatter plot")
             return
         
-        fig, ax = plt.subplots(figsize=(12, 8))
-        
-        # Filter data if specific countries are provided
-        if countries:
-            plot_data = data[data['Country'].isin(countries)]
-        else:
-            plot_data = data.head(20)  # Show top 20 countries
-        
-        x_values = plot_data[x_metric]
-        y_values = plot_data[y_metric]
-        
-        scatter = ax.scatter(x_values, y_values, c=range(len(plot_data)), 
-                           cmap='viridis', alpha=0.7, s=100, edgecolor='black')
-        
-        # Add country labels
-        for i, country in enumerate(plot_data['Country']):
-            ax.annotate(country, (x_values.iloc[i], y_values.iloc[i]), 
-                       xytext=(5, 5), textcoords='offset points', fontsize=8)
+        key = self._chart_key(data, 'scatter', x_metric, y_metric, tuple(countries) if countries else None)
+        if self._reshow(key):
+            return
         
-        ax.set_title(f'{y_metric} vs {x_metric}', fontsize=16, fontweight='bold', pad=20)
-        ax.set_xlabel(self._get_ylabel(x_metric), fontsize=12, fontweight='bold')
-        ax.set_ylabel(self._get_ylabel(y_metric), fontsize=12, fontweight='bold')
+        fig, ax = plt.subplots(figsize=(12, 8))
         
-        ax.grid(True, alpha=0.3, linestyle='--')
+        # Filter data if specific countries are provided; otherwise plot every country
+        plot_data = data[data['Country'].isin(countries)] if countries else data
+        labeler = self.draw_scatter(ax, plot_data, x_metric, y_metric)
+        if labeler is not None:
+            fig.tight_layout()
+            labeler.relabel()
+            labeler.connect(fig.canvas)
         
-        plt.tight_layout()
+        self._show(fig, key)
+    
+    def play_animation(self, animation: ChartAnimation, fps: int = DEFAULT_FPS):
+        """Play a precomputed animation in a new window, blitting only the artists that move"""
+        fig = plt.figure(figsize=(12, 8))
+        self.animations[fig.number] = play(animation, fig, self, fps)
+        fig.canvas.mpl_connect('close_event', lambda event: self.animations.pop(fig.number, None))
         plt.show()
     
-    def _get_ylabel(self, metric: str) -> str:
-        """Get appropriate y-axis label for metric"""
+    def create_bar_race(self, data: pd.DataFrame, metric: str, top_n: int = 10, time_column: str = 'Year',
+                        fps: int = DEFAULT_FPS):
+        """Animate the top countries by a metric over the years (or stored snapshots)"""
+        self.play_animation(BarRace(data, metric, top_n, time_column=time_column), fps)
+    
+    def create_animated_scatter(self, data: pd.DataFrame, x_metric: str, y_metric: str,
+                                countries: List[str] = None, time_column: str = 'Year', fps: int = DEFAULT_FPS):
+        """Animate countries moving through two metrics over the years (or stored snapshots)"""
+        self.play_animation(ScatterAnimation(data, x_metric, y_metric, time_column=time_column,
+                                             countries=countries), fps)
+    
+    def metric_label(self, metric: str) -> str:
+        """Get the axis label for a metric"""
         labels = {
             'Population': 'Population',
             'Yearly_Change': 'Yearly Change (%)',
@@ -181,25 +367,28 @@ class PopulationVisualizer:
         }
         return labels.get(metric, metric)
     
-    def _format_number(self, value, metric: str) -> str:
-        """Format numbers for display"""
-        if pd.isna(value):
-            return 'N/A'
-        
-        if metric in ['Population', 'Net_Change', 'Land_Area', 'Net_Migration']:
-            if abs(value) >= 1e9:
-                return f'{value/1e9:.1f}B'
-            elif abs(value) >= 1e6:
-                return f'{value/1e6:.1f}M'
-            elif abs(value) >= 1e3:
-                return f'{value/1e3:.1f}K'
-            else:
-                return f'{int(value)}'
-        elif metric in ['Yearly_Change', 'Urban_Population_Percent', 'World_Share']:
-            return f'{value:.1f}%'
+    def format_numbers(self, values, metric: str) -> np.ndarray:
+        """Format an array of metric values for labels in one pass, 'N/A' where missing
+
+        Counts are abbreviated (1.4B, 12.9M, 3.6K), percentages get one decimal and
+        a '%', fertility and median age one decimal, density a whole number.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        missing = np.isnan(values)
+        safe = np.where(missing, 0.0, values)
+        
+        if metric in COUNT_METRICS:
+            magnitude = np.abs(safe)
+            thresholds = [magnitude >= 1e9, magnitude >= 1e6, magnitude >= 1e3]
+            scale = np.select(thresholds, [1e9, 1e6, 1e3], 1.0)
+            scaled = np.char.add(np.char.mod('%.1f', safe / scale), np.select(thresholds, ['B', 'M', 'K'], ''))
+            text = np.where(scale == 1.0, np.char.mod('%d', np.trunc(safe)), scaled)
+        elif metric in PERCENT_METRICS:
+            text = np.char.mod('%.1f%%', safe)
         elif metric in ['Fertility_Rate', 'Median_Age']:
-            return f'{value:.1f}'
+            text = np.char.mod('%.1f', safe)
         elif metric == 'Density':
-            return f'{int(value)}'
+            text = np.char.mod('%d', np.trunc(safe))
         else:
-            return str(value)
\ No newline at end of file
+            text = values.astype(str)
+        return np.where(missing, 'N/A', text)
@@ -7,13 +7,10 @@
 import time
 import traceback
 import matplotlib.pyplot as plt
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_pool import get_default_pool
 from IPython.display import display, clear_output
 
 
@@ -26,15 +23,8 @@ plt.ion()
 # In[3]:
 
 
-options = Options()
-options.add_argument("--headless=new") 
-options.add_argument("--no-sandbox")
-options.add_argument("--disable-dev-shm-usage")
-
-driver = webdriver.Chrome(
-    service=Service(ChromeDriverManager().install()),
-    options=options
-)
+pool = get_default_pool()
+pool.warm()
 
 
 # In[4]:
@@ -44,13 +34,14 @@ URL = "https://www.worldometers.info/"
 
 def get_population():
     """Fetch live population data using Selenium"""
-    driver.get(URL)
-    time.sleep(2)  
     try:
-        population_element = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "rts-counter"))
-        )
-        population = population_element.text.replace(",", "")
+        with pool.lease() as driver:
+            driver.get(URL)
+            time.sleep(2)  
+            population_element = WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.CLASS_NAME, "rts-counter"))
+            )
+            population = population_element.text.replace(",", "")
         return int(population)
     except Exception as e:
         print(f"Error: {e}")
@@ -98,5 +89,5 @@ plt.show()
 # In[6]:
 
 
-driver.quit()
+pool.shutdown()
 